@@ -0,0 +1,110 @@
+"""Microbenchmark: memory and construction time of regular vs slotted entities.
+
+For every specialized entity class, reports the bytes retained per instance,
+the time to construct one, and the time to specialize a generic entity into it
+(`copy_entity_components`), for the regular dataclass and its `__slots__`
+variant. Then converts a large procedural level with `from_state` both ways.
+
+Usage:
+    python benchmarks/bench_entities.py [--number N] [--size S]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import timeit
+import tracemalloc
+from collections.abc import Callable
+
+from grid_universe.grid.entity import BaseEntity, Entity, copy_entity_components
+
+from grid_adventure.grid import SlottedTypes, SpecializedTypes, from_state
+from grid_adventure.levels.procedural import build_procedural_level
+
+
+def _bytes_per_instance(factory: Callable[[], object], number: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [factory() for _ in range(number)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Subtract the list holding them
+    list_bytes = instances.__sizeof__()
+    return (after - before - list_bytes) / number
+
+
+def _ns(fn: Callable[[], object], number: int) -> float:
+    return timeit.timeit(fn, number=number) / number * 1e9
+
+
+def _convert(size: int, slots: bool) -> tuple[float, int, int]:
+    """(seconds, retained bytes, entity count) of one `from_state` conversion."""
+    state = build_procedural_level(width=size, height=size)
+    tracemalloc.start()
+    start = time.perf_counter()
+    gridstate = from_state(state, slots=slots)
+    elapsed = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    count = sum(len(cell) for column in gridstate.grid for cell in column)
+    return elapsed, retained, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--size", type=int, default=128)
+    args = parser.parse_args()
+
+    print(
+        f"{'type':<22}{'bytes':>9}{'slotted':>9}"
+        f"{'new ns':>9}{'slotted':>9}{'copy ns':>9}{'slotted':>9}"
+    )
+    for cls in SpecializedTypes:
+        variant: type[BaseEntity] = SlottedTypes[cls]
+        generic = copy_entity_components(cls(), Entity())
+        row = [
+            _bytes_per_instance(cls, args.number),
+            _bytes_per_instance(variant, args.number),
+            _ns(cls, args.number),
+            _ns(variant, args.number),
+            _ns(
+                lambda generic=generic, cls=cls: copy_entity_components(
+                    generic, cls(), preserve_entity_id=True
+                ),
+                args.number,
+            ),
+            _ns(
+                lambda generic=generic, variant=variant: copy_entity_components(
+                    generic, variant(), preserve_entity_id=True
+                ),
+                args.number,
+            ),
+        ]
+        print(f"{cls.__name__:<22}" + "".join(f"{v:>9.0f}" for v in row))
+
+    print()
+    print(f"from_state on a {args.size}x{args.size} procedural level")
+    results = {}
+    for slots in (False, True):
+        elapsed, retained, count = _convert(args.size, slots)
+        results[slots] = (elapsed, retained)
+        print(
+            f"  {'slotted' if slots else 'regular':<8}"
+            f"{elapsed * 1e3:>9.1f} ms{retained / 2**20:>9.1f} MiB"
+            f"{retained / count:>9.0f} B/entity  ({count} entities)"
+        )
+    (regular_time, regular_bytes), (slotted_time, slotted_bytes) = (
+        results[False],
+        results[True],
+    )
+    print(
+        f"  memory before/after: {regular_bytes / 2**20:.1f} -> "
+        f"{slotted_bytes / 2**20:.1f} MiB ({1 - slotted_bytes / regular_bytes:.0%} "
+        f"less), time {regular_time / slotted_time:.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
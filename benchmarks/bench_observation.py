@@ -0,0 +1,56 @@
+"""Benchmark: tensor observations vs the image observation path.
+
+Usage:
+    python benchmarks/bench_observation.py [--number N] [--resolution PX]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from grid_universe.grid.convert import grid_state_fn_to_initial_state_fn
+
+from grid_adventure.env import GridAdventureEnv
+from grid_adventure.levels import intro
+
+LEVELS = {
+    "basic_movement": intro.build_level_basic_movement,
+    "enemy_patrol": intro.build_level_enemy_patrol,
+    "capstone": intro.build_level_capstone,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--resolution", type=int, default=640)
+    args = parser.parse_args()
+
+    print(f"{'level':<16}{'image us':>12}{'tensor us':>12}{'speedup':>9}")
+    for name, builder in LEVELS.items():
+        sample = builder()
+        timings: dict[str, float] = {}
+        for observation_type in ("image", "tensor"):
+            env = GridAdventureEnv(
+                initial_state_fn=grid_state_fn_to_initial_state_fn(builder),
+                observation_type=observation_type,
+                render_resolution=args.resolution,
+                width=sample.width,
+                height=sample.height,
+            )
+            env.reset()
+            timings[observation_type] = (
+                timeit.timeit(env._get_obs, number=args.number) / args.number
+            )
+            env.close()
+        print(
+            f"{name:<16}"
+            f"{timings['image'] * 1e6:>12.0f}"
+            f"{timings['tensor'] * 1e6:>12.0f}"
+            f"{timings['image'] / timings['tensor']:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
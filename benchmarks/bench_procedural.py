@@ -0,0 +1,64 @@
+"""End-to-end build time of procedural levels, layout and State separately.
+
+Times `generate_layout` (NumPy code arrays), `LevelLayout.to_state` (the
+persistent component maps) and `build_procedural_level` (both) for square maps
+of increasing size, and compares the largest one with the one-second target.
+`cold ms` is a first build at a size, which also builds the shared floor layer
+(see `grid_adventure.levels.procedural`); the other columns are later builds.
+
+Usage:
+    python benchmarks/bench_procedural.py [--number N] [--sizes 64,128,...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from grid_adventure.levels.layout import _cell_positions, _floor_layer
+from grid_adventure.levels.procedural import build_procedural_level, generate_layout
+
+TARGET_SECONDS = 1.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=3)
+    parser.add_argument("--sizes", default="64,128,256,512")
+    args = parser.parse_args()
+
+    print(
+        f"{'size':<10}{'entities':>10}{'cold ms':>9}{'layout ms':>11}"
+        f"{'state ms':>10}{'total ms':>10}"
+    )
+    total = 0.0
+    for size in (int(s) for s in args.sizes.split(",")):
+        _cell_positions.cache_clear()
+        _floor_layer.cache_clear()
+        cold = timeit.timeit(lambda n=size: build_procedural_level(n, n), number=1)
+        layout = generate_layout(size, size)
+        entities = len(layout.to_state().position)
+        layout_time = (
+            timeit.timeit(lambda n=size: generate_layout(n, n), number=args.number)
+            / args.number
+        )
+        state_time = timeit.timeit(layout.to_state, number=args.number) / args.number
+        total = (
+            timeit.timeit(
+                lambda n=size: build_procedural_level(n, n), number=args.number
+            )
+            / args.number
+        )
+        print(
+            f"{f'{size}x{size}':<10}{entities:>10}{cold * 1e3:>9.0f}"
+            f"{layout_time * 1e3:>11.0f}"
+            f"{state_time * 1e3:>10.0f}{total * 1e3:>10.0f}"
+        )
+    verdict = "met" if total < TARGET_SECONDS else "NOT met"
+    print(
+        f"\nLargest map built end to end in {total:.2f}s: {TARGET_SECONDS:.0f}s target {verdict}"
+    )
+
+
+if __name__ == "__main__":
+    main()
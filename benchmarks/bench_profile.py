@@ -0,0 +1,47 @@
+"""Where step time goes: per-phase timings on procedural maps of increasing size.
+
+Runs random moves through `grid_adventure.step.step` under
+`grid_adventure.profiling.profile_steps` and prints one phase table per size.
+
+Usage:
+    python benchmarks/bench_profile.py [--steps N] [--sizes 16,64,...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+
+from grid_universe.actions import Action
+
+from grid_adventure.levels.procedural import Density, build_procedural_level
+from grid_adventure.profiling import profile_steps
+from grid_adventure.step import step
+
+MOVES = (Action.UP, Action.DOWN, Action.LEFT, Action.RIGHT)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--sizes", default="16,64,128")
+    parser.add_argument("--robots", type=float, default=Density.robot)
+    parser.add_argument("--portals", type=float, default=Density.portal)
+    args = parser.parse_args()
+
+    density = Density(robot=args.robots, portal=args.portals)
+    rng = random.Random(0)
+    for size in (int(s) for s in args.sizes.split(",")):
+        initial = build_procedural_level(size, size, density=density)
+        state = initial
+        with profile_steps() as profile:
+            for _ in range(args.steps):
+                state = step(state, rng.choice(MOVES))
+                if state.win or state.lose:
+                    state = initial
+        print(f"\n{size}x{size}, {args.steps} steps")
+        print(profile.report())
+
+
+if __name__ == "__main__":
+    main()
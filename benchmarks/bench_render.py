@@ -0,0 +1,74 @@
+"""Benchmark: frame rendering time of the render backends at small cell sizes.
+
+Every backend renders the same level and seed; the last column is the default
+backend's time divided by the palette backend's, checked against the 10x
+target for small training frames.
+
+Usage:
+    python benchmarks/bench_render.py [--number N] [--cell PX]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from grid_universe.grid.convert import grid_state_fn_to_initial_state_fn
+
+from grid_adventure.env import RENDER_BACKENDS, GridAdventureEnv
+from grid_adventure.levels import intro
+
+LEVELS = {
+    "basic_movement": intro.build_level_basic_movement,
+    "enemy_patrol": intro.build_level_enemy_patrol,
+    "capstone": intro.build_level_capstone,
+}
+
+TARGET_SPEEDUP = 10.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--cell", type=int, default=8, help="pixels per cell")
+    args = parser.parse_args()
+
+    print(
+        f"{'level':<16}"
+        + "".join(f"{name + ' us':>16}" for name in RENDER_BACKENDS)
+        + f"{'palette speedup':>18}"
+    )
+    speedups: list[float] = []
+    for name, builder in LEVELS.items():
+        sample = builder()
+        timings: dict[str, float] = {}
+        for backend in RENDER_BACKENDS:
+            env = GridAdventureEnv(
+                initial_state_fn=grid_state_fn_to_initial_state_fn(builder),
+                observation_type="image",
+                render_resolution=args.cell * sample.width,
+                render_backend=backend,
+                width=sample.width,
+                height=sample.height,
+            )
+            env.reset(seed=0)
+            timings[backend] = (
+                timeit.timeit(env._get_obs, number=args.number) / args.number
+            )
+            env.close()
+        speedups.append(timings["default"] / timings["palette"])
+        print(
+            f"{name:<16}"
+            + "".join(f"{timings[backend] * 1e6:>16.0f}" for backend in RENDER_BACKENDS)
+            + f"{speedups[-1]:>17.1f}x"
+        )
+    slowest = min(speedups)
+    verdict = "met" if slowest >= TARGET_SPEEDUP else "NOT met"
+    print(
+        f"\nPalette vs default: at least {slowest:.1f}x faster, "
+        f"{TARGET_SPEEDUP:.0f}x target {verdict}"
+    )
+
+
+if __name__ == "__main__":
+    main()
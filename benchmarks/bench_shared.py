@@ -0,0 +1,70 @@
+"""Branching cost of `step_shared` vs stepping and converting with `from_state`.
+
+For square procedural maps of increasing size, times one branch from a fixed
+root (as a tree search expands a node): the bare State step, the step followed
+by a full `from_state` conversion, and `step_shared` on a shared root. The
+shared branch should stay close to the bare step as the map grows, while the
+full conversion grows with the area.
+
+Usage:
+    python benchmarks/bench_shared.py [--number N] [--sizes 32,64,...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from functools import partial
+
+from grid_universe.actions import Action
+from grid_universe.state import State
+
+from grid_adventure.grid import from_state, share, step_shared
+from grid_adventure.gridstate import SharedGridState
+from grid_adventure.levels.procedural import generate_layout
+from grid_adventure.step import step
+
+MOVES = (Action.UP, Action.DOWN, Action.LEFT, Action.RIGHT)
+
+
+def _bare(state: State) -> None:
+    for action in MOVES:
+        step(state, action)
+
+
+def _full(state: State) -> None:
+    for action in MOVES:
+        from_state(step(state, action))
+
+
+def _shared(root: SharedGridState) -> None:
+    for action in MOVES:
+        step_shared(root, action)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--sizes", default="32,64,128,256")
+    args = parser.parse_args()
+
+    print(
+        f"{'size':<10}{'step ms':>9}{'from_state ms':>15}{'shared ms':>11}"
+        f"{'speedup':>9}"
+    )
+    for size in (int(s) for s in args.sizes.split(",") if s):
+        state = generate_layout(size, size).to_state()
+        root = share(state)
+        count = args.number * len(MOVES)
+
+        step_time = timeit.timeit(partial(_bare, state), number=args.number) / count
+        full_time = timeit.timeit(partial(_full, state), number=args.number) / count
+        shared_time = timeit.timeit(partial(_shared, root), number=args.number) / count
+        print(
+            f"{f'{size}x{size}':<10}{step_time * 1e3:>9.2f}{full_time * 1e3:>15.2f}"
+            f"{shared_time * 1e3:>11.2f}{full_time / shared_time:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Benchmark: solve every intro level optimally and report search throughput.
+
+Usage:
+    python benchmarks/bench_solver.py [--max-nodes N] [--bfs]
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from grid_universe.grid.convert import to_state
+
+from grid_adventure.levels.intro import BUILDERS
+from grid_adventure.solver import solve
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-nodes", type=int, default=1_000_000)
+    parser.add_argument("--bfs", action="store_true", help="disable the A* heuristic")
+    parser.add_argument(
+        "--show-actions", action="store_true", help="print each solution"
+    )
+    args = parser.parse_args()
+
+    print(f"{'level':<24}{'length':>8}{'nodes':>10}{'nodes/s':>10}{'seconds':>9}")
+    for name, builder in BUILDERS.items():
+        result = solve(
+            to_state(builder()),
+            max_nodes=args.max_nodes,
+            use_heuristic=not args.bfs,
+        )
+        length = str(len(result.actions)) if result.actions is not None else "-"
+        print(
+            f"{name:<24}{length:>8}{result.nodes_expanded:>10}"
+            f"{result.nodes_per_sec:>10.0f}{result.elapsed:>9.2f}"
+        )
+        if args.show_actions and result.actions is not None:
+            print("    " + " ".join(action.name for action in result.actions))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Microbenchmark: entity specialization via the dispatch table vs the legacy if-chain.
+
+Usage:
+    python benchmarks/bench_specialize.py [--number N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from grid_universe.grid.entity import BaseEntity, Entity, copy_entity_components
+
+from grid_adventure.entities import (
+    AgentEntity,
+    BoxEntity,
+    CoinEntity,
+    ExitEntity,
+    FloorEntity,
+    GemEntity,
+    KeyEntity,
+    LavaEntity,
+    LockedDoorEntity,
+    MovingBoxEntity,
+    PhasingPowerUpEntity,
+    PortalEntity,
+    RobotEntity,
+    ShieldPowerUpEntity,
+    SpeedPowerUpEntity,
+    UnlockedDoorEntity,
+    WallEntity,
+)
+from grid_adventure.grid import SpecializedTypes, _specialize_single
+
+
+def _legacy_specialize_single(obj: BaseEntity) -> BaseEntity:
+    """The getattr/has() priority chain used before the dispatch table."""
+    if isinstance(obj, SpecializedTypes):
+        return obj
+
+    def has(name: str) -> bool:
+        return getattr(obj, name, None) is not None
+
+    app_name: str | None = getattr(getattr(obj, "appearance", None), "name", None)
+
+    if has("agent"):
+        return copy_entity_components(obj, AgentEntity(), preserve_entity_id=True)
+    if has("exit"):
+        return copy_entity_components(obj, ExitEntity(), preserve_entity_id=True)
+    if app_name == "door":
+        if has("locked"):
+            return copy_entity_components(
+                obj, LockedDoorEntity(), preserve_entity_id=True
+            )
+        return copy_entity_components(
+            obj, UnlockedDoorEntity(), preserve_entity_id=True
+        )
+    if has("key"):
+        return copy_entity_components(obj, KeyEntity(), preserve_entity_id=True)
+    if has("portal"):
+        return copy_entity_components(obj, PortalEntity(), preserve_entity_id=True)
+    if has("collectible"):
+        if has("speed"):
+            return copy_entity_components(
+                obj, SpeedPowerUpEntity(), preserve_entity_id=True
+            )
+        if has("immunity"):
+            return copy_entity_components(
+                obj, ShieldPowerUpEntity(), preserve_entity_id=True
+            )
+        if has("phasing"):
+            return copy_entity_components(
+                obj, PhasingPowerUpEntity(), preserve_entity_id=True
+            )
+        if app_name == "core" or has("requirable"):
+            return copy_entity_components(obj, GemEntity(), preserve_entity_id=True)
+        return copy_entity_components(obj, CoinEntity(), preserve_entity_id=True)
+    if app_name == "box":
+        if has("moving"):
+            return copy_entity_components(
+                obj, MovingBoxEntity(), preserve_entity_id=True
+            )
+        return copy_entity_components(obj, BoxEntity(), preserve_entity_id=True)
+    if app_name == "lava":
+        return copy_entity_components(obj, LavaEntity(), preserve_entity_id=True)
+    if app_name == "monster" or app_name == "robot":
+        return copy_entity_components(obj, RobotEntity(), preserve_entity_id=True)
+    if app_name == "floor":
+        return copy_entity_components(obj, FloorEntity(), preserve_entity_id=True)
+    if app_name == "wall":
+        return copy_entity_components(obj, WallEntity(), preserve_entity_id=True)
+    return obj
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'type':<22}{'legacy ns':>12}{'dispatch ns':>13}{'speedup':>9}")
+    total_legacy = total_dispatch = 0.0
+    for cls in SpecializedTypes:
+        # Generic (unspecialized) entity carrying the class's default components
+        generic = copy_entity_components(cls(), Entity())
+        legacy = timeit.timeit(
+            lambda g=generic: _legacy_specialize_single(g), number=args.number
+        )
+        dispatch = timeit.timeit(
+            lambda g=generic: _specialize_single(g), number=args.number
+        )
+        total_legacy += legacy
+        total_dispatch += dispatch
+        print(
+            f"{cls.__name__:<22}"
+            f"{legacy / args.number * 1e9:>12.0f}"
+            f"{dispatch / args.number * 1e9:>13.0f}"
+            f"{legacy / dispatch:>8.2f}x"
+        )
+    print(f"{'total':<22}{'':>12}{'':>13}{total_legacy / total_dispatch:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
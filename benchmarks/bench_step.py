@@ -0,0 +1,228 @@
+"""Step/reset throughput and per-step allocation across levels, as JSON.
+
+Measures `grid_adventure.step.step` (ECS State), `grid_adventure.grid.step`
+(specialized GridState, full and incremental), `grid_adventure.grid.step_shared`
+(shared GridState branches) and `GridAdventureEnv.step`/`reset` in every
+observation mode (including lazy GridState views), over all intro levels plus
+procedural maps of increasing size.
+
+Usage:
+    python benchmarks/bench_step.py [--steps N] [--sizes 16,32,...] [--output FILE]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC, datetime
+from functools import partial
+from typing import Any
+
+import numpy as np
+from grid_universe.actions import Action
+from grid_universe.grid.convert import grid_state_fn_to_initial_state_fn, to_state
+from grid_universe.grid.gridstate import GridState
+
+from grid_adventure import grid as grid_module
+from grid_adventure import step as step_module
+from grid_adventure.env import GridAdventureEnv
+from grid_adventure.levels.intro import BUILDERS, TURN_LIMIT
+from grid_adventure.levels.procedural import generate_layout
+
+# Environment keyword arguments of each benchmarked observation mode
+OBSERVATIONS: dict[str, dict[str, Any]] = {
+    "gridstate": {"observation_type": "gridstate"},
+    "lazy_gridstate": {"observation_type": "gridstate", "lazy_gridstate": True},
+    "tensor": {"observation_type": "tensor"},
+    "image": {"observation_type": "image"},
+}
+MOVES = (Action.UP, Action.DOWN, Action.LEFT, Action.RIGHT)
+
+
+def build_scaled_level(size: int, seed: int = 0) -> GridState:
+    """Square procedural level (see `grid_adventure.levels.procedural`)."""
+    return generate_layout(size, size, seed, turn_limit=TURN_LIMIT).to_gridstate()
+
+
+def _actions(count: int, seed: int = 0) -> list[Action]:
+    rng = random.Random(seed)
+    return [rng.choice(MOVES) for _ in range(count)]
+
+
+def _rate(fn: Callable[[], Any], count: int) -> float:
+    """Calls per second of `fn`, run `count` times."""
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return count / (time.perf_counter() - start)
+
+
+def _alloc_per_call(fn: Callable[[], Any], count: int) -> float:
+    """Mean peak of newly traced memory (bytes) during one call of `fn`."""
+    tracemalloc.start()
+    total = 0
+    try:
+        for _ in range(count):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+            total += peak - before
+    finally:
+        tracemalloc.stop()
+    return total / count
+
+
+class _Stepper:
+    """Step function over a fixed action sequence, restarting finished episodes."""
+
+    def __init__(
+        self,
+        initial: Callable[[], Any],
+        advance: Callable[[Any, Action], Any],
+        done: Callable[[Any], bool],
+        actions: list[Action],
+    ) -> None:
+        self.initial, self.advance, self.done = initial, advance, done
+        self.actions = actions
+        self.current = initial()
+        self.index = 0
+
+    def __call__(self) -> None:
+        action = self.actions[self.index % len(self.actions)]
+        self.index += 1
+        self.current = self.advance(self.current, action)
+        if self.done(self.current):
+            self.current = self.initial()
+
+
+def _bench_level(
+    name: str, builder: Callable[..., GridState], args: argparse.Namespace
+) -> list[dict[str, Any]]:
+    sample = builder()
+    actions = _actions(args.steps)
+    base = {"level": name, "width": sample.width, "height": sample.height}
+    results: list[dict[str, Any]] = []
+
+    def state_done(state: Any) -> bool:
+        return bool(
+            state.win
+            or state.lose
+            or (state.turn_limit is not None and state.turn >= state.turn_limit)
+        )
+
+    targets: dict[str, tuple[Callable[[], Any], Callable[[Any, Action], Any]]] = {
+        "state": (lambda: to_state(builder()), step_module.step),
+        "gridstate": (
+            lambda: grid_module.specialize_entities(builder()),
+            grid_module.step,
+        ),
+        "gridstate_incremental": (
+            lambda: grid_module.specialize_entities(builder()),
+            partial(grid_module.step, incremental=True),
+        ),
+        "shared": (
+            lambda: grid_module.share(to_state(builder())),
+            grid_module.step_shared,
+        ),
+    }
+    for target, (initial, advance) in targets.items():
+        stepper = _Stepper(initial, advance, state_done, actions)
+        results.append(
+            {
+                **base,
+                "target": target,
+                "observation": None,
+                "steps_per_sec": _rate(stepper, args.steps),
+                "resets_per_sec": _rate(initial, args.resets),
+                "alloc_bytes_per_step": _alloc_per_call(stepper, args.alloc_steps),
+            }
+        )
+
+    for observation, env_kwargs in OBSERVATIONS.items():
+        if observation == "image" and max(sample.width, sample.height) > (
+            args.image_max_size
+        ):
+            continue
+        env = GridAdventureEnv(
+            initial_state_fn=grid_state_fn_to_initial_state_fn(builder),
+            render_resolution=args.resolution,
+            width=sample.width,
+            height=sample.height,
+            **env_kwargs,
+        )
+        env.reset()
+
+        def env_step(_: Any, action: Action, env: GridAdventureEnv = env) -> bool:
+            _, _, terminated, truncated, _ = env.step(action)
+            return bool(terminated or truncated)
+
+        stepper = _Stepper(env.reset, env_step, lambda done: done is True, actions)
+        results.append(
+            {
+                **base,
+                "target": "env",
+                "observation": observation,
+                "steps_per_sec": _rate(stepper, args.steps),
+                "resets_per_sec": _rate(env.reset, args.resets),
+                "alloc_bytes_per_step": _alloc_per_call(stepper, args.alloc_steps),
+            }
+        )
+        env.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--resets", type=int, default=20)
+    parser.add_argument("--alloc-steps", type=int, default=20)
+    parser.add_argument("--sizes", default="16,32,64,128,256")
+    parser.add_argument("--resolution", type=int, default=320)
+    parser.add_argument(
+        "--image-max-size",
+        type=int,
+        default=32,
+        help="skip image observations on maps larger than this",
+    )
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    levels: dict[str, Callable[..., GridState]] = dict(BUILDERS)
+    for size in (int(s) for s in args.sizes.split(",") if s):
+        levels[f"scaled {size}x{size}"] = partial(build_scaled_level, size)
+
+    results: list[dict[str, Any]] = []
+    for name, builder in levels.items():
+        print(f"benchmarking {name}", file=sys.stderr)
+        results.extend(_bench_level(name, builder, args))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "steps": args.steps,
+            "resets": args.resets,
+            "alloc_steps": args.alloc_steps,
+            "resolution": args.resolution,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
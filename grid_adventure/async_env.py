@@ -0,0 +1,167 @@
+"""asyncio front end for `GridAdventureEnv`.
+
+`reset`, `step` and `render` run in an executor thread, so an event loop can
+drive many environments at once without blocking on stepping or rendering:
+
+    envs = make_async_envs([GridAdventureEnv(...) for _ in range(64)],
+                           max_workers=8, max_in_flight=16)
+    await asyncio.gather(*(env.async_reset() for env in envs))
+    results = await step_all(envs, actions)
+
+Calls on one environment are serialized by a per-environment lock (the wrapped
+env is not thread-safe); a semaphore shared between environments bounds how
+many calls are in flight in total, so callers wait instead of queueing
+unbounded work on the executor. Both are held until the executor call has
+finished, even if the awaiting task is cancelled (e.g. by `asyncio.wait_for`).
+
+An executor created by `make_async_envs` is shut down once every environment
+it was made for has been closed with `aclose`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from collections.abc import Callable, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+import gymnasium as gym
+
+T = TypeVar("T")
+
+StepResult = tuple[Any, float, bool, bool, dict[str, Any]]
+
+
+class _ExecutorLease:
+    """An executor shut down when the last of its environments is closed."""
+
+    def __init__(self, executor: Executor, users: int) -> None:
+        self.executor = executor
+        self.users = users
+
+    def release(self) -> None:
+        self.users -= 1
+        if self.users == 0:
+            self.executor.shutdown(wait=False)
+
+
+class AsyncGridAdventureEnv:
+    """Wrap an environment with `async_reset`, `async_step` and `async_render`.
+
+    `executor` defaults to the event loop's default executor; `limiter` is an
+    optional semaphore (or a limit, to create one) shared with other
+    environments to cap concurrent calls.
+    """
+
+    def __init__(
+        self,
+        env: gym.Env[Any, Any],
+        executor: Executor | None = None,
+        limiter: asyncio.Semaphore | int | None = None,
+    ) -> None:
+        if isinstance(limiter, int):
+            limiter = asyncio.Semaphore(limiter)
+        self.env = env
+        self.executor = executor
+        self.limiter = limiter
+        self._lock = asyncio.Lock()
+        self._lease: _ExecutorLease | None = None
+        self._closed = False
+
+    def _release(self) -> None:
+        if self.limiter is not None:
+            self.limiter.release()
+        self._lock.release()
+
+    async def _call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, *args, **kwargs)
+        await self._lock.acquire()
+        try:
+            if self.limiter is not None:
+                await self.limiter.acquire()
+        except BaseException:
+            self._lock.release()
+            raise
+        try:
+            future = loop.run_in_executor(self.executor, call)
+        except BaseException:
+            self._release()
+            raise
+        # Release only once the call has finished in its thread, so a cancelled
+        # caller cannot let the next call run concurrently on this env.
+        future.add_done_callback(lambda _: self._release())
+        return await asyncio.shield(future)
+
+    async def async_reset(
+        self, *, seed: int | None = None, options: dict[str, Any] | None = None
+    ) -> tuple[Any, dict[str, Any]]:
+        return await self._call(self.env.reset, seed=seed, options=options)
+
+    async def async_step(self, action: Any) -> StepResult:
+        return await self._call(self.env.step, action)
+
+    async def async_render(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._call(self.env.render, *args, **kwargs)
+
+    async def aclose(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            await self._call(self.env.close)
+        finally:
+            if self._lease is not None:
+                self._lease.release()
+
+    def __getattr__(self, name: str) -> Any:
+        # Synchronous attributes (state, spaces, ...) of the wrapped env
+        if name == "env":
+            raise AttributeError(name)
+        return getattr(self.env, name)
+
+
+def make_async_envs(
+    envs: Sequence[gym.Env[Any, Any]],
+    max_workers: int | None = None,
+    max_in_flight: int | None = None,
+    executor: Executor | None = None,
+) -> list[AsyncGridAdventureEnv]:
+    """Wrap environments to share one executor and one in-flight limit.
+
+    A `ThreadPoolExecutor` of `max_workers` threads is created unless an
+    `executor` is given; a created executor is shut down when every returned
+    environment has been closed with `aclose`, a given one is left to the
+    caller. `max_in_flight` defaults to the worker count.
+    """
+    lease: _ExecutorLease | None = None
+    if executor is None:
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="grid-adventure"
+        )
+        lease = _ExecutorLease(executor, len(envs))
+        if not envs:
+            executor.shutdown(wait=False)
+    limit = max_in_flight if max_in_flight is not None else max_workers
+    limiter = asyncio.Semaphore(limit) if limit is not None else None
+    wrapped = [AsyncGridAdventureEnv(env, executor, limiter) for env in envs]
+    for env in wrapped:
+        env._lease = lease
+    return wrapped
+
+
+async def step_all(
+    envs: Sequence[AsyncGridAdventureEnv], actions: Sequence[Any]
+) -> list[StepResult]:
+    """Step every environment with its action concurrently, in order."""
+    if len(envs) != len(actions):
+        raise ValueError("Need exactly one action per environment.")
+    return list(
+        await asyncio.gather(
+            *(env.async_step(action) for env, action in zip(envs, actions))
+        )
+    )
+
+
+__all__ = ["AsyncGridAdventureEnv", "StepResult", "make_async_envs", "step_all"]
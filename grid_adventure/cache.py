@@ -0,0 +1,93 @@
+"""LRU cache of initial States, so environment resets skip rebuilding levels."""
+
+from __future__ import annotations
+
+import inspect
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from grid_universe.state import State
+
+# (builder identity, sorted keyword arguments)
+_Key = tuple[Hashable, tuple[tuple[str, Any], ...]]
+
+
+def _builder_key(initial_state_fn: Callable[..., State]) -> Hashable:
+    """Identify the level builder behind `initial_state_fn`.
+
+    Wrappers such as `grid_state_fn_to_initial_state_fn` return a new closure on
+    every call, so two environments built from the same level would never share
+    entries if keyed on the function object. Closures are keyed on their code
+    and captured values instead, which is the same for every wrapper of one
+    builder; `functools.wraps` wrappers are unwrapped first, and closures over
+    unhashable values fall back to the function itself.
+    """
+    fn = inspect.unwrap(initial_state_fn)
+    closure = getattr(fn, "__closure__", None)
+    if not closure:
+        return fn
+    try:
+        captured = tuple(cell.cell_contents for cell in closure)
+        hash(captured)
+    except (ValueError, TypeError):  # unbound or unhashable captured values
+        return fn
+    return (fn.__code__, captured)
+
+
+class ResetCache:
+    """Least-recently-used cache of `initial_state_fn(**kwargs)` results.
+
+    States are persistent, so a cached initial state can be handed out on every
+    reset without copying. Entries are keyed by the function and its keyword
+    arguments (builder options and seed). Closures wrapping the same builder
+    share entries, so one cache can serve several environments; calls with
+    unhashable arguments are passed through uncached and counted as misses.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[_Key, State] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, initial_state_fn: Callable[..., State], **kwargs: Any) -> State:
+        """Return the cached state for these arguments, building it on a miss."""
+        key = (_builder_key(initial_state_fn), tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            self.misses += 1
+            return initial_state_fn(**kwargs)
+
+        state = self._entries.get(key)
+        if state is None:
+            self.misses += 1
+            state = self._entries[key] = initial_state_fn(**kwargs)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return state
+
+    def wrap(self, initial_state_fn: Callable[..., State]) -> Callable[..., State]:
+        """Return `initial_state_fn` with its results served from this cache."""
+
+        def cached_initial_state_fn(**kwargs: Any) -> State:
+            return self.get(initial_state_fn, **kwargs)
+
+        return cached_initial_state_fn
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+
+__all__ = ["ResetCache"]
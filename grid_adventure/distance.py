@@ -0,0 +1,178 @@
+"""Shortest-path distance fields to exits and gems, cached per level.
+
+Walls, locked doors and boxes (pushable or moving) block movement. Distances
+are BFS step counts over the remaining cells (`-1` where unreachable), as
+read-only `(H, W)` int32 arrays indexed `[y, x]`. Hazards, robots and portals
+are ignored.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+from grid_universe.state import State
+from grid_universe.types import EntityID
+
+from grid_adventure.entities import LockedDoorEntity, WallEntity
+from grid_adventure.grid import classify_state
+
+DistanceField = npt.NDArray[np.int32]
+Mask = npt.NDArray[np.bool_]
+
+UNREACHABLE = -1
+
+# Blocking kinds that never move; boxes are tracked separately (`_box_ids`).
+_STATIC_BLOCKERS = (WallEntity, LockedDoorEntity)
+
+
+def distance_field(blocked: Mask, sources: Iterable[tuple[int, int]]) -> DistanceField:
+    """Multi-source BFS distances from `(x, y)` sources around `blocked` cells."""
+    distances = np.full(blocked.shape, UNREACHABLE, dtype=np.int32)
+    frontier = np.zeros(blocked.shape, dtype=np.bool_)
+    for x, y in sources:
+        frontier[y, x] = True
+    passable = ~blocked
+    depth = 0
+    while frontier.any():
+        distances[frontier] = depth
+        grown = frontier.copy()
+        grown[1:, :] |= frontier[:-1, :]
+        grown[:-1, :] |= frontier[1:, :]
+        grown[:, 1:] |= frontier[:, :-1]
+        grown[:, :-1] |= frontier[:, 1:]
+        frontier = grown & passable & (distances == UNREACHABLE)
+        depth += 1
+    return distances
+
+
+@dataclass(frozen=True)
+class DistanceFields:
+    """Blocking mask plus distance fields to the nearest exit and to each gem.
+
+    The arrays are read-only: a cache hands the same fields out for many states.
+    """
+
+    blocked: Mask
+    exit: DistanceField
+    gems: dict[EntityID, DistanceField]
+
+    def to_exit(self, x: int, y: int) -> int | None:
+        """Steps from `(x, y)` to the nearest exit, or None if unreachable."""
+        distance = int(self.exit[y, x])
+        return None if distance == UNREACHABLE else distance
+
+
+def _box_ids(state: State) -> Iterable[EntityID]:
+    """Blockers that can change position: pushable boxes and moving boxes."""
+    yield from state.pushable
+    yield from (eid for eid in state.moving if eid in state.blocking)
+
+
+def _read_only(array: npt.NDArray[np.generic]) -> None:
+    array.flags.writeable = False
+
+
+def _positions(state: State, ids: Iterable[EntityID]) -> tuple[tuple[int, int], ...]:
+    return tuple(
+        sorted(
+            (state.position[eid].x, state.position[eid].y)
+            for eid in ids
+            if eid in state.position
+        )
+    )
+
+
+class DistanceCache:
+    """Distance fields of the current level, rebuilt only when blocking changes.
+
+    The static mask (walls, locked doors) is recomputed only when the State's
+    `blocking` or `locked` map changes, i.e. when a door unlocks; the fields are
+    recomputed only when that mask, a (pushable or moving) box position or the
+    set of gems/exits changes. Fields of gems that are still present are reused after a pickup.
+    """
+
+    def __init__(self) -> None:
+        # State maps the static mask was built from, compared by identity
+        self._blocking: object = None
+        self._locked: object = None
+        self._static: Mask | None = None
+        self._static_version = 0
+        self._key: tuple[object, ...] | None = None
+        self._fields: DistanceFields | None = None
+        self.rebuilds = 0
+
+    def _static_mask(self, state: State) -> Mask:
+        if (
+            self._static is None
+            or self._static.shape != (state.height, state.width)
+            or state.blocking is not self._blocking
+            or state.locked is not self._locked
+        ):
+            static = np.zeros((state.height, state.width), dtype=np.bool_)
+            for eid, cls in classify_state(state).items():
+                if cls in _STATIC_BLOCKERS:
+                    pos = state.position[eid]
+                    static[pos.y, pos.x] = True
+            self._static = static
+            self._static_version += 1
+            self._blocking, self._locked = state.blocking, state.locked
+        return self._static
+
+    def fields(self, state: State) -> DistanceFields:
+        """Distance fields for `state`, from the cache when still valid."""
+        static = self._static_mask(state)
+        boxes = _positions(state, _box_ids(state))
+        exits = _positions(state, state.exit)
+        gems = {
+            eid: (state.position[eid].x, state.position[eid].y)
+            for eid in state.requirable
+            if eid in state.position
+        }
+        key = (self._static_version, boxes, exits, tuple(sorted(gems.items())))
+        if self._fields is not None and key == self._key:
+            return self._fields
+
+        blocked = static.copy()
+        for x, y in boxes:
+            blocked[y, x] = True
+        # Same obstacles as before: keep the fields of unchanged sources.
+        previous = self._fields
+        if previous is not None and not np.array_equal(previous.blocked, blocked):
+            previous = None
+        exit_field = (
+            previous.exit
+            if previous is not None and self._key is not None and self._key[2] == exits
+            else distance_field(blocked, exits)
+        )
+        gem_fields = {
+            eid: (
+                previous.gems[eid]
+                if previous is not None and eid in previous.gems
+                else distance_field(blocked, [cell])
+            )
+            for eid, cell in gems.items()
+        }
+        for array in (blocked, exit_field, *gem_fields.values()):
+            _read_only(array)
+        self._fields = DistanceFields(blocked, exit_field, gem_fields)
+        self._key = key
+        self.rebuilds += 1
+        return self._fields
+
+
+def distance_fields(state: State) -> DistanceFields:
+    """Compute the distance fields of a State without caching."""
+    return DistanceCache().fields(state)
+
+
+__all__ = [
+    "UNREACHABLE",
+    "DistanceCache",
+    "DistanceField",
+    "DistanceFields",
+    "distance_field",
+    "distance_fields",
+]
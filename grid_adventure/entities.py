@@ -1,5 +1,8 @@
+from functools import cache
+from typing import Any, TypeVar, cast
+
 from pyrsistent import pset
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 
 from grid_universe.components.effects.immunity import Immunity
 from grid_universe.components.effects.phasing import Phasing
@@ -25,6 +28,7 @@ from grid_universe.components.properties.requirable import Requirable
 from grid_universe.components.properties.rewardable import Rewardable
 from grid_universe.components.properties.status import Status
 from grid_universe.grid.entity import BaseEntity
+from grid_universe.state import State
 
 from grid_adventure.constants import (
     DEFAULT_AGENT_HEALTH,
@@ -43,6 +47,15 @@ from grid_adventure.constants import (
     SPEED_POWERUP_MULTIPLIER,
 )
 
+# Entity component attributes, i.e. those mirrored by a State component map.
+# Specialized entities inherit unset components from BaseEntity class
+# attributes, so the names are taken from State rather than entity fields.
+COMPONENT_FIELDS = tuple(f.name for f in fields(State) if hasattr(BaseEntity, f.name))
+
+# Cross-entity references (remapped after specialization) and nested entity lists.
+REFERENCE_FIELDS = ("pathfind_target_ref", "portal_pair_ref")
+NESTED_FIELDS = ("inventory_list", "status_list")
+
 
 # Base entity classes with common components.
 
@@ -211,6 +224,41 @@ class PhasingPowerUpEntity(CollectibleEntity):
     time_limit: TimeLimit = TimeLimit(amount=PHASING_POWERUP_DURATION)
 
 
+# Slotted variants.
+
+E = TypeVar("E", bound=BaseEntity)
+
+
+@cache
+def slotted(cls: type[E]) -> type[E]:
+    """Return a `__slots__` subclass of a specialized entity class.
+
+    Instances keep their fields in slots instead of a per-instance `__dict__`,
+    which makes them smaller and faster to create; being subclasses, they pass
+    the same `isinstance` checks as `cls`. The same class is returned on every
+    call for a given `cls`.
+
+    The variant is bound in this module as `Slotted<name>`, and the variants of
+    the classes defined here are also resolved on attribute lookup, so their
+    instances pickle (e.g. into rollout workers or replay files) and unpickle
+    in processes that never called `slotted`.
+    """
+    name = f"Slotted{cls.__name__}"
+    namespace = {"__module__": __name__, "__qualname__": name}
+    variant = dataclass(slots=True, repr=False)(type(name, (cls,), namespace))
+    globals()[name] = variant
+    return cast("type[E]", variant)
+
+
+def __getattr__(name: str) -> Any:
+    # Slotted variants are created on first use; see `slotted`.
+    if name.startswith("Slotted"):
+        base = globals().get(name[len("Slotted") :])
+        if isinstance(base, type) and issubclass(base, BaseEntity):
+            return slotted(base)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Helper functions to create entities with specific configurations.
 
 
@@ -1,13 +1,38 @@
 from collections.abc import Callable
 from typing import Any
 
+import numpy as np
+from PIL import Image
+
 from grid_universe.state import State
-from grid_universe.env import GridUniverseEnv, ImageObservation
+from grid_universe.env import (
+    GridUniverseEnv,
+    ImageObservation,
+    agent_observation_dict,
+    env_config_observation_dict,
+    env_status_observation_dict,
+)
 from grid_universe.renderer.image import ImageMap, DEFAULT_RESOLUTION
 from grid_universe.grid.gridstate import GridState
 
-from grid_adventure.grid import from_state
-from grid_adventure.rendering import DEFAULT_ASSET_ROOT, IMAGE_MAP
+from grid_adventure.cache import ResetCache
+from grid_adventure.distance import DistanceCache
+from grid_adventure.grid import LazyGridState, from_state
+from grid_adventure.observation import (
+    TensorObservation,
+    tensor_observation,
+    tensor_observation_space,
+)
+from grid_adventure.rendering import (
+    DEFAULT_ASSET_ROOT,
+    IMAGE_MAP,
+    ImageRenderer,
+    PaletteRenderer,
+    RGBAArray,
+)
+
+# Renderers selectable with `render_backend`; "default" is the base renderer.
+RENDER_BACKENDS = ("default", "atlas", "incremental", "palette")
 
 
 class GridAdventureEnv(GridUniverseEnv):
@@ -15,6 +40,37 @@ class GridAdventureEnv(GridUniverseEnv):
 
     This class extends the base `GridUniverseEnv` to incorporate
     Grid Adventure-specific configurations, entities, and objectives.
+
+    Besides the base observation types, `observation_type="tensor"` yields a
+    compact `(C, H, W)` uint8 array (see `grid_adventure.observation`).
+    `render_backend="atlas"` renders through the sprite atlas and tile cache of
+    `grid_adventure.rendering.ImageRenderer` instead of the base renderer, and
+    `render_backend="incremental"` additionally re-blits only the cells that
+    changed since the previous frame (see `cells_redrawn`).
+    `render_backend="palette"` draws flat coloured glyphs instead of sprites
+    (see `grid_adventure.rendering.PaletteRenderer`); pick `render_resolution`
+    as 4-8 times the grid width for small training frames.
+    With the atlas backends, `sprite_cache_dir` keeps the decoded, resized
+    sprites in an on-disk cache that worker processes map read-only instead of
+    each decoding the assets (see `grid_adventure.rendering.cached_atlas`).
+
+    `reset_cache` (a size, or a `ResetCache` to share between environments)
+    serves repeated resets with the same builder arguments from cached initial
+    States; its `hits`/`misses` counters are available on `self.reset_cache`.
+
+    With `distance_info=True`, `reset` and `step` add `info["distances"]`, the
+    cached `grid_adventure.distance.DistanceFields` of the current state.
+
+    With `observation_type="gridstate"` and `lazy_gridstate=True`, observations
+    are `grid_adventure.grid.LazyGridState` views that specialize only the cells
+    the policy reads, instead of a fully built GridState per step.
+
+    With `observation_type="image"` and `image_buffer=True` (or a caller-supplied
+    uint8 array of shape `(2, H, W, 4)`), frames are rendered into one of two
+    preallocated buffers in turn and the observation's image is a view of it: an
+    observation stays valid until the step after the one that returned it, so
+    copy it to keep it longer. Frame buffers need a renderer that draws into an
+    array (any backend but "default"), so the default backend rejects them.
     """
 
     def __init__(
@@ -25,8 +81,30 @@ class GridAdventureEnv(GridUniverseEnv):
         render_image_map: ImageMap = IMAGE_MAP,
         render_asset_root: str = DEFAULT_ASSET_ROOT,
         observation_type: str = "image",
+        render_backend: str = "default",
+        reset_cache: int | ResetCache | None = None,
+        distance_info: bool = False,
+        lazy_gridstate: bool = False,
+        image_buffer: bool | RGBAArray = False,
+        sprite_cache_dir: str | None = None,
         **kwargs: Any,
     ) -> None:
+        if render_backend not in RENDER_BACKENDS:
+            raise ValueError(f"Unknown render backend: {render_backend!r}")
+        if isinstance(image_buffer, np.ndarray) and (
+            image_buffer.dtype != np.uint8
+            or image_buffer.ndim != 4
+            or image_buffer.shape[0] != 2
+            or image_buffer.shape[3] != 4
+        ):
+            raise ValueError("image_buffer must be a uint8 array of shape (2, H, W, 4)")
+        if image_buffer is not False and render_backend == "default":
+            raise ValueError("image_buffer needs a render_backend other than 'default'")
+        if isinstance(reset_cache, int):
+            reset_cache = ResetCache(maxsize=reset_cache)
+        self.reset_cache = reset_cache
+        if reset_cache is not None:
+            initial_state_fn = reset_cache.wrap(initial_state_fn)
         super().__init__(
             initial_state_fn=initial_state_fn,
             render_mode=render_mode,
@@ -36,13 +114,110 @@ class GridAdventureEnv(GridUniverseEnv):
             observation_type=observation_type,
             **kwargs,
         )
+        if observation_type == "tensor":
+            self.observation_space = tensor_observation_space(self.width, self.height)
+
+        self._adventure_renderer: ImageRenderer | PaletteRenderer | None = None
+        if render_backend == "palette":
+            self._adventure_renderer = PaletteRenderer(resolution=render_resolution)
+        elif render_backend in ("atlas", "incremental"):
+            self._adventure_renderer = ImageRenderer(
+                resolution=render_resolution,
+                asset_root=render_asset_root,
+                image_map=render_image_map,
+                atlas=True,
+                incremental=render_backend == "incremental",
+                sprite_cache_dir=sprite_cache_dir,
+            )
+        self._distance_cache = DistanceCache() if distance_info else None
+        self._lazy_gridstate = lazy_gridstate
+        # Last lazy observation, whose position index the next one carries over
+        self._lazy_view: LazyGridState | None = None
+        self._image_buffer_enabled = image_buffer is not False
+        self._image_buffer_owned = not isinstance(image_buffer, np.ndarray)
+        self._image_buffer: RGBAArray | None = (
+            None if self._image_buffer_owned else image_buffer
+        )
+        self._image_buffer_index = 0
+
+    def reset(
+        self, *, seed: int | None = None, options: dict[str, Any] | None = None
+    ) -> tuple[Any, dict[str, Any]]:
+        self._lazy_view = None
+        obs, info = super().reset(seed=seed, options=options)
+        self._add_distance_info(info)
+        return obs, info
+
+    def step(self, action: Any) -> tuple[Any, float, bool, bool, dict[str, Any]]:
+        obs, reward, terminated, truncated, info = super().step(action)
+        self._add_distance_info(info)
+        return obs, reward, terminated, truncated, info
+
+    def _add_distance_info(self, info: dict[str, Any]) -> None:
+        if self._distance_cache is not None and self.state is not None:
+            info["distances"] = self._distance_cache.fields(self.state)
 
-    def _get_obs(self) -> ImageObservation | GridState:
+    @property
+    def cells_redrawn(self) -> int | None:
+        """Cells drawn for the last frame (None with the default backend)."""
+        if self._adventure_renderer is None:
+            return None
+        return self._adventure_renderer.cells_redrawn
+
+    def render(self, mode: str | None = None) -> Image.Image | None:
+        """Render the current state, through the selected render backend."""
+        if self._adventure_renderer is None:
+            return super().render(mode)
+        assert self.state is not None
+        image = self._adventure_renderer.render(self.state)
+        if (mode or self.render_mode) == "human":
+            image.show()
+            return None
+        return image
+
+    def _render_into_buffer(self) -> RGBAArray:
+        """Render the current state into the next frame buffer and return it."""
+        assert self.state is not None and self._adventure_renderer is not None
+        shape = self._adventure_renderer.frame_shape(self.state)
+        buffer = self._image_buffer
+        if buffer is not None and buffer.shape[1:] != shape:
+            if not self._image_buffer_owned:
+                raise ValueError(
+                    f"image_buffer frames have shape {buffer.shape[1:]}, "
+                    f"but the environment renders {shape}"
+                )
+            buffer = None
+        if buffer is None:
+            buffer = self._image_buffer = np.zeros((2, *shape), dtype=np.uint8)
+        frame = buffer[self._image_buffer_index]
+        self._image_buffer_index ^= 1
+        self._adventure_renderer.render_array(self.state, out=frame)
+        return frame
+
+    def _get_obs(
+        self,
+    ) -> ImageObservation | GridState | LazyGridState | TensorObservation:
         """
         Get the current observation from the environment. If the observation type is 'gridstate',
-        return a specialized GridState view; otherwise, return the standard observation.
+        return a specialized GridState view; if it is 'tensor', return a channel tensor built
+        straight from the ECS state; otherwise, return the standard observation.
         """
         assert self.state is not None and self.agent_id is not None
         if self._observation_type == "gridstate":
+            if self._lazy_gridstate:
+                self._lazy_view = LazyGridState(self.state, previous=self._lazy_view)
+                return self._lazy_view
             return from_state(self.state)
+        if self._observation_type == "tensor":
+            return tensor_observation(self.state)
+        if self._observation_type == "image" and self._image_buffer_enabled:
+            return {
+                "image": self._render_into_buffer(),
+                "info": {
+                    "agent": agent_observation_dict(self.state, self.agent_id),
+                    "status": env_status_observation_dict(self.state),
+                    "config": env_config_observation_dict(self.state),
+                    "message": self.state.message or "",
+                },
+            }
         return super()._get_obs()
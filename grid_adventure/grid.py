@@ -1,6 +1,13 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import fields, replace
+
+from pyrsistent import PMap, pmap
+
+from grid_universe.components.properties.position import Position
 from grid_universe.state import State
+from grid_universe.types import EntityID
 from grid_universe.grid.gridstate import GridState
 from grid_universe.grid.convert import from_state as base_from_state
 from grid_universe.grid.convert import to_state as base_to_state
@@ -8,8 +15,15 @@ from grid_universe.grid.entity import BaseEntity, copy_entity_components
 from grid_universe.grid.step import step as base_step
 from grid_universe.actions import Action
 
+from grid_adventure.gridstate import AdventureGridState, Pos, SharedGridState
+from grid_adventure.step import step as state_step
+from grid_adventure.terrain import TERRAIN_TYPES, Terrain, TerrainGridState
+
 # Specialized entity classes from Grid Adventure
 from grid_adventure.entities import (
+    COMPONENT_FIELDS,
+    NESTED_FIELDS,
+    REFERENCE_FIELDS,
     AgentEntity,
     FloorEntity,
     WallEntity,
@@ -27,6 +41,7 @@ from grid_adventure.entities import (
     SpeedPowerUpEntity,
     ShieldPowerUpEntity,
     PhasingPowerUpEntity,
+    slotted,
 )
 
 SpecializedTypes = (
@@ -50,99 +65,277 @@ SpecializedTypes = (
 )
 
 
-def _specialize_single(obj: BaseEntity) -> BaseEntity:
-    """
-    Return a specialized Grid Adventure entity based on components/appearance.
-    Keeps obj unchanged if it is already specialized.
-    """
-    if isinstance(obj, SpecializedTypes):
-        return obj
+# Component fields that decide which specialized class an entity maps to.
+_SIGNATURE_FIELDS = (
+    "agent",
+    "exit",
+    "locked",
+    "key",
+    "portal",
+    "collectible",
+    "speed",
+    "immunity",
+    "phasing",
+    "requirable",
+    "moving",
+)
 
-    def has(name: str) -> bool:
-        return getattr(obj, name, None) is not None
+# (appearance name, present signature components)
+Signature = tuple[str | None, frozenset[str]]
 
+
+def _signature(obj: BaseEntity) -> Signature:
+    """Return the classification signature of an entity."""
     app_name: str | None = getattr(getattr(obj, "appearance", None), "name", None)
+    present = frozenset(
+        name for name in _SIGNATURE_FIELDS if getattr(obj, name, None) is not None
+    )
+    return app_name, present
+
+
+def _classify(signature: Signature) -> type[BaseEntity] | None:
+    """
+    Map a signature to its specialized class using the Grid Adventure priority rules.
+    Returns None if the entity should be kept as-is.
+    """
+    app_name, present = signature
 
     # Agent
-    if has("agent"):
-        return copy_entity_components(obj, AgentEntity(), preserve_entity_id=True)
+    if "agent" in present:
+        return AgentEntity
 
     # Exit
-    if has("exit"):
-        return copy_entity_components(obj, ExitEntity(), preserve_entity_id=True)
+    if "exit" in present:
+        return ExitEntity
     # Doors (Locked vs Unlocked)
     if app_name == "door":
-        if has("locked"):
-            return copy_entity_components(
-                obj, LockedDoorEntity(), preserve_entity_id=True
-            )
-        return copy_entity_components(
-            obj, UnlockedDoorEntity(), preserve_entity_id=True
-        )
+        if "locked" in present:
+            return LockedDoorEntity
+        return UnlockedDoorEntity
 
     # Key
-    if has("key"):
-        return copy_entity_components(obj, KeyEntity(), preserve_entity_id=True)
+    if "key" in present:
+        return KeyEntity
 
     # Portal
-    if has("portal"):
-        return copy_entity_components(obj, PortalEntity(), preserve_entity_id=True)
+    if "portal" in present:
+        return PortalEntity
     # Collectibles
-    if has("collectible"):
+    if "collectible" in present:
         # Power-ups first
-        if has("speed"):
-            return copy_entity_components(
-                obj, SpeedPowerUpEntity(), preserve_entity_id=True
-            )
-        if has("immunity"):
-            return copy_entity_components(
-                obj, ShieldPowerUpEntity(), preserve_entity_id=True
-            )
-        if has("phasing"):
-            return copy_entity_components(
-                obj, PhasingPowerUpEntity(), preserve_entity_id=True
-            )
+        if "speed" in present:
+            return SpeedPowerUpEntity
+        if "immunity" in present:
+            return ShieldPowerUpEntity
+        if "phasing" in present:
+            return PhasingPowerUpEntity
         # Gem vs coin
-        if app_name == "core" or has("requirable"):
-            return copy_entity_components(obj, GemEntity(), preserve_entity_id=True)
-        return copy_entity_components(obj, CoinEntity(), preserve_entity_id=True)
+        if app_name == "core" or "requirable" in present:
+            return GemEntity
+        return CoinEntity
     # Boxes: moving vs static
     if app_name == "box":
-        if has("moving"):
-            return copy_entity_components(
-                obj, MovingBoxEntity(), preserve_entity_id=True
-            )
-        return copy_entity_components(obj, BoxEntity(), preserve_entity_id=True)
+        if "moving" in present:
+            return MovingBoxEntity
+        return BoxEntity
 
     # Hazards / monsters
     if app_name == "lava":
-        return copy_entity_components(obj, LavaEntity(), preserve_entity_id=True)
+        return LavaEntity
     if app_name == "monster" or app_name == "robot":
-        return copy_entity_components(obj, RobotEntity(), preserve_entity_id=True)
+        return RobotEntity
 
     # Background tiles
     if app_name == "floor":
-        return copy_entity_components(obj, FloorEntity(), preserve_entity_id=True)
+        return FloorEntity
     if app_name == "wall":
-        return copy_entity_components(obj, WallEntity(), preserve_entity_id=True)
+        return WallEntity
 
     # Fallback
-    return obj
+    return None
+
+
+# Signature -> specialized class, seeded from the default instance of every
+# specialized class; other signatures are classified once and memoized.
+_DISPATCH: dict[Signature, type[BaseEntity] | None] = {
+    _signature(cls()): cls for cls in SpecializedTypes
+}
+assert len(_DISPATCH) == len(SpecializedTypes), "Ambiguous entity signatures"
+
+
+def specialized_class(signature: Signature) -> type[BaseEntity] | None:
+    """Return the specialized class for a signature (None if unspecialized)."""
+    try:
+        return _DISPATCH[signature]
+    except KeyError:
+        cls = _DISPATCH[signature] = _classify(signature)
+        return cls
+
+
+def classify_state(state: State) -> dict[EntityID, type[BaseEntity]]:
+    """
+    Map every positioned entity of a State to its specialized class, without
+    materializing entities. Entities that would stay unspecialized are omitted.
+    """
+    # Signature components live in small maps; walk them once instead of
+    # probing every map for every entity.
+    present: dict[EntityID, set[str]] = {}
+    for name in _SIGNATURE_FIELDS:
+        for eid in getattr(state, name):
+            present.setdefault(eid, set()).add(name)
+
+    empty: frozenset[str] = frozenset()
+    classes: dict[EntityID, type[BaseEntity]] = {}
+    for eid in state.position:
+        appearance = state.appearance.get(eid)
+        names = present.get(eid)
+        cls = specialized_class(
+            (
+                appearance.name if appearance is not None else None,
+                frozenset(names) if names else empty,
+            )
+        )
+        if cls is not None:
+            classes[eid] = cls
+    return classes
+
+
+# Specialized class -> its `__slots__` variant (see `entities.slotted`)
+SlottedTypes: dict[type[BaseEntity], type[BaseEntity]] = {
+    cls: slotted(cls) for cls in SpecializedTypes
+}
 
 
-def _specialize_nested_list(items: list[BaseEntity] | None) -> list[BaseEntity]:
+def _specialize_single(obj: BaseEntity, slots: bool = False) -> BaseEntity:
+    """
+    Return a specialized Grid Adventure entity based on components/appearance.
+    Keeps obj unchanged if it is already specialized. With `slots`, the slotted
+    variant of the specialized class is instantiated instead.
+    """
+    if isinstance(obj, SpecializedTypes):
+        return obj
+    cls = specialized_class(_signature(obj))
+    if cls is None:
+        return obj
+    if slots:
+        cls = SlottedTypes[cls]
+    return copy_entity_components(obj, cls(), preserve_entity_id=True)
+
+
+def _specialize_nested_list(
+    items: list[BaseEntity] | None, slots: bool = False
+) -> list[BaseEntity]:
     """Specialize nested inventory/status entity lists."""
     if not items:
         return []
-    return [_specialize_single(item) for item in items]
+    return [_specialize_single(item, slots) for item in items]
+
+
+def _specialize_with_nested(obj: BaseEntity, slots: bool = False) -> BaseEntity:
+    """Specialize an entity together with its nested inventory/status lists."""
+    spec_obj = _specialize_single(obj, slots)
+
+    # Specialize nested lists if attributes exist (inventory_list, status_list)
+    if hasattr(spec_obj, "inventory_list"):
+        inv_list = getattr(spec_obj, "inventory_list", None)
+        if inv_list:
+            setattr(
+                spec_obj, "inventory_list", _specialize_nested_list(inv_list, slots)
+            )
+    if hasattr(spec_obj, "status_list"):
+        st_list = getattr(spec_obj, "status_list", None)
+        if st_list:
+            setattr(spec_obj, "status_list", _specialize_nested_list(st_list, slots))
+    return spec_obj
+
+
+def _unchanged(previous: BaseEntity, current: BaseEntity) -> bool:
+    """Return True if `current` is the same entity as `previous`, unchanged.
+
+    Components are immutable values shared between consecutive states, so the
+    identity check short-circuits for almost every untouched entity. Two
+    entities with equal components (e.g. a coin replaced by another coin in
+    the same cell) are told apart by their entity IDs.
+    """
+    if getattr(previous, "entity_id", None) != getattr(current, "entity_id", None):
+        return False
+    for name in COMPONENT_FIELDS:
+        prev_value = getattr(previous, name, None)
+        cur_value = getattr(current, name, None)
+        if prev_value is not cur_value and prev_value != cur_value:
+            return False
+    for name in NESTED_FIELDS:
+        prev_items: list[BaseEntity] = getattr(previous, name, None) or []
+        cur_items: list[BaseEntity] = getattr(current, name, None) or []
+        if len(prev_items) != len(cur_items):
+            return False
+        if not all(_unchanged(p, c) for p, c in zip(prev_items, cur_items)):
+            return False
+    return True
+
 
+def _reuse_unchanged(
+    candidates: list[BaseEntity], orig_obj: BaseEntity
+) -> BaseEntity | None:
+    """Pop and return the first candidate whose components match `orig_obj`."""
+    for i, candidate in enumerate(candidates):
+        if _unchanged(candidate, orig_obj):
+            return candidates.pop(i)
+    return None
 
-def specialize_entities(gridstate: GridState) -> GridState:
+
+def _relink(
+    orig_obj: BaseEntity, spec_obj: BaseEntity, obj_map: dict[int, BaseEntity]
+) -> None:
+    """Point the cross-entity references of `spec_obj` at specialized targets."""
+    # pathfind_target_ref
+    old_ref = getattr(orig_obj, "pathfind_target_ref", None)
+    if old_ref is not None:
+        new_ref = obj_map.get(id(old_ref))
+        if (
+            new_ref is not None
+            and getattr(spec_obj, "pathfind_target_ref", None) is not new_ref
+        ):
+            setattr(spec_obj, "pathfind_target_ref", new_ref)
+    # portal_pair_ref (ensure bidirectional)
+    old_mate = getattr(orig_obj, "portal_pair_ref", None)
+    if old_mate is not None:
+        new_mate = obj_map.get(id(old_mate))
+        if new_mate is not None:
+            if getattr(spec_obj, "portal_pair_ref", None) is not new_mate:
+                setattr(spec_obj, "portal_pair_ref", new_mate)
+            if getattr(new_mate, "portal_pair_ref", None) is None:
+                setattr(new_mate, "portal_pair_ref", spec_obj)
+
+
+def specialize_entities(
+    gridstate: GridState,
+    previous: GridState | None = None,
+    slots: bool = False,
+    terrain: Terrain | None = None,
+) -> AdventureGridState:
     """
     Returns a new GridState with entities replaced by specialized Grid Adventure subclasses.
-    Also remaps cross-entity references to the new instances.
+    Also remaps cross-entity references to the new instances. The result is an
+    `AdventureGridState`, so entities can be looked up by class with `find`.
+
+    If `previous` (the specialized GridState this one was stepped from) is given,
+    specialized instances whose cell and components are unchanged are carried
+    over from it instead of being rebuilt, and only the references of entities
+    that point at rebuilt targets are re-linked. The returned GridState then
+    shares those instances with `previous`, which should be treated as consumed.
+
+    With `slots`, rebuilt entities are instances of the `__slots__` variants in
+    `SlottedTypes`, which use less memory on large maps.
+
+    With `terrain`, the result is a `TerrainGridState` whose floors and walls
+    come from that array, below the entities of `gridstate`.
     """
-    new_grid_state = GridState(
+    if previous is not None:
+        assert (previous.width, previous.height) == (gridstate.width, gridstate.height)
+
+    extra = {} if terrain is None else {"terrain": terrain}
+    new_grid_state = (AdventureGridState if terrain is None else TerrainGridState)(
         width=gridstate.width,
         height=gridstate.height,
         movement=gridstate.movement,
@@ -154,75 +347,522 @@ def specialize_entities(gridstate: GridState) -> GridState:
         lose=gridstate.lose,
         message=gridstate.message,
         turn_limit=gridstate.turn_limit,
+        **extra,
     )
 
-    # First pass: specialize and map original object id -> new specialized object
+    # Single pass: specialize (or reuse) and map original object id -> specialized
+    # object, remembering the entities that carry cross-entity references.
     obj_map: dict[int, BaseEntity] = {}
+    linked: list[tuple[BaseEntity, BaseEntity]] = []
     for x in range(gridstate.width):
         for y in range(gridstate.height):
+            candidates = list(previous.grid[x][y]) if previous is not None else []
             specialized_cell: list[BaseEntity] = []
             for orig_obj in gridstate.grid[x][y]:
-                spec_obj = _specialize_single(orig_obj)
-
-                # Specialize nested lists if attributes exist (inventory_list, status_list)
-                if hasattr(spec_obj, "inventory_list"):
-                    inv_list = getattr(spec_obj, "inventory_list", None)
-                    if inv_list:
-                        setattr(
-                            spec_obj,
-                            "inventory_list",
-                            _specialize_nested_list(inv_list),
-                        )
-                if hasattr(spec_obj, "status_list"):
-                    st_list = getattr(spec_obj, "status_list", None)
-                    if st_list:
-                        setattr(
-                            spec_obj, "status_list", _specialize_nested_list(st_list)
-                        )
-
+                spec_obj = (
+                    _reuse_unchanged(candidates, orig_obj) if candidates else None
+                )
+                if spec_obj is None:
+                    spec_obj = _specialize_with_nested(orig_obj, slots)
                 obj_map[id(orig_obj)] = spec_obj
+                if any(
+                    getattr(orig_obj, name, None) is not None
+                    for name in REFERENCE_FIELDS
+                ):
+                    linked.append((orig_obj, spec_obj))
                 specialized_cell.append(spec_obj)
             for spec_obj in specialized_cell:
                 new_grid_state.add((x, y), spec_obj)
 
-    # Second pass: remap cross-entity references to specialized targets/pairs
-    for x in range(new_grid_state.width):
-        for y in range(new_grid_state.height):
-            for spec_obj in new_grid_state.grid[x][y]:
-                # pathfind_target_ref
-                if hasattr(spec_obj, "pathfind_target_ref"):
-                    old_ref = getattr(spec_obj, "pathfind_target_ref", None)
-                    if old_ref is not None:
-                        new_ref = obj_map.get(id(old_ref))
-                        if new_ref is not None:
-                            setattr(spec_obj, "pathfind_target_ref", new_ref)
-                # portal_pair_ref (ensure bidirectional)
-                if hasattr(spec_obj, "portal_pair_ref"):
-                    old_mate = getattr(spec_obj, "portal_pair_ref", None)
-                    if old_mate is not None:
-                        new_mate = obj_map.get(id(old_mate))
-                        if new_mate is not None:
-                            setattr(spec_obj, "portal_pair_ref", new_mate)
-                            if getattr(new_mate, "portal_pair_ref", None) is None:
-                                setattr(new_mate, "portal_pair_ref", spec_obj)
+    # Remap cross-entity references to specialized targets/pairs
+    for orig_obj, spec_obj in linked:
+        _relink(orig_obj, spec_obj, obj_map)
 
     return new_grid_state
 
 
-def from_state(state: State) -> GridState:
-    """Convert a State to a specialized GridState using Grid Adventure entity subclasses."""
+def split_terrain(state: State) -> tuple[Terrain, State]:
+    """Move the plain floors and walls of a State into a `Terrain` array.
+
+    Returns the terrain and the State without those entities. Only entities
+    whose components all equal those of a default `FloorEntity`/`WallEntity`
+    qualify, at most one of each kind per cell; everything else stays.
+    """
+    flags = {cls: flag for flag, cls in TERRAIN_TYPES.items()}
+    prototypes = {cls: cls() for cls in flags}
+    candidates = {
+        eid: cls for eid, cls in classify_state(state).items() if cls in prototypes
+    }
+    for name in COMPONENT_FIELDS:
+        if name == "position":
+            continue
+        component_map = getattr(state, name)
+        defaults = {
+            cls: getattr(prototype, name, None) for cls, prototype in prototypes.items()
+        }
+        if all(default is None for default in defaults.values()):
+            # Neither kind has this component: drop any candidate that does
+            for eid in component_map:
+                candidates.pop(eid, None)
+        else:
+            for eid, cls in list(candidates.items()):
+                if component_map.get(eid) != defaults[cls]:
+                    del candidates[eid]
+
+    terrain = Terrain.empty(state.width, state.height)
+    codes = terrain.codes
+    removed: set[EntityID] = set()
+    for eid, cls in candidates.items():
+        pos = state.position[eid]
+        flag = flags[cls]
+        if not codes[pos.y, pos.x] & flag:
+            codes[pos.y, pos.x] |= flag
+            removed.add(eid)
+
+    changes: dict[str, PMap[EntityID, object]] = {}
+    for f in fields(State):
+        component_map = getattr(state, f.name)
+        if isinstance(component_map, PMap) and not removed.isdisjoint(component_map):
+            evolver = component_map.evolver()
+            for eid in removed.intersection(component_map):
+                del evolver[eid]
+            changes[f.name] = evolver.persistent()
+    return terrain, replace(state, **changes)
+
+
+def from_state(
+    state: State, slots: bool = False, terrain: bool = False
+) -> AdventureGridState:
+    """Convert a State to a specialized GridState using Grid Adventure entity subclasses.
+
+    With `terrain`, plain floors and walls are kept in a `Terrain` array (see
+    `split_terrain`) and the result is a `TerrainGridState` that creates their
+    entities only for the cells that are accessed.
+    """
+    if terrain:
+        level_terrain, state = split_terrain(state)
+        return specialize_entities(
+            base_from_state(state), slots=slots, terrain=level_terrain
+        )
     base_grid_state = base_from_state(state)
-    return specialize_entities(base_grid_state)
+    return specialize_entities(base_grid_state, slots=slots)
 
 
-def to_state(gridstate: GridState) -> State:
+# Component attributes holding the IDs of other entities a cell depends on.
+_LINK_ATTRIBUTES = ("pair_entity", "target")
+_ID_SET_ATTRIBUTES = ("item_ids", "effect_ids")
+
+
+def _references(value: object) -> Iterator[EntityID]:
+    """IDs of the entities a component value points at."""
+    for attr in _LINK_ATTRIBUTES:
+        linked = getattr(value, attr, None)
+        if isinstance(linked, int):
+            yield linked
+    for attr in _ID_SET_ATTRIBUTES:
+        yield from getattr(value, attr, None) or ()
+
+
+def _linked(state: State, eid: EntityID) -> Iterator[EntityID]:
+    """IDs of the entities an entity's components point at."""
+    for f in fields(State):
+        component = getattr(state, f.name)
+        if isinstance(component, PMap):
+            value = component.get(eid)
+            if value is not None:
+                yield from _references(value)
+
+
+def _referrers(state: State) -> dict[EntityID, list[EntityID]]:
+    """Entity ID -> IDs of the entities whose components point at it."""
+    referrers: dict[EntityID, list[EntityID]] = {}
+    attributes = _LINK_ATTRIBUTES + _ID_SET_ATTRIBUTES
+    for f in fields(State):
+        component = getattr(state, f.name)
+        if not isinstance(component, PMap) or not component:
+            continue
+        # Component maps hold one value type; skip those without references
+        sample = next(iter(component.values()))
+        if not any(hasattr(sample, attr) for attr in attributes):
+            continue
+        for eid, value in component.items():
+            for target in _references(value):
+                referrers.setdefault(target, []).append(eid)
+    return referrers
+
+
+def _closure(
+    state: State,
+    ids_at: Mapping[Pos, Sequence[EntityID]],
+    cells: set[Pos],
+    ids: Iterable[EntityID] = (),
+    referrers: Mapping[EntityID, Sequence[EntityID]] | None = None,
+) -> tuple[set[Pos], set[EntityID]]:
+    """Cells and entities that must be converted together with `cells`.
+
+    That is whole cells of every entity in `cells` (and `ids`) and of everything
+    they transitively reference, plus referenced unpositioned entities; with
+    `referrers`, also the entities pointing at any of them.
+    """
+    cells = set(cells)
+    wanted: set[EntityID] = set()
+    pending = [eid for cell in cells for eid in ids_at.get(cell, ())]
+    pending.extend(ids)
+    while pending:
+        eid = pending.pop()
+        if eid in wanted:
+            continue
+        wanted.add(eid)
+        pending.extend(_linked(state, eid))
+        if referrers is not None:
+            pending.extend(referrers.get(eid, ()))
+        pos = state.position.get(eid)
+        if pos is not None and (pos.x, pos.y) not in cells:
+            cells.add((pos.x, pos.y))
+            pending.extend(ids_at.get((pos.x, pos.y), ()))
+    return cells, wanted
+
+
+def _convert_entities(
+    state: State, cells: Iterable[Pos], wanted: set[EntityID], slots: bool
+) -> dict[Pos, list[BaseEntity]]:
+    """Specialized entities of `cells`, built from the `wanted` entities only.
+
+    The wanted entities are converted exactly as `from_state` converts them, but
+    on a `len(cells)` x 1 strip instead of the full grid (a GridState entity has
+    no position of its own, only its cell), so the cost is proportional to the
+    entities converted rather than to the size of the level.
+    """
+    strip = {cell: i for i, cell in enumerate(sorted(cells))}
+    changes: dict[str, PMap[EntityID, object]] = {}
+    for f in fields(State):
+        component = getattr(state, f.name)
+        if isinstance(component, PMap):
+            changes[f.name] = pmap(
+                {eid: component[eid] for eid in wanted if eid in component}
+            )
+    positions: dict[EntityID, Position] = {}
+    for eid in changes["position"]:
+        pos = state.position[eid]
+        positions[eid] = Position(strip[(pos.x, pos.y)], 0)
+    changes["position"] = pmap(positions)
+    partial = specialize_entities(
+        base_from_state(replace(state, width=max(1, len(strip)), height=1, **changes)),
+        slots=slots,
+    )
+    return {cell: partial.grid[i][0] for cell, i in strip.items()}
+
+
+class _LazyColumn:
+    """Read-only `grid[x]` column of a `LazyGridState`."""
+
+    __slots__ = ("_view", "_x")
+
+    def __init__(self, view: LazyGridState, x: int) -> None:
+        self._view = view
+        self._x = x
+
+    def __len__(self) -> int:
+        return self._view.height
+
+    def __getitem__(self, y: int) -> list[BaseEntity]:
+        if y < 0:
+            y += self._view.height
+        if not 0 <= y < self._view.height:
+            raise IndexError(y)
+        return self._view._cell(self._x, y)
+
+    def __iter__(self) -> Iterator[list[BaseEntity]]:
+        for y in range(self._view.height):
+            yield self._view._cell(self._x, y)
+
+
+class LazyGridState:
+    """Read-only GridState view of a State that specializes cells on access.
+
+    Offers the `grid[x][y]`, `width`, `height`, `turn`, `score`, ... surface of a
+    GridState. A cell's entities are converted (with `base_from_state` and
+    `specialize_entities`, exactly as `from_state` does) the first time the cell
+    is read and memoized for the lifetime of the view, together with the cells
+    of entities they reference (portal pairs, pathfinding targets), so
+    references between them resolve to the same instances (cells read earlier
+    keep the instances they were first given). Reading a cell converts only the
+    entities of that group of cells, so reading k cells costs O(k) conversions
+    whatever the size of the level. Reading every cell is slower than one
+    `from_state`; use `to_gridstate()` for that.
+
+    The position index used to find a cell's entities is built on the first
+    read, in O(entities); given the view of the State one step earlier as
+    `previous`, it is instead carried over and updated for the entities the
+    step changed (see `_changed_entities`).
+    """
+
+    def __init__(
+        self,
+        state: State,
+        slots: bool = False,
+        previous: LazyGridState | None = None,
+    ) -> None:
+        self.state = state
+        self.slots = slots
+        self.width = state.width
+        self.height = state.height
+        self.movement = state.movement
+        self.objective = state.objective
+        self.seed = state.seed
+        self.turn = state.turn
+        self.score = state.score
+        self.win = state.win
+        self.lose = state.lose
+        self.message = state.message
+        self.turn_limit = state.turn_limit
+        self.grid = [_LazyColumn(self, x) for x in range(state.width)]
+        self._cells: dict[tuple[int, int], list[BaseEntity]] = {}
+        self._ids_at: PMap[Pos, tuple[EntityID, ...]] | None = None
+        self._full: AdventureGridState | None = None
+        if previous is not None:
+            self._ids_at, _ = _move_in_index(
+                previous._index(),
+                previous.state,
+                state,
+                _changed_entities(previous.state, state),
+            )
+
+    @property
+    def cells_materialized(self) -> int:
+        return len(self._cells)
+
+    def _index(self) -> PMap[Pos, tuple[EntityID, ...]]:
+        if self._ids_at is None:
+            self._ids_at = _positions_index(self.state)
+        return self._ids_at
+
+    def _cell(self, x: int, y: int) -> list[BaseEntity]:
+        cell = self._cells.get((x, y))
+        if cell is not None:
+            return cell
+        if self._full is not None:
+            cell = self._cells[(x, y)] = self._full.grid[x][y]
+            return cell
+
+        cells, wanted = _closure(self.state, self._index(), {(x, y)})
+        if not wanted:
+            cell = self._cells[(x, y)] = []
+            return cell
+        for pos, converted in _convert_entities(
+            self.state, cells, wanted, self.slots
+        ).items():
+            self._cells.setdefault(pos, converted)
+        return self._cells[(x, y)]
+
+    def to_gridstate(self) -> AdventureGridState:
+        """The fully specialized GridState (built once, like `from_state`).
+
+        Cells read afterwards come from it; cells read before keep the
+        instances they were first given.
+        """
+        if self._full is None:
+            self._full = from_state(self.state, slots=self.slots)
+        return self._full
+
+
+def to_state(gridstate: GridState | LazyGridState) -> State:
     """Convert a GridState (with specialized Grid Adventure entities) to a State."""
+    if isinstance(gridstate, LazyGridState):
+        return gridstate.state
     return base_to_state(gridstate)
 
 
-def step(gridstate: GridState, action: Action) -> GridState:
-    """Perform one step in the GridState using the base step function."""
-    return specialize_entities(base_step(gridstate, action))
+def step(
+    gridstate: GridState,
+    action: Action,
+    incremental: bool = False,
+    slots: bool = False,
+) -> AdventureGridState:
+    """Perform one step in the GridState using the base step function.
+
+    With `incremental=True`, unchanged specialized entities are carried forward
+    from `gridstate` rather than re-specialized (see `specialize_entities`); the
+    input GridState should not be used after the call. `slots` selects the
+    slotted entity variants, as in `specialize_entities`.
+    """
+    previous = gridstate if incremental else None
+    return specialize_entities(
+        base_step(gridstate, action), previous=previous, slots=slots
+    )
+
+
+def share(source: State | GridState, slots: bool = False) -> SharedGridState:
+    """Specialized `SharedGridState` of a State (or GridState), to branch from.
+
+    The result remembers its State, so `step_shared` can update it in place of
+    a full conversion.
+    """
+    state = source if isinstance(source, State) else to_state(source)
+    full = from_state(state, slots=slots)
+    root = SharedGridState(
+        width=full.width,
+        height=full.height,
+        movement=full.movement,
+        objective=full.objective,
+        seed=full.seed,
+        turn=full.turn,
+        score=full.score,
+        win=full.win,
+        lose=full.lose,
+        message=full.message,
+        turn_limit=full.turn_limit,
+    )
+    root.grid = full.grid
+    root.reindex()
+    root.state = state
+    return root
+
+
+# Component maps holding every entity a step can change: the agent (with its
+# health, inventory and effects), moving and pathfinding entities, boxes,
+# collectibles, doors and power-up counters. Floors, walls, exits, hazards and
+# portals keep their components from step to step.
+_DYNAMIC_FIELDS = tuple(
+    name
+    for name in (
+        "agent",
+        "health",
+        "inventory",
+        "status",
+        "moving",
+        "pathfinding",
+        "pushable",
+        "collectible",
+        "locked",
+        "time_limit",
+        "usage_limit",
+    )
+    if name in {f.name for f in fields(State)}
+)
+
+
+def _changed_entities(previous: State, current: State) -> set[EntityID]:
+    """IDs of the entities whose components differ between two consecutive States.
+
+    Only entities of the `_DYNAMIC_FIELDS` maps (before or after the step) are
+    compared, and component maps the step left untouched are skipped by
+    identity, so the cost is proportional to the dynamic entities rather than
+    to all entities of the level.
+    """
+    candidates: set[EntityID] = set()
+    for name in _DYNAMIC_FIELDS:
+        candidates.update(getattr(previous, name))
+        candidates.update(getattr(current, name))
+    changed: set[EntityID] = set()
+    for f in fields(State):
+        before = getattr(previous, f.name)
+        after = getattr(current, f.name)
+        if before is after or not isinstance(after, PMap):
+            continue
+        for eid in candidates:
+            old = before.get(eid)
+            new = after.get(eid)
+            if old is not new and old != new:
+                changed.add(eid)
+    return changed
+
+
+def _positions_index(state: State) -> PMap[Pos, tuple[EntityID, ...]]:
+    ids_at: dict[Pos, tuple[EntityID, ...]] = {}
+    for eid, pos in state.position.items():
+        ids_at[(pos.x, pos.y)] = ids_at.get((pos.x, pos.y), ()) + (eid,)
+    return pmap(ids_at)
+
+
+def _move_in_index(
+    ids_at: PMap[Pos, tuple[EntityID, ...]],
+    previous: State,
+    current: State,
+    changed: Iterable[EntityID],
+) -> tuple[PMap[Pos, tuple[EntityID, ...]], set[Pos]]:
+    """Update a position index for the `changed` entities of a step.
+
+    Returns the new index and the cells whose entities changed.
+    """
+    evolver = ids_at.evolver()
+    touched: set[Pos] = set()
+    for eid in changed:
+        old_pos = previous.position.get(eid)
+        new_pos = current.position.get(eid)
+        if old_pos == new_pos:
+            if new_pos is not None:
+                touched.add((new_pos.x, new_pos.y))
+            continue
+        if old_pos is not None:
+            cell = (old_pos.x, old_pos.y)
+            remaining = tuple(i for i in evolver[cell] if i != eid)
+            if remaining:
+                evolver[cell] = remaining
+            else:
+                del evolver[cell]
+            touched.add(cell)
+        if new_pos is not None:
+            cell = (new_pos.x, new_pos.y)
+            evolver[cell] = evolver[cell] + (eid,) if cell in evolver else (eid,)
+            touched.add(cell)
+    return evolver.persistent(), touched
+
+
+def step_shared(
+    gridstate: SharedGridState | GridState, action: Action, slots: bool = False
+) -> SharedGridState:
+    """Perform one step and return the result as a clone of `gridstate`.
+
+    The State is stepped with `grid_adventure.step.step`; changed entities are
+    found among the dynamic ones (see `_changed_entities`) and only the cells
+    whose entities changed (together with the cells of entities referencing
+    them or referenced by them) are converted. Every other column, cell and
+    entity is shared with `gridstate`, which stays valid. Apart from the step
+    itself, a branch costs O(width + dynamic entities + changed cells), not
+    O(width * height). A GridState that is not a `SharedGridState` built by
+    `share` is converted with `share` first.
+    """
+    if not isinstance(gridstate, SharedGridState) or gridstate.state is None:
+        gridstate = share(gridstate, slots)
+    previous = gridstate.state
+    assert previous is not None
+    if gridstate._ids_at is None:
+        gridstate._ids_at = _positions_index(previous)
+    current = state_step(previous, action)
+
+    changed = _changed_entities(previous, current)
+    child_ids_at, seeds = _move_in_index(gridstate._ids_at, previous, current, changed)
+
+    child = gridstate.clone()
+    if changed:
+        cells, wanted = _closure(
+            current, child_ids_at, seeds, changed, _referrers(current)
+        )
+        converted = _convert_entities(current, cells, wanted, slots) if wanted else {}
+        for cell in cells:
+            child.set_cell(cell, converted.get(cell, []))
+    child.turn = current.turn
+    child.score = current.score
+    child.win = current.win
+    child.lose = current.lose
+    child.message = current.message
+    child.state = current
+    child._ids_at = child_ids_at
+    return child
 
 
-__all__ = ["from_state", "to_state", "specialize_entities", "step", "GridState"]
+__all__ = [
+    "from_state",
+    "to_state",
+    "specialize_entities",
+    "step",
+    "GridState",
+    "AdventureGridState",
+    "TerrainGridState",
+    "LazyGridState",
+    "split_terrain",
+    "SharedGridState",
+    "share",
+    "step_shared",
+]
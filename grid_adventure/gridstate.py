@@ -0,0 +1,211 @@
+"""GridState with a maintained index of entities by kind."""
+
+from __future__ import annotations
+
+import copy
+from collections.abc import Iterable
+from typing import Any, TypeVar
+
+from grid_universe.grid.entity import BaseEntity
+from grid_universe.grid.gridstate import GridState
+from grid_universe.state import State
+from grid_universe.types import EntityID
+from pyrsistent import PMap, pmap
+
+Pos = tuple[int, int]
+E = TypeVar("E", bound=BaseEntity)
+
+
+class AdventureGridState(GridState):
+    """GridState that indexes its entities by class as they are added.
+
+    `find(cls)` returns the `(position, entity)` pairs of every entity of that
+    class (or a subclass) without scanning the grid. The index stays in sync as
+    long as entities are placed and removed through `add`/`add_many`/`remove`/
+    `move`; if `grid` cell lists are edited directly, call `reindex()`.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        # kind -> id(entity) -> (position, entity), in insertion order
+        self._kinds: dict[type[BaseEntity], dict[int, tuple[Pos, BaseEntity]]] = {}
+        super().__init__(*args, **kwargs)
+
+    def _index_add(self, pos: Pos, obj: BaseEntity) -> None:
+        self._kinds.setdefault(type(obj), {})[id(obj)] = ((pos[0], pos[1]), obj)
+
+    def _index_discard(self, obj: BaseEntity) -> None:
+        entries = self._kinds.get(type(obj))
+        if entries is not None:
+            entries.pop(id(obj), None)
+
+    def add(self, pos: Pos, obj: BaseEntity) -> None:
+        super().add(pos, obj)
+        self._index_add(pos, obj)
+
+    def add_many(self, items: Iterable[tuple[Pos, BaseEntity]]) -> None:
+        for pos, obj in items:
+            self.add(pos, obj)
+
+    def remove(self, pos: Pos, obj: BaseEntity) -> None:
+        """Remove `obj` (by identity) from the cell at `pos`."""
+        cell = self.grid[pos[0]][pos[1]]
+        for i, candidate in enumerate(cell):
+            if candidate is obj:
+                del cell[i]
+                break
+        else:
+            raise ValueError(f"{obj!r} is not at {pos}")
+        self._index_discard(obj)
+
+    def move(self, obj: BaseEntity, src: Pos, dst: Pos) -> None:
+        """Move `obj` from cell `src` to the top of cell `dst`."""
+        self.remove(src, obj)
+        self.add(dst, obj)
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        # The index is keyed by id(); re-key it for the unpickled entities.
+        kinds = state.pop("_kinds")
+        self.__dict__.update(state)
+        self._kinds = {}
+        for entries in kinds.values():
+            for pos, obj in entries.values():
+                self._index_add(pos, obj)
+
+    def reindex(self) -> None:
+        """Rebuild the index from the grid."""
+        self._kinds = {}
+        for x in range(self.width):
+            for y in range(self.height):
+                for obj in self.grid[x][y]:
+                    self._index_add((x, y), obj)
+
+    def find(self, cls: type[E]) -> list[tuple[Pos, E]]:
+        """All `(position, entity)` pairs whose entity is an instance of `cls`."""
+        found: list[tuple[Pos, E]] = []
+        for kind, entries in self._kinds.items():
+            if issubclass(kind, cls):
+                found.extend(entries.values())  # type: ignore[arg-type]
+        return found
+
+    def find_one(self, cls: type[E]) -> tuple[Pos, E] | None:
+        """The first `(position, entity)` pair of class `cls`, or None."""
+        for kind, entries in self._kinds.items():
+            if issubclass(kind, cls) and entries:
+                return next(iter(entries.values()))  # type: ignore[return-value]
+        return None
+
+    def positions(self, cls: type[BaseEntity]) -> set[Pos]:
+        """Cells holding at least one entity of class `cls`."""
+        return {pos for pos, _ in self.find(cls)}
+
+    def count(self, cls: type[BaseEntity]) -> int:
+        """Number of entities of class `cls`."""
+        return sum(
+            len(entries)
+            for kind, entries in self._kinds.items()
+            if issubclass(kind, cls)
+        )
+
+
+class SharedGridState(AdventureGridState):
+    """AdventureGridState whose `clone()` shares storage with the original.
+
+    A clone copies only the list of columns; columns, cell lists and entities
+    stay shared until written. The first `add`/`remove`/`set_cell` on a cell
+    copies its column (a list of `height` cell references) and that cell's
+    list, and the by-class index is kept in persistent maps, so a clone costs
+    O(width) and each later write O(height + cell size). Branching a search
+    tree therefore costs in proportion to the cells that change.
+
+    Entities are shared between clones too: call `mutable(pos, obj)` to get a
+    private copy of an entity before changing its attributes. The copy is
+    shallow, so replace nested lists (`inventory_list`, ...) instead of
+    editing them. Editing `grid` cell lists directly bypasses all of this.
+
+    `state` is the State this GridState was built from (see
+    `grid_adventure.grid.share`); any write through these methods clears it.
+    """
+
+    _kinds: dict[type[BaseEntity], PMap[int, tuple[Pos, BaseEntity]]]  # type: ignore[assignment]
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self.state: State | None = None
+        # Position -> IDs of the entities there in `state`, kept by `step_shared`
+        self._ids_at: PMap[Pos, tuple[EntityID, ...]] | None = None
+        self._owned_columns: set[int] = set()
+        self._owned_cells: set[Pos] = set()
+        super().__init__(*args, **kwargs)
+
+    def _index_add(self, pos: Pos, obj: BaseEntity) -> None:
+        kind = type(obj)
+        entries = self._kinds.get(kind, pmap())
+        self._kinds[kind] = entries.set(id(obj), ((pos[0], pos[1]), obj))
+
+    def _index_discard(self, obj: BaseEntity) -> None:
+        kind = type(obj)
+        entries = self._kinds.get(kind)
+        if entries is not None:
+            self._kinds[kind] = entries.discard(id(obj))
+
+    def _writable_cell(self, pos: Pos) -> list[BaseEntity]:
+        """The cell list at `pos`, copied first if it is shared with a clone."""
+        x, y = pos
+        self.state = None
+        if x not in self._owned_columns:
+            self.grid[x] = list(self.grid[x])
+            self._owned_columns.add(x)
+        if (x, y) not in self._owned_cells:
+            self.grid[x][y] = list(self.grid[x][y])
+            self._owned_cells.add((x, y))
+        cell: list[BaseEntity] = self.grid[x][y]
+        return cell
+
+    def add(self, pos: Pos, obj: BaseEntity) -> None:
+        self._writable_cell(pos)
+        super().add(pos, obj)
+
+    def remove(self, pos: Pos, obj: BaseEntity) -> None:
+        self._writable_cell(pos)
+        super().remove(pos, obj)
+
+    def set_cell(self, pos: Pos, objs: Iterable[BaseEntity]) -> None:
+        """Replace the entities of the cell at `pos` with `objs`."""
+        cell = self._writable_cell(pos)
+        for obj in cell:
+            self._index_discard(obj)
+        cell[:] = objs
+        for obj in cell:
+            self._index_add(pos, obj)
+
+    def mutable(self, pos: Pos, obj: E) -> E:
+        """Replace `obj` at `pos` by a private shallow copy and return the copy."""
+        cell = self._writable_cell(pos)
+        for i, candidate in enumerate(cell):
+            if candidate is obj:
+                break
+        else:
+            raise ValueError(f"{obj!r} is not at {pos}")
+        private = copy.copy(obj)
+        cell[i] = private
+        self._index_discard(obj)
+        self._index_add(pos, private)
+        return private
+
+    def reindex(self) -> None:
+        super().reindex()
+        self.state = None
+
+    def clone(self) -> SharedGridState:
+        """A GridState sharing all columns, cells and entities with this one."""
+        child = copy.copy(self)
+        child.grid = list(self.grid)
+        child._kinds = dict(self._kinds)
+        child._owned_columns = set()
+        child._owned_cells = set()
+        # Storage is now shared both ways, so neither side may write in place
+        self._owned_columns = set()
+        self._owned_cells = set()
+        return child
+
+
+__all__ = ["AdventureGridState", "SharedGridState"]
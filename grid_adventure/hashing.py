@@ -0,0 +1,268 @@
+"""Stable state fingerprints and a bounded-memory seen-set for exploration.
+
+`fingerprint(state)` hashes the parts of a State that determine its future, as
+projected by `grid_adventure.solver.canonical_key` (agent position and health,
+inventory, active power-ups and their counters, remaining collectibles, locked
+doors, robot and box positions). Each part is a feature hashed with BLAKE2b and
+the feature hashes are XORed (Zobrist hashing), so the result does not depend
+on iteration order or on Python's per-process hash seed: the same State gives
+the same fingerprint in every process.
+
+Fingerprints are not incremental: each call recomputes the projection of the
+whole State, in time proportional to its dynamic entities, rather than
+updating the previous state's fingerprint. A `StateHasher` memoizes the
+feature hashes, so after warm-up a fingerprint costs one dict lookup per
+feature on top of the projection; the memo holds one entry per distinct
+feature seen and is emptied when it reaches `max_features` (fingerprints do
+not change, only the warm-up is repeated). `fingerprint()` shares one
+module-level hasher, whose memo can be dropped with `clear_fingerprint_cache()`.
+
+`BloomFilter` remembers fingerprints in a fixed-size bit array; filters of the
+same size from different workers can be merged with `update`.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Iterator
+from hashlib import blake2b
+
+import numpy as np
+import numpy.typing as npt
+from grid_universe.state import State
+
+from grid_adventure.solver import canonical_key
+
+Feature = tuple[str | int | None, ...]
+
+_MASK64 = (1 << 64) - 1
+
+
+def _direction(direction: object) -> str | int | None:
+    value = getattr(direction, "value", direction)
+    return value if isinstance(value, (str, int)) or value is None else str(value)
+
+
+def state_features(state: State) -> Iterator[Feature]:
+    """The features a fingerprint is built from, one per part of `canonical_key`.
+
+    Raises ValueError if the State has no agent.
+    """
+    position, health, items, effects, collectibles, locked, moving, boxes = (
+        canonical_key(state)
+    )
+    if position is not None:
+        yield ("agent", *position)
+    if health is not None:
+        yield ("health", health)
+    for eid in items:
+        yield ("item", eid)
+    for effect in effects:
+        yield ("effect", *effect)
+    for eid in collectibles:
+        yield ("collectible", eid)
+    for eid in locked:
+        yield ("locked", eid)
+    for eid, x, y, direction in moving:
+        yield ("moving", eid, x, y, _direction(direction))
+    for box in boxes:
+        yield ("box", *box)
+
+
+class StateHasher:
+    """Fingerprints of `bits` (64 or 128) bits, with memoized feature hashes.
+
+    The memo keeps at most `max_features` feature hashes and is cleared when
+    full; `len()` is its current size.
+    """
+
+    def __init__(self, bits: int = 64, max_features: int = 1 << 20) -> None:
+        if bits not in (64, 128):
+            raise ValueError("bits must be 64 or 128.")
+        if max_features < 1:
+            raise ValueError("max_features must be positive.")
+        self.bits = bits
+        self.max_features = max_features
+        self._digest_size = bits // 8
+        self._features: dict[Feature, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def clear(self) -> None:
+        """Drop all memoized feature hashes."""
+        self._features.clear()
+
+    def _feature_hash(self, feature: Feature) -> int:
+        value = self._features.get(feature)
+        if value is None:
+            # repr of a tuple of ints/strings/None is the same in every process
+            digest = blake2b(
+                repr(feature).encode(), digest_size=self._digest_size
+            ).digest()
+            value = int.from_bytes(digest, "little")
+            if len(self._features) >= self.max_features:
+                self._features.clear()
+            self._features[feature] = value
+        return value
+
+    def fingerprint(self, state: State) -> int:
+        """Fingerprint of `state` as an unsigned `bits`-bit integer."""
+        result = 0
+        for feature in state_features(state):
+            result ^= self._feature_hash(feature)
+        return result
+
+    def fingerprints(self, states: Iterable[State]) -> npt.NDArray[np.uint64]:
+        """64-bit fingerprints (the low bits for 128-bit hashers) of many States."""
+        return np.fromiter(
+            (self.fingerprint(state) & _MASK64 for state in states), dtype=np.uint64
+        )
+
+
+_DEFAULT_HASHER = StateHasher()
+
+
+def fingerprint(state: State) -> int:
+    """64-bit fingerprint of `state`, from a shared module-level `StateHasher`.
+
+    The shared hasher keeps one memo entry per distinct feature (up to its
+    `max_features`); see `clear_fingerprint_cache`.
+    """
+    return _DEFAULT_HASHER.fingerprint(state)
+
+
+def clear_fingerprint_cache() -> None:
+    """Drop the feature hashes memoized by `fingerprint()`."""
+    _DEFAULT_HASHER.clear()
+
+
+def _mix64(values: npt.NDArray[np.uint64]) -> npt.NDArray[np.uint64]:
+    """SplitMix64 finalizer, to derive a second independent hash."""
+    z = values + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _as_uint64(fingerprints: Iterable[int]) -> npt.NDArray[np.uint64]:
+    if isinstance(fingerprints, np.ndarray) and fingerprints.dtype == np.uint64:
+        return fingerprints
+    return np.fromiter((int(fp) & _MASK64 for fp in fingerprints), dtype=np.uint64)
+
+
+class BloomFilter:
+    """Approximate set of 64-bit fingerprints in a fixed-size bit array.
+
+    Sized for `capacity` items at a false-positive rate of `error_rate`; it
+    never reports a false negative. Bit positions are derived from the
+    fingerprint alone, so filters built with the same size in different
+    processes agree and can be merged. `count` is the number of distinct
+    fingerprints added; after `update` it is estimated from the set bits, as
+    fingerprints added to both filters cannot be told apart.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 1e-3) -> None:
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and 0 < error_rate < 1.")
+        num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_bits = max(64, num_bits)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bits.nbytes
+
+    def _positions(
+        self, fingerprints: npt.NDArray[np.uint64]
+    ) -> npt.NDArray[np.uint64]:
+        """`(n, num_hashes)` bit positions by double hashing."""
+        h1 = fingerprints[:, None]
+        h2 = _mix64(fingerprints)[:, None] | np.uint64(1)
+        steps = np.arange(self.num_hashes, dtype=np.uint64)[None, :]
+        return (h1 + steps * h2) % np.uint64(self.num_bits)
+
+    def _contains(self, values: npt.NDArray[np.uint64]) -> npt.NDArray[np.bool_]:
+        positions = self._positions(values)
+        bits = (self._bits[positions >> np.uint64(3)] >> (positions & np.uint64(7))) & 1
+        return bits.all(axis=1)
+
+    def contains_many(self, fingerprints: Iterable[int]) -> npt.NDArray[np.bool_]:
+        """Whether each fingerprint may have been added."""
+        return self._contains(_as_uint64(fingerprints))
+
+    def add_many(self, fingerprints: Iterable[int]) -> npt.NDArray[np.bool_]:
+        """Add fingerprints; returns which ones were (probably) seen before.
+
+        A fingerprint repeated within the batch counts as seen from its second
+        occurrence on.
+        """
+        values = _as_uint64(fingerprints)
+        unique, first, inverse = np.unique(
+            values, return_index=True, return_inverse=True
+        )
+        seen = self._contains(unique)
+        result = seen[inverse]
+        repeated = np.ones(len(values), dtype=np.bool_)
+        repeated[first] = False
+        result |= repeated
+
+        positions = self._positions(unique[~seen]).ravel()
+        np.bitwise_or.at(
+            self._bits,
+            positions >> np.uint64(3),
+            (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8)),
+        )
+        self.count += int((~seen).sum())
+        return result
+
+    def add(self, fingerprint: int) -> bool:
+        """Add one fingerprint; returns True if it was (probably) seen before."""
+        return bool(self.add_many([fingerprint])[0])
+
+    def __contains__(self, fingerprint: int) -> bool:
+        return bool(self.contains_many([fingerprint])[0])
+
+    def update(self, other: BloomFilter) -> None:
+        """Merge the fingerprints of a filter of the same size into this one.
+
+        `count` becomes the usual estimate of the number of distinct
+        fingerprints from the fraction of set bits, `-m/k * ln(1 - X/m)`.
+        """
+        if (other.num_bits, other.num_hashes) != (self.num_bits, self.num_hashes):
+            raise ValueError("Bloom filters must have the same size to be merged.")
+        self._bits |= other._bits
+        set_bits = int(np.unpackbits(self._bits).sum())
+        if set_bits >= self.num_bits:
+            self.count = max(self.count, other.count)
+            return
+        self.count = round(
+            -self.num_bits / self.num_hashes * math.log(1 - set_bits / self.num_bits)
+        )
+
+    def to_bytes(self) -> bytes:
+        """The bit array, e.g. to send a filter to another worker."""
+        return self._bits.tobytes()
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, capacity: int, error_rate: float = 1e-3
+    ) -> BloomFilter:
+        """Rebuild a filter sent with `to_bytes`, given the same sizing arguments."""
+        bloom = cls(capacity, error_rate)
+        bits = np.frombuffer(data, dtype=np.uint8)
+        if bits.shape != bloom._bits.shape:
+            raise ValueError("Data does not match the filter size.")
+        bloom._bits = bits.copy()
+        return bloom
+
+
+__all__ = [
+    "BloomFilter",
+    "StateHasher",
+    "clear_fingerprint_cache",
+    "fingerprint",
+    "state_features",
+]
@@ -1,9 +1,11 @@
+from collections.abc import Callable
+
 from grid_universe.grid.gridstate import GridState
 from grid_adventure.movements import MOVEMENTS
+from grid_adventure.terrain import FLOOR, WALL, TerrainGridState
 from grid_adventure.objectives import OBJECTIVES
 from grid_adventure.entities import (
     create_agent_entity,
-    FloorEntity,
     WallEntity,
     ExitEntity,
     CoinEntity,
@@ -24,24 +26,24 @@ from grid_adventure.entities import (
 TURN_LIMIT = 50
 
 
-def _floors(gridstate: GridState) -> None:
-    for y in range(gridstate.height):
-        for x in range(gridstate.width):
-            gridstate.add((x, y), FloorEntity())
+# Floors and border walls are terrain flags, expanded to entities on access.
+def _floors(gridstate: TerrainGridState) -> None:
+    gridstate.terrain.fill(FLOOR)
 
 
-def _border(gridstate: GridState) -> None:
-    for x in range(gridstate.width):
-        gridstate.add((x, 0), WallEntity())
-        gridstate.add((x, gridstate.height - 1), WallEntity())
-    for y in range(gridstate.height):
-        gridstate.add((0, y), WallEntity())
-        gridstate.add((gridstate.width - 1, y), WallEntity())
+def _border(gridstate: TerrainGridState) -> None:
+    gridstate.terrain.border(WALL)
+    # The border has always been drawn as full rows plus full columns, which
+    # stacks a second wall on each corner; keep it so entity counts and IDs
+    # stay the same.
+    for x in (0, gridstate.width - 1):
+        for y in (0, gridstate.height - 1):
+            gridstate.add((x, y), WallEntity())
 
 
 def build_level_basic_movement(seed: int = 100) -> GridState:
     w, h = 7, 5
-    gridstate = GridState(
+    gridstate = TerrainGridState(
         w,
         h,
         movement=MOVEMENTS["cardinal"],
@@ -60,7 +62,7 @@ def build_level_basic_movement(seed: int = 100) -> GridState:
 
 def build_level_maze_turns(seed: int = 101) -> GridState:
     w, h = 9, 7
-    gridstate = GridState(
+    gridstate = TerrainGridState(
         w,
         h,
         movement=MOVEMENTS["cardinal"],
@@ -82,7 +84,7 @@ def build_level_maze_turns(seed: int = 101) -> GridState:
 
 def build_level_optional_coin(seed: int = 102) -> GridState:
     w, h = 9, 7
-    gridstate = GridState(
+    gridstate = TerrainGridState(
         w,
         h,
         movement=MOVEMENTS["cardinal"],
@@ -108,7 +110,7 @@ def build_level_optional_coin(seed: int = 102) -> GridState:
 
 def build_level_required_one(seed: int = 103) -> GridState:
     w, h = 9, 7
-    gridstate = GridState(
+    gridstate = TerrainGridState(
         w,
         h,
         movement=MOVEMENTS["cardinal"],
@@ -129,7 +131,7 @@ def build_level_required_one(seed: int = 103) -> GridState:
 
 def build_level_required_two(seed: int = 104) -> GridState:
     w, h = 11, 9
-    gridstate = GridState(
+    gridstate = TerrainGridState(
         w,
         h,
         movement=MOVEMENTS["cardinal"],
@@ -153,7 +155,7 @@ def build_level_required_two(seed: int = 104) -> GridState:
 
 def build_level_key_door(seed: int = 105) -> GridState:
     w, h = 11, 9
-    gridstate = GridState(
+    gridstate = TerrainGridState(
         w,
         h,
         movement=MOVEMENTS["cardinal"],
@@ -174,7 +176,7 @@ def build_level_key_door(seed: int = 105) -> GridState:
 
 def build_level_hazard_detour(seed: int = 106) -> GridState:
     w, h = 11, 9
-    gridstate = GridState(
+    gridstate = TerrainGridState(
         w,
         h,
         movement=MOVEMENTS["cardinal"],
@@ -194,7 +196,7 @@ def build_level_hazard_detour(seed: int = 106) -> GridState:
 
 def build_level_portal_shortcut(seed: int = 107) -> GridState:
     w, h = 11, 9
-    gridstate = GridState(
+    gridstate = TerrainGridState(
         w,
         h,
         movement=MOVEMENTS["cardinal"],
@@ -216,7 +218,7 @@ def build_level_portal_shortcut(seed: int = 107) -> GridState:
 
 def build_level_pushable_box(seed: int = 108) -> GridState:
     w, h = 11, 9
-    gridstate = GridState(
+    gridstate = TerrainGridState(
         w,
         h,
         movement=MOVEMENTS["cardinal"],
@@ -236,7 +238,7 @@ def build_level_pushable_box(seed: int = 108) -> GridState:
 
 def build_level_moving_box(seed: int = 108) -> GridState:
     w, h = 11, 9
-    gridstate = GridState(
+    gridstate = TerrainGridState(
         w,
         h,
         movement=MOVEMENTS["cardinal"],
@@ -256,7 +258,7 @@ def build_level_moving_box(seed: int = 108) -> GridState:
 
 def build_level_enemy_patrol(seed: int = 109) -> GridState:
     w, h = 13, 9
-    gridstate = GridState(
+    gridstate = TerrainGridState(
         w,
         h,
         movement=MOVEMENTS["cardinal"],
@@ -280,7 +282,7 @@ def build_level_enemy_patrol(seed: int = 109) -> GridState:
 
 def build_level_power_shield(seed: int = 110) -> GridState:
     w, h = 11, 9
-    gridstate = GridState(
+    gridstate = TerrainGridState(
         w,
         h,
         movement=MOVEMENTS["cardinal"],
@@ -301,7 +303,7 @@ def build_level_power_shield(seed: int = 110) -> GridState:
 
 def build_level_power_ghost(seed: int = 111) -> GridState:
     w, h = 13, 9
-    gridstate = GridState(
+    gridstate = TerrainGridState(
         w,
         h,
         movement=MOVEMENTS["cardinal"],
@@ -322,7 +324,7 @@ def build_level_power_ghost(seed: int = 111) -> GridState:
 
 def build_level_power_boots(seed: int = 112) -> GridState:
     w, h = 13, 9
-    gridstate = GridState(
+    gridstate = TerrainGridState(
         w,
         h,
         movement=MOVEMENTS["cardinal"],
@@ -349,7 +351,7 @@ def build_level_power_boots(seed: int = 112) -> GridState:
 
 
 def build_level_capstone(seed: int = 113) -> GridState:
-    gridstate = GridState(
+    gridstate = TerrainGridState(
         width=7,
         height=7,
         movement=MOVEMENTS["cardinal"],
@@ -403,3 +405,22 @@ def build_level_capstone(seed: int = 113) -> GridState:
     gridstate.add((6, 6), ExitEntity())
 
     return gridstate
+
+
+BUILDERS: dict[str, Callable[..., GridState]] = {
+    "A0 Basic Movement": build_level_basic_movement,
+    "A1 Maze Turns": build_level_maze_turns,
+    "A2 Optional Coin Path": build_level_optional_coin,
+    "A3 One Required Gem": build_level_required_one,
+    "A4 Two Required Gems": build_level_required_two,
+    "A5 Key & Door": build_level_key_door,
+    "A6 Hazard Detour": build_level_hazard_detour,
+    "A7 Portal Shortcut": build_level_portal_shortcut,
+    "A8 Pushable Box": build_level_pushable_box,
+    "A9 Moving Box": build_level_moving_box,
+    "A10 Enemy Patrol": build_level_enemy_patrol,
+    "A11 Shield Powerup": build_level_power_shield,
+    "A12 Ghost Powerup": build_level_power_ghost,
+    "A13 Boots Powerup": build_level_power_boots,
+    "A14 Capstone": build_level_capstone,
+}
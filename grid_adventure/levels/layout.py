@@ -0,0 +1,440 @@
+"""Compact array-backed level format with a direct-to-State loader.
+
+A level is stored as a `(L, H, W)` uint8 array of entity-kind codes (one layer
+per stacked entity, `0` = empty, otherwise `1 + index` into `SpecializedTypes`)
+plus a small JSON sidecar holding the level parameters and the few
+per-entity values that differ from the class defaults: agent health, moving
+direction and portal pairs. Both are written to a single `.npz` file.
+
+Loading a layout back with `LevelLayout.to_state` builds the ECS `State`
+directly from the code array, skipping per-cell entity construction and the
+GridState conversion.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from os import PathLike
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+from grid_universe.components.properties.health import Health
+from grid_universe.components.properties.moving import Direction, Moving
+from grid_universe.components.properties.portal import Portal
+from grid_universe.components.properties.position import Position
+from grid_universe.grid.entity import BaseEntity
+from grid_universe.grid.gridstate import GridState
+from grid_universe.state import State
+from grid_universe.types import EntityID
+from pyrsistent import PMap, pmap
+
+from grid_adventure.entities import (
+    COMPONENT_FIELDS,
+    NESTED_FIELDS,
+    AgentEntity,
+    FloorEntity,
+    MovingEntity,
+    PortalEntity,
+    WallEntity,
+)
+from grid_adventure.grid import SlottedTypes, SpecializedTypes
+from grid_adventure.movements import MOVEMENTS
+from grid_adventure.objectives import OBJECTIVES
+from grid_adventure.terrain import FLOOR, WALL, Terrain, TerrainGridState
+
+FORMAT_VERSION = 1
+
+# Entity-kind code of each specialized class (0 is reserved for "empty").
+KIND_CODES: dict[type[BaseEntity], int] = {
+    cls: i + 1 for i, cls in enumerate(SpecializedTypes)
+}
+
+# Entity class -> specialized class it is stored as (slotted variants included).
+_KINDS: dict[type[BaseEntity], type[BaseEntity]] = {
+    **{cls: cls for cls in SpecializedTypes},
+    **{variant: cls for cls, variant in SlottedTypes.items()},
+}
+
+# (x, y, layer) of one entity in the code array.
+Slot = tuple[int, int, int]
+
+StrPath = str | PathLike[str]
+
+# Components stored per kind in the sidecar instead of the code array.
+_PARAMETER_FIELDS = ("health", "moving", "portal")
+# Everything else an entity may carry must match its kind's defaults.
+_CHECKED_FIELDS = tuple(
+    name
+    for name in (*COMPONENT_FIELDS, *NESTED_FIELDS, "pathfind_target_ref")
+    if name not in _PARAMETER_FIELDS
+)
+
+
+def _prototype_components(cls: type[BaseEntity]) -> tuple[tuple[str, Any], ...]:
+    prototype = cls()
+    return tuple(
+        (name, getattr(prototype, name))
+        for name in COMPONENT_FIELDS
+        if getattr(prototype, name) is not None
+    )
+
+
+# Default components of every kind, as (State field, value) pairs.
+_PROTOTYPES: dict[int, tuple[tuple[str, Any], ...]] = {
+    code: _prototype_components(cls) for cls, code in KIND_CODES.items()
+}
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Suspend the cyclic garbage collector while building large component maps.
+
+    Bulk builds allocate hundreds of thousands of tuples, lists and component
+    maps without creating garbage; left enabled, the collector would rescan
+    them over and over.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+# Levels are usually rebuilt at the same size (one per episode), so the per-cell
+# positions and the components of a full floor layer are kept for the last
+# sizes built and shared by every State built from them.
+@lru_cache(maxsize=2)
+def _cell_positions(width: int, height: int) -> tuple[Position, ...]:
+    """Position of every cell, in `(x, y)` order (index `x * height + y`)."""
+    xs = np.repeat(np.arange(width), height).tolist()
+    ys = np.tile(np.arange(height), width).tolist()
+    with _gc_paused():
+        return tuple(map(Position, xs, ys))
+
+
+@lru_cache(maxsize=2)
+def _floor_layer(width: int, height: int) -> dict[str, PMap[EntityID, Any]]:
+    """Component maps of one floor per cell, with IDs `0 .. width * height - 1`."""
+    cells = _cell_positions(width, height)
+    with _gc_paused():
+        maps = {
+            name: pmap(dict.fromkeys(range(len(cells)), value))
+            for name, value in _PROTOTYPES[KIND_CODES[FloorEntity]]
+        }
+        maps["position"] = pmap(dict(enumerate(cells)))
+    return maps
+
+
+def _name_of(registry: dict[str, Any], value: Any, what: str) -> str:
+    for name, candidate in registry.items():
+        if candidate is value or candidate == value:
+            return name
+    raise ValueError(f"{what} {value!r} is not registered and cannot be saved.")
+
+
+def _check_defaults(obj: BaseEntity, prototype: BaseEntity, slot: Slot) -> None:
+    """Reject entities carrying state the layout format cannot represent."""
+    for name in _CHECKED_FIELDS:
+        value = getattr(obj, name, None)
+        default = getattr(prototype, name, None)
+        if value is not default and value != default:
+            raise ValueError(
+                f"{type(obj).__name__} at {slot[:2]} has a non-default {name!r} "
+                "component, which the level layout format cannot store."
+            )
+
+
+@dataclass
+class LevelLayout:
+    """Entity-kind code array plus the sidecar parameters of one level.
+
+    `codes[layer, y, x]` is the kind code of the `layer`-th entity stacked on
+    cell `(x, y)`. `health`, `directions` and `portals` hold the per-entity
+    parameters keyed by `(x, y, layer)` slot.
+    """
+
+    codes: npt.NDArray[np.uint8]
+    movement: str = "cardinal"
+    objective: str = "collect_gems_and_exit"
+    seed: int | None = None
+    turn_limit: int | None = None
+    health: dict[Slot, tuple[int, int]] = field(default_factory=dict)
+    directions: dict[Slot, Direction] = field(default_factory=dict)
+    portals: list[tuple[Slot, Slot]] = field(default_factory=list)
+
+    @property
+    def width(self) -> int:
+        return int(self.codes.shape[2])
+
+    @property
+    def height(self) -> int:
+        return int(self.codes.shape[1])
+
+    @classmethod
+    def from_gridstate(cls, gridstate: GridState) -> LevelLayout:
+        """Encode a GridState of specialized Grid Adventure entities."""
+        depth = max(
+            (len(cell) for column in gridstate.grid for cell in column), default=0
+        )
+        codes = np.zeros((depth, gridstate.height, gridstate.width), dtype=np.uint8)
+        layout = cls(
+            codes=codes,
+            movement=_name_of(MOVEMENTS, gridstate.movement, "Movement"),
+            objective=_name_of(OBJECTIVES, gridstate.objective, "Objective"),
+            seed=gridstate.seed,
+            turn_limit=gridstate.turn_limit,
+        )
+
+        slots: dict[int, Slot] = {}
+        for x in range(gridstate.width):
+            for y in range(gridstate.height):
+                for layer, obj in enumerate(gridstate.grid[x][y]):
+                    kind = _KINDS.get(type(obj))
+                    if kind is None:
+                        raise ValueError(
+                            f"Unspecialized entity {obj!r} at {(x, y)} cannot be "
+                            "stored in a level layout."
+                        )
+                    slot = (x, y, layer)
+                    prototype = kind()
+                    _check_defaults(obj, prototype, slot)
+                    codes[layer, y, x] = KIND_CODES[kind]
+                    slots[id(obj)] = slot
+
+                    if (
+                        isinstance(obj, AgentEntity)
+                        and obj.health is not None
+                        and obj.health != prototype.health
+                    ):
+                        layout.health[slot] = (
+                            obj.health.current_health,
+                            obj.health.max_health,
+                        )
+                    if isinstance(obj, MovingEntity) and obj.moving is not None:
+                        assert prototype.moving is not None
+                        moved = Moving(
+                            direction=obj.moving.direction,
+                            on_collision=prototype.moving.on_collision,
+                            speed=prototype.moving.speed,
+                        )
+                        if obj.moving != moved:
+                            raise ValueError(
+                                f"{kind.__name__} at {(x, y)} has non-default "
+                                "movement settings besides its direction."
+                            )
+                        if obj.moving != prototype.moving:
+                            layout.directions[slot] = obj.moving.direction
+
+        # Portal pairs, once per pair, in scan order of their first portal
+        for x in range(gridstate.width):
+            for y in range(gridstate.height):
+                for obj in gridstate.grid[x][y]:
+                    mate = getattr(obj, "portal_pair_ref", None)
+                    if isinstance(obj, PortalEntity) and mate is not None:
+                        first, second = slots[id(obj)], slots[id(mate)]
+                        if first < second:
+                            layout.portals.append((first, second))
+        return layout
+
+    def to_gridstate(self) -> TerrainGridState:
+        """Rebuild the level as a GridState of specialized entities.
+
+        Floors and walls at the bottom of a cell become terrain flags, created
+        as entities only when their cell is accessed.
+        """
+        terrain, dynamic = self._split_terrain()
+        gridstate = TerrainGridState(
+            self.width,
+            self.height,
+            movement=MOVEMENTS[self.movement],
+            objective=OBJECTIVES[self.objective],
+            seed=self.seed,
+            turn_limit=self.turn_limit,
+            terrain=terrain,
+        )
+        entities: dict[Slot, BaseEntity] = {}
+        layers, ys, xs = self._scan(dynamic)
+        for x, y, layer in zip(xs.tolist(), ys.tolist(), layers.tolist()):
+            kind = SpecializedTypes[self.codes[layer, y, x] - 1]
+            obj = kind()
+            slot = (x, y, layer)
+            if slot in self.health and isinstance(obj, AgentEntity):
+                current, maximum = self.health[slot]
+                obj.health = Health(current_health=current, max_health=maximum)
+            if slot in self.directions and isinstance(obj, MovingEntity):
+                obj.set_direction(self.directions[slot])
+            entities[slot] = obj
+            gridstate.add((x, y), obj)
+        for first, second in self.portals:
+            portal = entities[first]
+            mate = entities[second]
+            assert isinstance(portal, PortalEntity) and isinstance(mate, PortalEntity)
+            portal.set_pair(mate)
+        return gridstate
+
+    def to_state(self, seed: int | None = None) -> State:
+        """Build the ECS State directly from the code array.
+
+        Entity IDs are assigned in `(x, y, layer)` order, except that a bottom
+        layer made only of floors takes IDs `0 .. width * height - 1` (in `(x, y)`
+        order) ahead of every other entity: its component maps are then shared
+        with the other States of the same size rather than rebuilt. `seed`
+        overrides the stored seed.
+        """
+        with _gc_paused():
+            return self._to_state(seed)
+
+    def _to_state(self, seed: int | None) -> State:
+        width, height = self.width, self.height
+        floored = len(self.codes) > 0 and bool(
+            (self.codes[0] == KIND_CODES[FloorEntity]).all()
+        )
+        layers, ys, xs = self._scan()
+        slot_ids = np.full(self.codes.shape, -1, dtype=np.int64)
+        first_id = 0
+        if floored:
+            slot_ids[0] = np.arange(width * height).reshape(width, height).T
+            first_id = width * height
+            above = layers > 0
+            layers, ys, xs = layers[above], ys[above], xs[above]
+        kinds = self.codes[layers, ys, xs]
+        slot_ids[layers, ys, xs] = np.arange(first_id, first_id + len(kinds))
+
+        def ids(slot: Slot) -> EntityID:
+            x, y, layer = slot
+            return int(slot_ids[layer, y, x])
+
+        # Entities of one kind share the kind's default component instances.
+        maps: dict[str, dict[EntityID, Any]] = {name: {} for name in COMPONENT_FIELDS}
+        for code in np.unique(kinds).tolist():
+            kind_ids = (np.flatnonzero(kinds == code) + first_id).tolist()
+            for name, value in _PROTOTYPES[code]:
+                maps[name].update(dict.fromkeys(kind_ids, value))
+        cells = _cell_positions(width, height)
+        position = dict(
+            zip(
+                range(first_id, first_id + len(kinds)),
+                map(cells.__getitem__, (xs * height + ys).tolist()),
+            )
+        )
+
+        for slot, (current, maximum) in self.health.items():
+            maps["health"][ids(slot)] = Health(
+                current_health=current, max_health=maximum
+            )
+        for slot, direction in self.directions.items():
+            moving = maps["moving"][ids(slot)]
+            maps["moving"][ids(slot)] = Moving(
+                direction=direction,
+                on_collision=moving.on_collision,
+                speed=moving.speed,
+            )
+        for first, second in self.portals:
+            maps["portal"][ids(first)] = Portal(pair_entity=ids(second))
+            maps["portal"][ids(second)] = Portal(pair_entity=ids(first))
+
+        maps["position"] = position
+        floors = _floor_layer(width, height) if floored else {}
+        components: dict[str, Any] = {
+            name: floors[name].update(m) if name in floors else pmap(m)
+            for name, m in maps.items()
+        }
+        return State(
+            width=width,
+            height=height,
+            movement=MOVEMENTS[self.movement],
+            objective=OBJECTIVES[self.objective],
+            seed=self.seed if seed is None else seed,
+            turn_limit=self.turn_limit,
+            **components,
+        )
+
+    def _scan(
+        self, codes: npt.NDArray[np.uint8] | None = None
+    ) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+        """Layer, y and x indices of the occupied slots, in `(x, y, layer)` order."""
+        layers, ys, xs = np.nonzero(self.codes if codes is None else codes)
+        order = np.lexsort((layers, ys, xs))
+        return layers[order], ys[order], xs[order]
+
+    def _split_terrain(self) -> tuple[Terrain, npt.NDArray[np.uint8]]:
+        """Terrain of the bottom floor/wall of each cell, and the remaining codes."""
+        terrain = Terrain.empty(self.width, self.height)
+        dynamic = self.codes.copy()
+        has_floor = dynamic[0] == KIND_CODES[FloorEntity]
+        terrain.codes[has_floor] |= np.uint8(FLOOR)
+        dynamic[0][has_floor] = 0
+        # A wall directly on the floor (or at the bottom of a floorless cell)
+        padded = np.concatenate([dynamic, np.zeros_like(dynamic[:1])])
+        wall_layer = has_floor.astype(np.intp)
+        wall_codes = np.take_along_axis(padded, wall_layer[None], axis=0)[0]
+        has_wall = wall_codes == KIND_CODES[WallEntity]
+        terrain.codes[has_wall] |= np.uint8(WALL)
+        ys, xs = np.nonzero(has_wall)
+        dynamic[wall_layer[ys, xs], ys, xs] = 0
+        return terrain, dynamic
+
+    def _sidecar(self) -> dict[str, Any]:
+        return {
+            "version": FORMAT_VERSION,
+            "movement": self.movement,
+            "objective": self.objective,
+            "seed": self.seed,
+            "turn_limit": self.turn_limit,
+            "health": [[*slot, *value] for slot, value in self.health.items()],
+            "directions": [[*slot, value] for slot, value in self.directions.items()],
+            "portals": [[list(a), list(b)] for a, b in self.portals],
+        }
+
+    @classmethod
+    def _from_sidecar(
+        cls, codes: npt.NDArray[np.uint8], sidecar: dict[str, Any]
+    ) -> LevelLayout:
+        if sidecar.get("version") != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported level format version {sidecar.get('version')!r}."
+            )
+        return cls(
+            codes=codes,
+            movement=sidecar["movement"],
+            objective=sidecar["objective"],
+            seed=sidecar["seed"],
+            turn_limit=sidecar["turn_limit"],
+            health={(x, y, z): (cur, mx) for x, y, z, cur, mx in sidecar["health"]},
+            directions={(x, y, z): d for x, y, z, d in sidecar["directions"]},
+            portals=[
+                ((a[0], a[1], a[2]), (b[0], b[1], b[2])) for a, b in sidecar["portals"]
+            ],
+        )
+
+
+def save_level(level: GridState | LevelLayout, path: StrPath) -> LevelLayout:
+    """Write a level to `path` (an `.npz` archive) and return its layout."""
+    layout = (
+        level if isinstance(level, LevelLayout) else LevelLayout.from_gridstate(level)
+    )
+    sidecar = json.dumps(layout._sidecar(), separators=(",", ":")).encode()
+    with open(path, "wb") as file:
+        np.savez_compressed(
+            file, codes=layout.codes, sidecar=np.frombuffer(sidecar, dtype=np.uint8)
+        )
+    return layout
+
+
+def load_level(path: StrPath) -> LevelLayout:
+    """Read a level written by `save_level`."""
+    with np.load(path) as archive:
+        codes = archive["codes"].astype(np.uint8, copy=False)
+        sidecar = json.loads(archive["sidecar"].tobytes().decode())
+    return LevelLayout._from_sidecar(codes, sidecar)
+
+
+__all__ = ["FORMAT_VERSION", "KIND_CODES", "LevelLayout", "load_level", "save_level"]
@@ -0,0 +1,247 @@
+"""Seeded procedural Grid Adventure levels of arbitrary size.
+
+Levels are generated as NumPy code arrays (see `grid_adventure.levels.layout`)
+and turned into a `State` with `LevelLayout.to_state`, without constructing
+per-cell entities, so large maps stay cheap to build:
+
+    env = GridAdventureEnv(
+        initial_state_fn=build_procedural_level, width=256, height=256
+    )
+
+Every cell has a floor, so the floor layer's component maps are built once per
+map size and shared by all levels of that size. A 512x512 map (roughly 300k
+entities) then builds well under a second; the first build at a new size also
+builds the floor layer and takes longer. `benchmarks/bench_procedural.py`
+reports both.
+
+Every gem and every key is joined to the agent by a carved L-shaped corridor
+that only passes through floors, and the exit by one that passes through the
+locked doors: the first door closes the exit (whose other free sides are
+walled up) and further ones sit on its corridor where there is room (off the
+corridors otherwise). Boxes, lava and robots are only placed off the corridors,
+and portals next to a corridor, never on one. Without robots, every level is therefore solvable.
+Robots move, and may block a corridor or hurt the agent, so levels with robots
+(the default density has some) are not guaranteed to be solvable.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+from grid_universe.components.properties.moving import Direction
+from grid_universe.grid.entity import BaseEntity
+from grid_universe.state import State
+
+from grid_adventure.constants import ENTITY_MOVE_DIRECTION
+from grid_adventure.entities import (
+    AgentEntity,
+    BoxEntity,
+    ExitEntity,
+    FloorEntity,
+    GemEntity,
+    KeyEntity,
+    LavaEntity,
+    LockedDoorEntity,
+    PhasingPowerUpEntity,
+    PortalEntity,
+    RobotEntity,
+    ShieldPowerUpEntity,
+    SpeedPowerUpEntity,
+    WallEntity,
+)
+from grid_adventure.levels.layout import KIND_CODES, LevelLayout, Slot
+
+Cell = tuple[int, int]
+
+
+@dataclass(frozen=True)
+class Density:
+    """Entity densities, as fractions of the interior (non-border) cells.
+
+    `key_door` and `portal` count pairs; `powerup` applies to each of the three
+    power-up kinds. Counts are rounded, so small maps may get none of a kind.
+    """
+
+    wall: float = 0.2
+    gem: float = 0.002
+    key_door: float = 0.001
+    portal: float = 0.0005
+    box: float = 0.002
+    robot: float = 0.001
+    lava: float = 0.002
+    powerup: float = 0.0005
+
+
+def _code(cls: type[BaseEntity]) -> np.uint8:
+    return np.uint8(KIND_CODES[cls])
+
+
+def _carve(
+    objects: npt.NDArray[np.uint8],
+    reserved: npt.NDArray[np.bool_],
+    start: Cell,
+    end: Cell,
+    horizontal_first: bool,
+) -> None:
+    """Clear walls along an L-shaped corridor from `start` to `end` and reserve it."""
+    (x0, y0), (x1, y1) = start, end
+    corner = (x1, y0) if horizontal_first else (x0, y1)
+    for (ax, ay), (bx, by) in ((start, corner), (corner, end)):
+        ys = slice(min(ay, by), max(ay, by) + 1)
+        xs = slice(min(ax, bx), max(ax, bx) + 1)
+        segment = objects[ys, xs]
+        segment[segment == _code(WallEntity)] = 0
+        reserved[ys, xs] = True
+
+
+def _beside(cells: npt.NDArray[np.bool_]) -> npt.NDArray[np.bool_]:
+    """Cells sharing a side with one of `cells`."""
+    beside = np.zeros_like(cells)
+    beside[1:, :] |= cells[:-1, :]
+    beside[:-1, :] |= cells[1:, :]
+    beside[:, 1:] |= cells[:, :-1]
+    beside[:, :-1] |= cells[:, 1:]
+    return beside
+
+
+def _sample(
+    rng: np.random.Generator, candidates: npt.NDArray[np.bool_], count: int
+) -> list[Cell]:
+    """Pick up to `count` distinct `(x, y)` cells where `candidates` is True."""
+    ys, xs = np.nonzero(candidates)
+    count = min(count, len(xs))
+    if count == 0:
+        return []
+    picks = rng.choice(len(xs), size=count, replace=False)
+    return list(zip(xs[picks].tolist(), ys[picks].tolist()))
+
+
+def generate_layout(
+    width: int,
+    height: int,
+    seed: int = 0,
+    density: Density | None = None,
+    turn_limit: int | None = None,
+) -> LevelLayout:
+    """Generate a level layout; the same arguments give the same level.
+
+    The level is solvable when it has no robots (see the module docstring).
+    """
+    if width < 4 or height < 4:
+        raise ValueError("Procedural levels need at least 4x4 cells.")
+    density = density or Density()
+    rng = np.random.default_rng(seed)
+
+    # One object per cell on top of the floor layer; 0 = nothing.
+    objects = np.zeros((height, width), dtype=np.uint8)
+    objects[rng.random((height, width)) < density.wall] = _code(WallEntity)
+    objects[[0, -1], :] = _code(WallEntity)
+    objects[:, [0, -1]] = _code(WallEntity)
+    interior = np.zeros((height, width), dtype=np.bool_)
+    interior[1:-1, 1:-1] = True
+    area = int(interior.sum())
+
+    def count(fraction: float) -> int:
+        return round(fraction * area)
+
+    # Agent, gems and keys on distinct cells, each joined to the agent.
+    reserved = np.zeros((height, width), dtype=np.bool_)
+    num_gems, num_keys = count(density.gem), count(density.key_door)
+    agent, *targets = _sample(rng, interior, 1 + num_gems + num_keys)
+    objects[agent[1], agent[0]] = _code(AgentEntity)
+    reserved[agent[1], agent[0]] = True
+    for i, (x, y) in enumerate(targets):
+        objects[y, x] = _code(GemEntity if i < num_gems else KeyEntity)
+    for target in targets:
+        _carve(objects, reserved, agent, target, bool(rng.integers(2)))
+
+    # The exit away from those corridors where possible, so that it can be
+    # closed off: its free sides are walled up except the one its own corridor
+    # arrives from, which gets the first locked door. Further doors go on the
+    # exit corridor where it does not overlap another one.
+    near = _beside(reserved) | reserved
+    candidates = interior & ~near
+    if not candidates.any():
+        candidates = interior & ~reserved
+    ((ex, ey),) = _sample(rng, candidates, 1)
+    exit_cell = (ex, ey)
+    objects[ey, ex] = _code(ExitEntity)
+    exit_path = np.zeros_like(reserved)
+    _carve(objects, exit_path, agent, exit_cell, bool(rng.integers(2)))
+    door_cells = exit_path & ~reserved
+    door_cells[ey, ex] = False
+    sealed = np.zeros_like(reserved)
+    doors: list[Cell] = []
+    sides = [(ex + 1, ey), (ex - 1, ey), (ex, ey + 1), (ex, ey - 1)]
+    if num_keys and not near[ey, ex]:
+        (entrance,) = [(x, y) for x, y in sides if exit_path[y, x]]
+        doors.append(entrance)
+        door_cells[entrance[1], entrance[0]] = False
+        for x, y in sides:
+            if interior[y, x] and not exit_path[y, x]:
+                objects[y, x] = _code(WallEntity)
+                sealed[y, x] = True
+    doors += _sample(rng, door_cells, num_keys - len(doors))
+    for x, y in doors:
+        objects[y, x] = _code(LockedDoorEntity)
+    reserved |= exit_path
+
+    # Portals next to (never on) a corridor, so they cannot cut one off.
+    beside = _beside(reserved) & interior & ~reserved & ~sealed
+    portals = _sample(rng, beside, 2 * count(density.portal))
+    for x, y in portals:
+        objects[y, x] = _code(PortalEntity)
+
+    # Everything else on free cells off the corridors.
+    free = interior & ~reserved & (objects == 0)
+    placements: list[tuple[type[BaseEntity], int]] = [
+        (LockedDoorEntity, num_keys - len(doors)),
+        (BoxEntity, count(density.box)),
+        (RobotEntity, count(density.robot)),
+        (LavaEntity, count(density.lava)),
+        (SpeedPowerUpEntity, count(density.powerup)),
+        (ShieldPowerUpEntity, count(density.powerup)),
+        (PhasingPowerUpEntity, count(density.powerup)),
+    ]
+    cells = _sample(rng, free, sum(n for _, n in placements))
+    robots: list[Cell] = []
+    for cls, n in placements:
+        placed, cells = cells[:n], cells[n:]
+        for x, y in placed:
+            objects[y, x] = _code(cls)
+        if cls is RobotEntity:
+            robots = placed
+
+    codes = np.stack(
+        [np.full((height, width), _code(FloorEntity), dtype=np.uint8), objects]
+    )
+    directions: dict[Slot, Direction] = {
+        (x, y, 1): ENTITY_MOVE_DIRECTION[int(rng.integers(len(ENTITY_MOVE_DIRECTION)))]
+        for x, y in robots
+    }
+    return LevelLayout(
+        codes=codes,
+        seed=seed,
+        turn_limit=turn_limit,
+        directions=directions,
+        portals=[
+            ((*portals[i], 1), (*portals[i + 1], 1))
+            for i in range(0, len(portals) - 1, 2)
+        ],
+    )
+
+
+def build_procedural_level(
+    width: int = 64,
+    height: int = 64,
+    seed: int = 0,
+    density: Density | None = None,
+    turn_limit: int | None = None,
+) -> State:
+    """`initial_state_fn` building a procedural level straight to a State."""
+    return generate_layout(width, height, seed, density, turn_limit).to_state()
+
+
+__all__ = ["Density", "build_procedural_level", "generate_layout"]
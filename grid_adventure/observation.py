@@ -0,0 +1,110 @@
+"""Compact tensor observations built directly from the ECS State."""
+
+from __future__ import annotations
+
+import numpy as np
+import numpy.typing as npt
+from grid_universe.state import State
+from gymnasium import spaces
+
+from grid_adventure.grid import SpecializedTypes, classify_state
+
+# One presence channel per specialized entity kind, in `SpecializedTypes` order.
+ENTITY_CHANNELS = SpecializedTypes
+
+# Agent scalars broadcast over the whole plane, following the entity channels.
+SCALAR_CHANNELS = ("health", "inventory", "speed", "phasing", "immunity")
+
+CHANNEL_NAMES: tuple[str, ...] = (
+    *(cls.__name__ for cls in ENTITY_CHANNELS),
+    *SCALAR_CHANNELS,
+)
+NUM_CHANNELS = len(CHANNEL_NAMES)
+
+TensorObservation = npt.NDArray[np.uint8]
+
+_CHANNEL_INDEX = {cls: i for i, cls in enumerate(ENTITY_CHANNELS)}
+_SCALAR_INDEX = {
+    name: len(ENTITY_CHANNELS) + i for i, name in enumerate(SCALAR_CHANNELS)
+}
+_MAX_VALUE = np.iinfo(np.uint8).max
+
+
+def tensor_observation_space(width: int, height: int) -> spaces.Box:
+    """Return the gymnasium space of tensor observations for a given grid size."""
+    return spaces.Box(
+        low=0, high=_MAX_VALUE, shape=(NUM_CHANNELS, height, width), dtype=np.uint8
+    )
+
+
+def _agent_scalars(state: State) -> dict[str, int]:
+    """Health, inventory size and remaining power-up amounts of the agent."""
+    scalars = dict.fromkeys(SCALAR_CHANNELS, 0)
+    if not state.agent:
+        return scalars
+    agent_id = next(iter(state.agent.keys()))
+
+    health = state.health.get(agent_id)
+    if health is not None:
+        scalars["health"] = health.current_health
+    inventory = state.inventory.get(agent_id)
+    if inventory is not None:
+        scalars["inventory"] = len(inventory.item_ids)
+    status = state.status.get(agent_id)
+    if status is not None:
+        for effect_id in status.effect_ids:
+            # Remaining steps/uses of the effect, or 1 for unlimited effects
+            limit = state.time_limit.get(effect_id) or state.usage_limit.get(effect_id)
+            amount = limit.amount if limit is not None else 1
+            for name in ("speed", "phasing", "immunity"):
+                if effect_id in getattr(state, name):
+                    scalars[name] = max(scalars[name], amount)
+    return scalars
+
+
+def tensor_observation(
+    state: State, out: TensorObservation | None = None
+) -> TensorObservation:
+    """
+    Build a `(C, H, W)` uint8 observation from a State without materializing a GridState.
+
+    Channels follow `CHANNEL_NAMES`: a 0/1 presence plane per entity kind, then
+    the agent scalars filled across the whole plane (clipped to 255). If `out` is
+    given it is overwritten in place and returned; it may be larger than the
+    grid (the remainder is zero padding). A buffer with the wrong channel count
+    or smaller than the grid raises ValueError.
+    """
+    if out is None:
+        out = np.zeros((NUM_CHANNELS, state.height, state.width), dtype=np.uint8)
+    else:
+        if (
+            out.ndim != 3
+            or out.shape[0] != NUM_CHANNELS
+            or out.shape[1] < state.height
+            or out.shape[2] < state.width
+        ):
+            raise ValueError(
+                f"Output buffer of shape {out.shape} cannot hold a "
+                f"({NUM_CHANNELS}, {state.height}, {state.width}) observation"
+            )
+        out.fill(0)
+
+    classes = classify_state(state)
+    positions = [state.position[eid] for eid in classes]
+    channels = [_CHANNEL_INDEX[cls] for cls in classes.values()]
+    out[channels, [pos.y for pos in positions], [pos.x for pos in positions]] = 1
+
+    for name, value in _agent_scalars(state).items():
+        out[_SCALAR_INDEX[name], : state.height, : state.width] = min(value, _MAX_VALUE)
+    return out
+
+
+__all__ = [
+    "CHANNEL_NAMES",
+    "ENTITY_CHANNELS",
+    "NUM_CHANNELS",
+    "SCALAR_CHANNELS",
+    "TensorObservation",
+    "tensor_observation",
+    "tensor_observation_space",
+]
@@ -15,23 +15,7 @@ from grid_play.config.sources.level_selection import (
 )
 from grid_play.config.sources.base import register_level_source
 
-BUILDERS: dict[str, Builder] = {
-    "A0 Basic Movement": adv_intro_levels.build_level_basic_movement,
-    "A1 Maze Turns": adv_intro_levels.build_level_maze_turns,
-    "A2 Optional Coin Path": adv_intro_levels.build_level_optional_coin,
-    "A3 One Required Gem": adv_intro_levels.build_level_required_one,
-    "A4 Two Required Gems": adv_intro_levels.build_level_required_two,
-    "A5 Key & Door": adv_intro_levels.build_level_key_door,
-    "A6 Hazard Detour": adv_intro_levels.build_level_hazard_detour,
-    "A7 Portal Shortcut": adv_intro_levels.build_level_portal_shortcut,
-    "A8 Pushable Box": adv_intro_levels.build_level_pushable_box,
-    "A9 Moving Box": adv_intro_levels.build_level_moving_box,
-    "A10 Enemy Patrol": adv_intro_levels.build_level_enemy_patrol,
-    "A11 Shield Powerup": adv_intro_levels.build_level_power_shield,
-    "A12 Ghost Powerup": adv_intro_levels.build_level_power_ghost,
-    "A13 Boots Powerup": adv_intro_levels.build_level_power_boots,
-    "A14 Capstone": adv_intro_levels.build_level_capstone,
-}
+BUILDERS: dict[str, Builder] = dict(adv_intro_levels.BUILDERS)
 
 
 def _env_factory(
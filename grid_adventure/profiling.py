@@ -0,0 +1,239 @@
+"""Opt-in per-phase timing of environment steps.
+
+    with profile_steps() as profile:
+        for action in actions:
+            state = step(state, action)
+    print(profile.report())
+
+While the context is active, `grid_adventure.step.step` times each step through
+its `step_hook`, and the systems the base step runs (`grid_adventure.step.SYSTEMS`)
+are replaced in the base step module by wrappers that time each call. Only
+steps taken through `grid_adventure.step.step` are recorded as steps; systems
+run by other callers of the base step are recorded as single samples. System
+timings are grouped into phases (movement, collisions, portals, damage,
+pickups, effects, objective) with `SYSTEM_PHASES`, and summed per step.
+Outside the context nothing is wrapped, so there is no overhead when profiling
+is off.
+"""
+
+from __future__ import annotations
+
+import functools
+import time
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from typing import Any
+
+import grid_universe.step as base_step_module
+import numpy as np
+import numpy.typing as npt
+from grid_universe.actions import Action
+from grid_universe.state import State
+
+from grid_adventure import step as step_module
+
+# Base step system -> phase it is reported under; systems not listed here are
+# reported under their own name (without the `_system` suffix).
+SYSTEM_PHASES: dict[str, str] = {
+    "position_system": "movement",
+    "movement_system": "movement",
+    "moving_system": "movement",
+    "pathfinding_system": "movement",
+    "push_system": "movement",
+    "trail_system": "movement",
+    "collision_system": "collisions",
+    "blocking_system": "collisions",
+    "portal_system": "portals",
+    "damage_system": "damage",
+    "hazard_system": "damage",
+    "collectible_system": "pickups",
+    "unlock_system": "pickups",
+    "tile_reward_system": "pickups",
+    "tile_cost_system": "pickups",
+    "status_tick_system": "effects",
+    "status_gc_system": "effects",
+    "status_system": "effects",
+    "win_system": "objective",
+    "lose_system": "objective",
+    "turn_system": "objective",
+}
+
+# Per-step entity counts: label -> State component map that is counted.
+ENTITY_COUNTS: tuple[tuple[str, str], ...] = (
+    ("entities", "position"),
+    ("moving", "moving"),
+    ("pushable", "pushable"),
+    ("portals", "portal"),
+    ("collectibles", "collectible"),
+    ("damaging", "damage"),
+)
+
+
+def phase_of(system_name: str, phases: Mapping[str, str] = SYSTEM_PHASES) -> str:
+    """Phase a system function is reported under (see `SYSTEM_PHASES`)."""
+    return phases.get(system_name, system_name.removesuffix("_system"))
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    values = np.asarray(samples, dtype=np.float64)
+    return {
+        "count": float(len(values)),
+        "total": float(values.sum()),
+        "mean": float(values.mean()),
+        "p50": float(np.percentile(values, 50)),
+        "p95": float(np.percentile(values, 95)),
+        "max": float(values.max()),
+    }
+
+
+class StepProfile:
+    """Per-step phase timings (seconds) and entity counts collected by `profile_steps`.
+
+    `phases[name]` and `step_times` hold one sample per profiled step;
+    `entity_counts[label]` the entity counts of the State each step started from.
+    Profiles of several runs or workers can be combined with `merge`.
+    """
+
+    def __init__(self) -> None:
+        self.step_times: list[float] = []
+        self.phases: dict[str, list[float]] = {}
+        self.entity_counts: dict[str, list[int]] = {}
+        # Phase totals of the step in progress
+        self._current: dict[str, float] | None = None
+
+    def __len__(self) -> int:
+        return len(self.step_times)
+
+    def _record_phase(self, phase: str, elapsed: float) -> None:
+        if self._current is not None:
+            self._current[phase] = self._current.get(phase, 0.0) + elapsed
+        else:
+            self.phases.setdefault(phase, []).append(elapsed)
+
+    def _begin_step(self, state: State) -> dict[str, float] | None:
+        outer, self._current = self._current, {}
+        for label, name in ENTITY_COUNTS:
+            self.entity_counts.setdefault(label, []).append(len(getattr(state, name)))
+        return outer
+
+    def _end_step(self, elapsed: float, outer: dict[str, float] | None) -> None:
+        assert self._current is not None
+        self.step_times.append(elapsed)
+        for phase, total in self._current.items():
+            self.phases.setdefault(phase, []).append(total)
+        self._current = outer
+
+    def merge(self, other: StepProfile) -> None:
+        """Append the samples of `other` to this profile."""
+        self.step_times.extend(other.step_times)
+        for phase, samples in other.phases.items():
+            self.phases.setdefault(phase, []).extend(samples)
+        for label, counts in other.entity_counts.items():
+            self.entity_counts.setdefault(label, []).extend(counts)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """count/total/mean/p50/p95/max per phase, plus `"step"` for whole steps."""
+        result = {
+            phase: _summary(samples)
+            for phase, samples in sorted(
+                self.phases.items(), key=lambda item: -sum(item[1])
+            )
+        }
+        if self.step_times:
+            result["step"] = _summary(self.step_times)
+        return result
+
+    def histogram(
+        self, phase: str = "step", bins: int = 20
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+        """Counts and bin edges of the per-step times of `phase` (or whole steps)."""
+        samples = self.step_times if phase == "step" else self.phases[phase]
+        counts, edges = np.histogram(np.asarray(samples, dtype=np.float64), bins=bins)
+        return counts, edges
+
+    def report(self) -> str:
+        """Plain-text table of the summary, in microseconds, slowest phase first."""
+        lines = [
+            (
+                f"{'phase':<14}{'calls':>8}{'total ms':>10}{'mean us':>9}"
+                f"{'p95 us':>9}{'max us':>9}{'share':>7}"
+            )
+        ]
+        step_total = sum(self.step_times) or 1.0
+        for phase, stats in self.summary().items():
+            lines.append(
+                f"{phase:<14}{int(stats['count']):>8}{stats['total'] * 1e3:>10.2f}"
+                f"{stats['mean'] * 1e6:>9.1f}{stats['p95'] * 1e6:>9.1f}"
+                f"{stats['max'] * 1e6:>9.1f}{stats['total'] / step_total:>7.0%}"
+            )
+        for label, counts in self.entity_counts.items():
+            if counts:
+                lines.append(
+                    f"{label:<14}mean {np.mean(counts):.1f}, max {max(counts)} per step"
+                )
+        return "\n".join(lines)
+
+
+def _timed_system(
+    fn: Callable[..., Any], phase: str, profile: StepProfile
+) -> Callable[..., Any]:
+    @functools.wraps(fn)
+    def timed(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profile._record_phase(phase, time.perf_counter() - start)
+
+    return timed
+
+
+def _step_hook(profile: StepProfile) -> step_module.StepHook:
+    def timed(
+        state: State, action: Action, base_step: Callable[[State, Action], State]
+    ) -> State:
+        outer = profile._begin_step(state)
+        start = time.perf_counter()
+        try:
+            return base_step(state, action)
+        finally:
+            profile._end_step(time.perf_counter() - start, outer)
+
+    return timed
+
+
+@contextmanager
+def profile_steps(
+    profile: StepProfile | None = None,
+    systems: Mapping[str, str] = SYSTEM_PHASES,
+) -> Iterator[StepProfile]:
+    """Record phase timings of every `grid_adventure.step.step` inside the context.
+
+    Pass an existing `profile` to keep accumulating into it, and `systems` to
+    map the base step's systems to other phases. Not thread-safe: steps taken
+    concurrently from other threads are recorded too and may be attributed to
+    the wrong step.
+    """
+    profile = profile if profile is not None else StepProfile()
+    originals = {name: getattr(base_step_module, name) for name in step_module.SYSTEMS}
+    previous_hook = step_module.step_hook
+    for name, fn in originals.items():
+        setattr(
+            base_step_module, name, _timed_system(fn, phase_of(name, systems), profile)
+        )
+    step_module.step_hook = _step_hook(profile)
+    try:
+        yield profile
+    finally:
+        step_module.step_hook = previous_hook
+        for name, fn in originals.items():
+            setattr(base_step_module, name, fn)
+
+
+__all__ = [
+    "ENTITY_COUNTS",
+    "SYSTEM_PHASES",
+    "StepProfile",
+    "phase_of",
+    "profile_steps",
+]
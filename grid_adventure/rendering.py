@@ -1,7 +1,25 @@
+import json
 import os
+import random
+import tempfile
+from collections import OrderedDict
+from collections.abc import Callable
+from hashlib import blake2b
 from pathlib import Path
-from typing import Any
-from grid_universe.renderer.image import ImageMap, ImageRenderer as BaseImageRenderer
+from typing import Any, BinaryIO
+
+import numpy as np
+import numpy.typing as npt
+from PIL import Image
+
+from grid_universe.components.properties.appearance import Appearance
+from grid_universe.renderer.image import (
+    DEFAULT_RESOLUTION,
+    ImageMap,
+    ImageRenderer as BaseImageRenderer,
+)
+from grid_universe.state import State
+from grid_universe.types import EntityID
 
 
 # Default asset root directory.
@@ -31,14 +49,610 @@ IMAGE_MAP: ImageMap = ImageMap(
     }
 )
 
+# Image map key: (appearance name, sorted property names).
+ImageKey = tuple[str, tuple[str, ...]]
+
+RGBAArray = npt.NDArray[np.uint8]
+
+_IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif")
+
+# Size of icons drawn in a cell corner next to a main object, relative to the cell.
+ICON_SCALE = 0.4
+
+
+def _sprite_paths(asset_root: str, target: str) -> list[str]:
+    """Resolve an image map value to its image file(s)."""
+    path = os.path.join(asset_root, target)
+    if os.path.isdir(path):
+        return [
+            os.path.join(path, name)
+            for name in sorted(os.listdir(path))
+            if name.lower().endswith(_IMAGE_EXTENSIONS)
+        ]
+    if os.path.isfile(path):
+        return [path]
+    return []
+
+
+def _load_sprite(path: str, size: int) -> RGBAArray:
+    with Image.open(path) as image:
+        resized = image.convert("RGBA").resize((size, size), Image.Resampling.LANCZOS)
+    return np.asarray(resized, dtype=np.uint8)
+
+
+class SpriteAtlas:
+    """Every sprite referenced by an image map, decoded and resized once.
+
+    Sprites for one cell size are stacked into a single `(N, size, size, 4)`
+    uint8 array, with a matching array of corner-icon versions. `variants`
+    maps each image map key to its sprite indices (several when the image map
+    points at a directory of alternatives).
+
+    Atlases loaded with `cached_atlas` have read-only, memory-mapped arrays.
+    """
+
+    def __init__(self, image_map: ImageMap, asset_root: str, cell_size: int) -> None:
+        self.cell_size = cell_size
+        self.icon_size = max(1, int(cell_size * ICON_SCALE))
+        self.variants: dict[ImageKey, tuple[int, ...]] = {}
+
+        index_by_path: dict[str, int] = {}
+        sprites: list[RGBAArray] = []
+        for key, target in image_map.items():
+            indices: list[int] = []
+            for path in _sprite_paths(asset_root, target):
+                if path not in index_by_path:
+                    index_by_path[path] = len(sprites)
+                    sprites.append(_load_sprite(path, cell_size))
+                indices.append(index_by_path[path])
+            if indices:
+                self.variants[key] = tuple(indices)
+
+        shape = (len(sprites), cell_size, cell_size, 4)
+        self.sprites: RGBAArray = (
+            np.stack(sprites) if sprites else np.zeros(shape, dtype=np.uint8)
+        )
+        self.icons: RGBAArray = np.stack(
+            [
+                np.asarray(
+                    Image.fromarray(sprite).resize(
+                        (self.icon_size, self.icon_size), Image.Resampling.LANCZOS
+                    )
+                )
+                for sprite in self.sprites
+            ]
+            or [np.zeros((self.icon_size, self.icon_size, 4), dtype=np.uint8)]
+        )
+
+    @classmethod
+    def from_arrays(
+        cls,
+        cell_size: int,
+        variants: dict[ImageKey, tuple[int, ...]],
+        sprites: RGBAArray,
+        icons: RGBAArray,
+    ) -> "SpriteAtlas":
+        """An atlas from already decoded and resized sprite arrays."""
+        atlas = cls.__new__(cls)
+        atlas.cell_size = cell_size
+        atlas.icon_size = icons.shape[1]
+        atlas.variants = variants
+        atlas.sprites = sprites
+        atlas.icons = icons
+        return atlas
+
+
+# Bump when the cached atlas layout or the resizing changes.
+SPRITE_CACHE_VERSION = 1
+
+
+def asset_digest(image_map: ImageMap, asset_root: str, cell_size: int) -> str:
+    """Hash of the sprite files an atlas is built from, and how they are resized.
+
+    Files are hashed by content (and path relative to `asset_root`), so the
+    digest changes whenever an asset is edited, added or removed.
+    """
+    digest = blake2b(digest_size=16)
+    digest.update(repr((SPRITE_CACHE_VERSION, cell_size, ICON_SCALE)).encode())
+    for key, target in sorted(image_map.items()):
+        digest.update(repr(key).encode())
+        for path in _sprite_paths(asset_root, target):
+            digest.update(os.path.relpath(path, asset_root).encode())
+            with open(path, "rb") as file:
+                digest.update(blake2b(file.read(), digest_size=16).digest())
+    return digest.hexdigest()
+
+
+def _save_atomic(path: str, write: Callable[[BinaryIO], object]) -> None:
+    """Write a file through a temporary file, so readers never see it partial."""
+    directory = os.path.dirname(path)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            write(file)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def cached_atlas(
+    image_map: ImageMap, asset_root: str, cell_size: int, cache_dir: str
+) -> SpriteAtlas:
+    """Load the atlas for `cell_size` from `cache_dir`, building it on a miss.
+
+    The atlas is stored as `.npy` arrays (plus a JSON index of the variants)
+    named by `asset_digest` and loaded memory-mapped read-only, so processes
+    using the same cache directory share one copy of the sprites in the page
+    cache. Call it in a parent process to preload the cache for its workers.
+    """
+    stem = os.path.join(
+        cache_dir,
+        f"atlas-{cell_size}-{asset_digest(image_map, asset_root, cell_size)}",
+    )
+    index_path = stem + ".json"
+    if not os.path.exists(index_path):
+        os.makedirs(cache_dir, exist_ok=True)
+        atlas = SpriteAtlas(image_map, asset_root, cell_size)
+        _save_atomic(stem + "-sprites.npy", lambda f: np.save(f, atlas.sprites))
+        _save_atomic(stem + "-icons.npy", lambda f: np.save(f, atlas.icons))
+        entries = [
+            [name, list(props), list(ids)]
+            for (name, props), ids in atlas.variants.items()
+        ]
+        # The index is written last: its presence marks a complete entry.
+        _save_atomic(index_path, lambda f: f.write(json.dumps(entries).encode()))
+
+    with open(index_path, encoding="utf-8") as file:
+        index = json.load(file)
+    return SpriteAtlas.from_arrays(
+        cell_size,
+        {(name, tuple(props)): tuple(ids) for name, props, ids in index},
+        np.load(stem + "-sprites.npy", mmap_mode="r"),
+        np.load(stem + "-icons.npy", mmap_mode="r"),
+    )
+
+
+def _over(dst: npt.NDArray[np.float32], src: RGBAArray) -> None:
+    """Alpha-composite `src` over premultiplied float `dst` in place."""
+    src_f = src.astype(np.float32) / 255.0
+    alpha = src_f[..., 3:4]
+    dst[..., :3] = src_f[..., :3] * alpha + dst[..., :3] * (1.0 - alpha)
+    dst[..., 3:4] = alpha + dst[..., 3:4] * (1.0 - alpha)
+
+
+# A layer drawn in a cell: (sprite index, slot). Slot -1 covers the whole cell;
+# slots 0-3 place a scaled-down icon in a corner.
+_Layer = tuple[int, int]
+
+# Everything drawn in a cell: (background sprites, foreground layers).
+_Cell = tuple[tuple[int, ...], tuple[_Layer, ...]]
+
 
 class ImageRenderer(BaseImageRenderer):
-    """Image renderer for the Grid Adventure environment."""
+    """Image renderer for the Grid Adventure environment.
+
+    With `atlas=True` rendering bypasses the base renderer: all sprites are
+    loaded once per cell size into a `SpriteAtlas`, composited cell stacks are
+    memoized in an LRU cache of `cache_size` entries, and static background
+    cells (e.g. floors and walls) are composited into a base layer that is
+    reused until the background changes.
+
+    With `incremental=True` (implies `atlas`), frames are drawn into a
+    persistent buffer and only cells whose layers differ from the previous
+    frame are re-blitted; `cells_redrawn` holds the count for the last frame
+    and `total_cells_redrawn` the running total.
+
+    With `sprite_cache_dir`, atlases are loaded from (and saved to) an on-disk
+    cache shared between processes; see `cached_atlas`.
+    """
 
     def __init__(
         self,
+        resolution: int = DEFAULT_RESOLUTION,
         asset_root: str = DEFAULT_ASSET_ROOT,
         image_map: ImageMap = IMAGE_MAP,
+        atlas: bool = False,
+        cache_size: int = 4096,
+        incremental: bool = False,
+        sprite_cache_dir: str | None = None,
         **kwargs: Any,
     ):
-        super().__init__(asset_root=asset_root, image_map=image_map, **kwargs)
+        super().__init__(
+            resolution=resolution, asset_root=asset_root, image_map=image_map, **kwargs
+        )
+        self.atlas = atlas or incremental
+        self.incremental = incremental
+        self.cache_size = cache_size
+        self.sprite_cache_dir = sprite_cache_dir
+        self.cells_redrawn = 0
+        self.total_cells_redrawn = 0
+        self._resolution = resolution
+        self._asset_root = asset_root
+        self._image_map = image_map
+        self._property_names = sorted({p for _, props in image_map for p in props})
+        self._resolved: dict[ImageKey, ImageKey | None] = {}
+        self._atlases: dict[int, SpriteAtlas] = {}
+        self._tiles: OrderedDict[tuple[Any, ...], RGBAArray] = OrderedDict()
+        self._base: RGBAArray | None = None
+        self._base_key: dict[tuple[int, int], tuple[int, ...]] | None = None
+        self._frame: RGBAArray | None = None
+        self._frame_cells: dict[tuple[int, int], _Cell] = {}
+
+    def render(self, state: State) -> Image.Image:
+        if not self.atlas:
+            return super().render(state)
+        return Image.fromarray(self.render_array(state))
+
+    def get_atlas(self, cell_size: int) -> SpriteAtlas:
+        """Return the sprite atlas for a cell size, loading it on first use."""
+        atlas = self._atlases.get(cell_size)
+        if atlas is None:
+            if self.sprite_cache_dir is not None:
+                atlas = cached_atlas(
+                    self._image_map, self._asset_root, cell_size, self.sprite_cache_dir
+                )
+            else:
+                atlas = SpriteAtlas(self._image_map, self._asset_root, cell_size)
+            self._atlases[cell_size] = atlas
+        return atlas
+
+    def _resolve(self, key: ImageKey, atlas: SpriteAtlas) -> ImageKey | None:
+        """Best image map key for an (appearance, properties) pair.
+
+        Exact matches win; otherwise the same-name key whose properties are the
+        largest subset of the entity's properties is used.
+        """
+        try:
+            return self._resolved[key]
+        except KeyError:
+            pass
+        name, props = key
+        best: ImageKey | None = key if key in atlas.variants else None
+        if best is None:
+            candidates = [
+                k for k in atlas.variants if k[0] == name and set(k[1]) <= set(props)
+            ]
+            if candidates:
+                best = max(candidates, key=lambda k: len(k[1]))
+        self._resolved[key] = best
+        return best
+
+    def _cell_layers(
+        self, state: State, atlas: SpriteAtlas
+    ) -> dict[tuple[int, int], list[tuple[Appearance, int]]]:
+        """Group (appearance, sprite index) pairs by cell."""
+        properties: dict[EntityID, list[str]] = {}
+        for name in self._property_names:
+            for eid in getattr(state, name, ()):
+                properties.setdefault(eid, []).append(name)
+
+        # The base renderer picks one file of a directory per state seed (with
+        # `random.Random(seed).choice` over the sorted files), shared by every
+        # entity drawn with that image map key.
+        chosen: dict[ImageKey, int] = {}
+        cells: dict[tuple[int, int], list[tuple[Appearance, int]]] = {}
+        for eid, pos in state.position.items():
+            appearance = state.appearance.get(eid)
+            if appearance is None:
+                continue
+            key = self._resolve(
+                (appearance.name, tuple(properties.get(eid, ()))), atlas
+            )
+            if key is None:
+                continue
+            sprite = chosen.get(key)
+            if sprite is None:
+                variants = atlas.variants[key]
+                sprite = chosen[key] = (
+                    variants[0]
+                    if len(variants) == 1
+                    else random.Random(state.seed).choice(variants)
+                )
+            cells.setdefault((pos.x, pos.y), []).append((appearance, sprite))
+        return cells
+
+    @staticmethod
+    def _split_layers(
+        layers: list[tuple[Appearance, int]],
+    ) -> _Cell:
+        """Split a cell into background sprites and foreground layers, in draw order."""
+        # Higher priority values are drawn first (further back).
+        layers.sort(key=lambda layer: -layer[0].priority)
+        background = tuple(sprite for app, sprite in layers if app.background)
+        main = [sprite for app, sprite in layers if not app.background and not app.icon]
+        icons = [sprite for app, sprite in layers if not app.background and app.icon]
+        foreground: list[_Layer] = [(sprite, -1) for sprite in main]
+        if not main and icons:
+            foreground.append((icons.pop(0), -1))
+        foreground.extend((sprite, slot) for slot, sprite in enumerate(icons[:4]))
+        return background, tuple(foreground)
+
+    def _tile(
+        self,
+        atlas: SpriteAtlas,
+        background: tuple[int, ...],
+        foreground: tuple[_Layer, ...],
+    ) -> RGBAArray:
+        """Composite a cell stack, memoized in the LRU tile cache."""
+        key = (atlas.cell_size, background, foreground)
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+            return tile
+
+        size, icon = atlas.cell_size, atlas.icon_size
+        corners = [
+            (0, size - icon),
+            (0, 0),
+            (size - icon, size - icon),
+            (size - icon, 0),
+        ]
+        canvas = np.zeros((size, size, 4), dtype=np.float32)
+        for sprite in background:
+            _over(canvas, atlas.sprites[sprite])
+        for sprite, slot in foreground:
+            if slot < 0:
+                _over(canvas, atlas.sprites[sprite])
+            else:
+                y, x = corners[slot]
+                _over(canvas[y : y + icon, x : x + icon], atlas.icons[sprite])
+        alpha = canvas[..., 3:4]
+        rgb = np.divide(
+            canvas[..., :3], alpha, out=np.zeros_like(canvas[..., :3]), where=alpha > 0
+        )
+        tile = (np.concatenate([rgb, alpha], axis=-1) * 255.0 + 0.5).astype(np.uint8)
+
+        self._tiles[key] = tile
+        if len(self._tiles) > self.cache_size:
+            self._tiles.popitem(last=False)
+        return tile
+
+    def _base_layer(
+        self,
+        state: State,
+        atlas: SpriteAtlas,
+        backgrounds: dict[tuple[int, int], tuple[int, ...]],
+    ) -> RGBAArray:
+        """Frame with only background cells drawn, rebuilt when the background changes."""
+        size = atlas.cell_size
+        shape = (state.height * size, state.width * size, 4)
+        if (
+            self._base is None
+            or self._base.shape != shape
+            or self._base_key != backgrounds
+        ):
+            base = np.zeros(shape, dtype=np.uint8)
+            for (x, y), background in backgrounds.items():
+                base[y * size : (y + 1) * size, x * size : (x + 1) * size] = self._tile(
+                    atlas, background, ()
+                )
+            self._base = base
+            self._base_key = backgrounds
+        return self._base
+
+    def _render_incremental(
+        self, state: State, atlas: SpriteAtlas, cells: dict[tuple[int, int], _Cell]
+    ) -> RGBAArray:
+        """Update the persistent frame, re-blitting only cells that changed."""
+        size = atlas.cell_size
+        shape = (state.height * size, state.width * size, 4)
+        if self._frame is None or self._frame.shape != shape:
+            self._frame = np.zeros(shape, dtype=np.uint8)
+            self._frame_cells = {}
+        frame, previous = self._frame, self._frame_cells
+
+        redrawn = 0
+        for (x, y), cell in cells.items():
+            if previous.get((x, y)) != cell:
+                frame[y * size : (y + 1) * size, x * size : (x + 1) * size] = (
+                    self._tile(atlas, *cell)
+                )
+                redrawn += 1
+        for x, y in previous.keys() - cells.keys():
+            frame[y * size : (y + 1) * size, x * size : (x + 1) * size] = 0
+            redrawn += 1
+
+        self._frame_cells = cells
+        self.cells_redrawn = redrawn
+        self.total_cells_redrawn += redrawn
+        return frame
+
+    def frame_shape(self, state: State) -> tuple[int, int, int]:
+        """Shape of the `(H, W, 4)` array `render_array` produces for `state`."""
+        size = max(1, self._resolution // state.width)
+        return (state.height * size, state.width * size, 4)
+
+    def render_array(self, state: State, out: RGBAArray | None = None) -> RGBAArray:
+        """Render a State into an `(H, W, 4)` RGBA array using the sprite atlas.
+
+        With `out` (of shape `frame_shape(state)`), the frame is written into it
+        and `out` is returned instead of a new array.
+        """
+        atlas = self.get_atlas(max(1, self._resolution // state.width))
+        size = atlas.cell_size
+        if out is not None and out.shape != self.frame_shape(state):
+            raise ValueError(
+                f"Output shape {out.shape} does not match {self.frame_shape(state)}"
+            )
+
+        cells = {
+            pos: self._split_layers(layers)
+            for pos, layers in self._cell_layers(state, atlas).items()
+        }
+        if self.incremental:
+            persistent = self._render_incremental(state, atlas, cells)
+            if out is None:
+                return persistent.copy()
+            np.copyto(out, persistent)
+            return out
+
+        backgrounds = {pos: cell[0] for pos, cell in cells.items() if cell[0]}
+        base = self._base_layer(state, atlas, backgrounds)
+        if out is None:
+            frame = base.copy()
+        else:
+            np.copyto(out, base)
+            frame = out
+        redrawn = 0
+        for (x, y), (background, foreground) in cells.items():
+            if foreground:
+                frame[y * size : (y + 1) * size, x * size : (x + 1) * size] = (
+                    self._tile(atlas, background, foreground)
+                )
+                redrawn += 1
+        self.cells_redrawn = redrawn
+        self.total_cells_redrawn += redrawn
+        return frame
+
+
+# Flat colour and glyph shape per image map key, for `PaletteRenderer`.
+# Glyphs: "full" fills the cell; "square", "diamond" and "circle" are centred.
+PALETTE: dict[ImageKey, tuple[tuple[int, int, int], str]] = {
+    ("human", ()): ((40, 110, 255), "circle"),
+    ("human", ("dead",)): ((120, 120, 160), "circle"),
+    ("coin", ()): ((255, 200, 0), "circle"),
+    ("gem", ("requirable",)): ((0, 220, 220), "diamond"),
+    ("metalbox", ()): ((140, 140, 150), "square"),
+    ("box", ("pushable",)): ((170, 110, 50), "square"),
+    ("robot", ()): ((230, 40, 40), "square"),
+    ("key", ()): ((255, 230, 80), "diamond"),
+    ("portal", ()): ((170, 60, 255), "circle"),
+    ("door", ("locked",)): ((120, 70, 20), "full"),
+    ("door", ()): ((200, 160, 110), "square"),
+    ("shield", ("immunity",)): ((80, 200, 255), "diamond"),
+    ("ghost", ("phasing",)): ((220, 220, 255), "diamond"),
+    ("boots", ("speed",)): ((255, 120, 0), "diamond"),
+    ("lava", ()): ((255, 80, 0), "full"),
+    ("exit", ()): ((0, 200, 80), "full"),
+    ("wall", ()): ((60, 60, 60), "full"),
+    ("floor", ()): ((200, 200, 190), "full"),
+}
+
+# Drawn for appearances missing from the palette.
+_UNKNOWN_GLYPH: tuple[tuple[int, int, int], str] = ((255, 0, 255), "square")
+
+
+def _glyph_masks(glyphs: list[str], size: int) -> npt.NDArray[np.bool_]:
+    """`(len(glyphs), size, size)` pixel masks of the glyph shapes."""
+    c = np.abs((np.arange(size) + 0.5) / size - 0.5)
+    dx, dy = c[None, :], c[:, None]
+    shapes = {
+        "none": np.zeros((size, size), dtype=np.bool_),
+        "full": np.ones((size, size), dtype=np.bool_),
+        "square": np.maximum(dx, dy) <= 0.3,
+        "diamond": dx + dy <= 0.4,
+        "circle": dx**2 + dy**2 <= 0.35**2,
+    }
+    return np.stack([shapes[glyph] for glyph in glyphs])
+
+
+class PaletteRenderer:
+    """Symbolic renderer drawing entities as flat coloured glyphs, without PIL.
+
+    Each cell shows its top background entity (floor, wall, lava, ...) as a
+    filled square and its top other entity as a glyph from `palette` on top of
+    it; corner icons are not drawn. The frame is built with array indexing
+    from per-cell codes, so it is meant for small cells (4-8 px) in training.
+    Like `ImageRenderer`, the cell size is `resolution // width`.
+    """
+
+    def __init__(
+        self,
+        resolution: int = DEFAULT_RESOLUTION,
+        palette: dict[ImageKey, tuple[tuple[int, int, int], str]] = PALETTE,
+    ) -> None:
+        self._resolution = resolution
+        self._palette = palette
+        # Code 0 is an empty (transparent) cell, the last one `_UNKNOWN_GLYPH`.
+        entries = [((0, 0, 0), "none"), *palette.values(), _UNKNOWN_GLYPH]
+        self._codes = {key: i + 1 for i, key in enumerate(palette)}
+        self._unknown = len(entries) - 1
+        self._colors = np.array(
+            [(*rgb, 0 if i == 0 else 255) for i, (rgb, _) in enumerate(entries)],
+            dtype=np.uint8,
+        )
+        self._glyphs = [glyph for _, glyph in entries]
+        self._property_names = sorted({p for _, props in palette for p in props})
+        self._resolved: dict[ImageKey, int] = {}
+        self._masks: dict[int, npt.NDArray[np.bool_]] = {}
+        self.cells_redrawn = 0
+        self.total_cells_redrawn = 0
+
+    def _code(self, key: ImageKey) -> int:
+        """Palette code of an (appearance, properties) pair, as in `ImageRenderer`."""
+        code = self._resolved.get(key)
+        if code is None:
+            name, props = key
+            code = self._codes.get(key)
+            if code is None:
+                candidates = [
+                    k for k in self._codes if k[0] == name and set(k[1]) <= set(props)
+                ]
+                code = (
+                    self._codes[max(candidates, key=lambda k: len(k[1]))]
+                    if candidates
+                    else self._unknown
+                )
+            self._resolved[key] = code
+        return code
+
+    def _cell_codes(
+        self, state: State
+    ) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+        """`(H, W)` background and foreground codes of the top entity of each cell."""
+        properties: dict[EntityID, list[str]] = {}
+        for name in self._property_names:
+            for eid in getattr(state, name, ()):
+                properties.setdefault(eid, []).append(name)
+
+        # (x, y, is background) -> (rank, code). Lower priority is on top, and
+        # icons only show in cells without another foreground entity.
+        top: dict[tuple[int, int, bool], tuple[tuple[bool, int], int]] = {}
+        for eid, pos in state.position.items():
+            appearance = state.appearance.get(eid)
+            if appearance is None:
+                continue
+            layer = (pos.x, pos.y, appearance.background)
+            rank = (appearance.icon and not appearance.background, appearance.priority)
+            best = top.get(layer)
+            if best is None or rank < best[0]:
+                code = self._code((appearance.name, tuple(properties.get(eid, ()))))
+                top[layer] = (rank, code)
+
+        background = np.zeros((state.height, state.width), dtype=np.intp)
+        foreground = np.zeros((state.height, state.width), dtype=np.intp)
+        for (x, y, is_background), (_, code) in top.items():
+            (background if is_background else foreground)[y, x] = code
+        return background, foreground
+
+    def frame_shape(self, state: State) -> tuple[int, int, int]:
+        """Shape of the `(H, W, 4)` array `render_array` produces for `state`."""
+        size = max(1, self._resolution // state.width)
+        return (state.height * size, state.width * size, 4)
+
+    def render_array(self, state: State, out: RGBAArray | None = None) -> RGBAArray:
+        """Render a State into an `(H, W, 4)` RGBA array (into `out` if given)."""
+        shape = self.frame_shape(state)
+        if out is not None and out.shape != shape:
+            raise ValueError(f"Output shape {out.shape} does not match {shape}")
+        size = max(1, self._resolution // state.width)
+        masks = self._masks.get(size)
+        if masks is None:
+            masks = self._masks[size] = _glyph_masks(self._glyphs, size)
+
+        background, foreground = self._cell_codes(state)
+        height, width = background.shape
+        # (H, size, W, size) per-pixel codes: the glyph where its mask is set
+        covered = masks[foreground].transpose(0, 2, 1, 3)
+        pixels = np.where(
+            covered, foreground[:, None, :, None], background[:, None, :, None]
+        ).reshape(height * size, width * size)
+        frame = np.take(self._colors, pixels, axis=0, out=out)
+
+        self.cells_redrawn = height * width
+        self.total_cells_redrawn += self.cells_redrawn
+        return frame
+
+    def render(self, state: State) -> Image.Image:
+        return Image.fromarray(self.render_array(state))
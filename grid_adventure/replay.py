@@ -0,0 +1,204 @@
+"""Episode recording and deterministic replay.
+
+An episode is stored as its initial `State`, the action taken at every step and
+the step rewards, plus optional keyframes (full States every
+`keyframe_interval` steps). Any step is rebuilt by re-running
+`grid_adventure.step.step` from the nearest earlier keyframe, so random access
+to step `k` costs `k - keyframe` steps.
+
+    env = EpisodeRecorder(GridAdventureEnv(...), keyframe_interval=100)
+    env.reset(seed=0)
+    ...
+    save_trajectory(env.trajectory, "episode.npz")
+    state = Replayer(load_trajectory("episode.npz")).state_at(250)
+
+Files are `.npz` archives with one column per field (actions as uint8 indices
+into `ACTIONS`, rewards as float32) and the initial State and keyframes as
+pickles. Only load files from trusted sources.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import pickle
+from dataclasses import dataclass, field
+from itertools import pairwise
+from os import PathLike
+from typing import Any
+
+import gymnasium as gym
+import numpy as np
+import numpy.typing as npt
+from grid_universe.actions import Action
+from grid_universe.state import State
+
+from grid_adventure.step import step
+
+FORMAT_VERSION = 1
+
+ACTIONS = tuple(Action)
+_ACTION_INDEX = {action: i for i, action in enumerate(ACTIONS)}
+
+StrPath = str | PathLike[str]
+
+
+@dataclass
+class Trajectory:
+    """One recorded episode; `keyframes[k]` is the State after `k` steps."""
+
+    initial: State
+    actions: list[Action] = field(default_factory=list[Action])
+    rewards: list[float] = field(default_factory=list[float])
+    seed: int | None = None
+    keyframe_interval: int = 0
+    keyframes: dict[int, State] = field(default_factory=dict[int, State])
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def append(self, action: Action, reward: float, state: State) -> None:
+        """Record one step and the State it led to (kept if it is a keyframe)."""
+        self.actions.append(action)
+        self.rewards.append(reward)
+        if self.keyframe_interval and len(self.actions) % self.keyframe_interval == 0:
+            self.keyframes[len(self.actions)] = state
+
+
+class Replayer:
+    """Rebuild the States of a `Trajectory` on demand.
+
+    The last rebuilt State is remembered, so walking a trajectory forward costs
+    one `step` per State.
+    """
+
+    def __init__(self, trajectory: Trajectory) -> None:
+        self.trajectory = trajectory
+        self._starts = sorted(trajectory.keyframes)
+        self._last: tuple[int, State] = (0, trajectory.initial)
+
+    def __len__(self) -> int:
+        return len(self.trajectory) + 1
+
+    def state_at(self, k: int) -> State:
+        """State after the first `k` actions (`0` is the initial State)."""
+        if not 0 <= k <= len(self.trajectory):
+            raise IndexError(f"Step {k} outside 0..{len(self.trajectory)}")
+        index, state = 0, self.trajectory.initial
+        i = bisect.bisect_right(self._starts, k)
+        if i:
+            index = self._starts[i - 1]
+            state = self.trajectory.keyframes[index]
+        last_index, last_state = self._last
+        if index <= last_index <= k:
+            index, state = last_index, last_state
+        for action in self.trajectory.actions[index:k]:
+            state = step(state, action)
+        self._last = (k, state)
+        return state
+
+    def __getitem__(self, k: int) -> State:
+        return self.state_at(k)
+
+
+class EpisodeRecorder(gym.Wrapper[Any, Any, Any, Any]):
+    """Record the episodes of a `GridAdventureEnv` as `Trajectory`s.
+
+    `trajectory` holds the current episode; a reset starts a new one and moves
+    the previous one (if it has any steps) to `episodes`.
+    """
+
+    def __init__(self, env: gym.Env[Any, Any], keyframe_interval: int = 0) -> None:
+        super().__init__(env)
+        if keyframe_interval < 0:
+            raise ValueError("keyframe_interval must be non-negative.")
+        self.keyframe_interval = keyframe_interval
+        self.trajectory: Trajectory | None = None
+        self.episodes: list[Trajectory] = []
+
+    def _state(self) -> State:
+        state: State | None = getattr(self.env.unwrapped, "state", None)
+        assert state is not None, "Environment has no state; call reset() first."
+        return state
+
+    def reset(
+        self, *, seed: int | None = None, options: dict[str, Any] | None = None
+    ) -> tuple[Any, dict[str, Any]]:
+        obs, info = self.env.reset(seed=seed, options=options)
+        if self.trajectory is not None and len(self.trajectory):
+            self.episodes.append(self.trajectory)
+        self.trajectory = Trajectory(
+            initial=self._state(), seed=seed, keyframe_interval=self.keyframe_interval
+        )
+        return obs, info
+
+    def step(self, action: Any) -> tuple[Any, float, bool, bool, dict[str, Any]]:
+        assert self.trajectory is not None, "Call reset() before step()."
+        obs, reward, terminated, truncated, info = self.env.step(action)
+        recorded = action if isinstance(action, Action) else ACTIONS[int(action)]
+        self.trajectory.append(recorded, float(reward), self._state())
+        return obs, reward, terminated, truncated, info
+
+
+def _pickled(state: State) -> npt.NDArray[np.uint8]:
+    return np.frombuffer(
+        pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), dtype=np.uint8
+    )
+
+
+def save_trajectory(trajectory: Trajectory, path: StrPath) -> None:
+    """Write a trajectory to `path` as an `.npz` archive."""
+    keyframe_steps = sorted(trajectory.keyframes)
+    states = [trajectory.initial, *(trajectory.keyframes[k] for k in keyframe_steps)]
+    blobs = [_pickled(state) for state in states]
+    sidecar = {
+        "version": FORMAT_VERSION,
+        "seed": trajectory.seed,
+        "keyframe_interval": trajectory.keyframe_interval,
+    }
+    with open(path, "wb") as file:
+        np.savez_compressed(
+            file,
+            actions=np.array(
+                [_ACTION_INDEX[a] for a in trajectory.actions], dtype=np.uint8
+            ),
+            rewards=np.array(trajectory.rewards, dtype=np.float32),
+            keyframe_steps=np.array(keyframe_steps, dtype=np.int64),
+            state_offsets=np.cumsum([0, *(len(blob) for blob in blobs)]),
+            states=np.concatenate(blobs),
+            sidecar=np.frombuffer(
+                json.dumps(sidecar, separators=(",", ":")).encode(), dtype=np.uint8
+            ),
+        )
+
+
+def load_trajectory(path: StrPath) -> Trajectory:
+    """Read a trajectory written by `save_trajectory`."""
+    with np.load(path) as archive:
+        sidecar = json.loads(archive["sidecar"].tobytes().decode())
+        if sidecar.get("version") != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported trajectory format version {sidecar.get('version')!r}."
+            )
+        offsets = archive["state_offsets"].tolist()
+        blob = archive["states"].tobytes()
+        states = [pickle.loads(blob[start:end]) for start, end in pairwise(offsets)]
+        return Trajectory(
+            initial=states[0],
+            actions=[ACTIONS[i] for i in archive["actions"].tolist()],
+            rewards=archive["rewards"].tolist(),
+            seed=sidecar["seed"],
+            keyframe_interval=sidecar["keyframe_interval"],
+            keyframes=dict(zip(archive["keyframe_steps"].tolist(), states[1:])),
+        )
+
+
+__all__ = [
+    "ACTIONS",
+    "FORMAT_VERSION",
+    "EpisodeRecorder",
+    "Replayer",
+    "Trajectory",
+    "load_trajectory",
+    "save_trajectory",
+]
@@ -0,0 +1,326 @@
+"""Subprocess rollout engine writing observations into shared memory.
+
+Each worker process owns one `GridAdventureEnv` with tensor observations and
+writes every observation straight into a `multiprocessing.shared_memory` ring
+buffer; only actions and small step results travel through the pipes.
+"""
+
+from __future__ import annotations
+
+import inspect
+import multiprocessing as mp
+import sys
+import traceback
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from types import TracebackType
+from typing import Any, Self
+
+import numpy as np
+import numpy.typing as npt
+from grid_universe.actions import Action
+from grid_universe.grid.gridstate import GridState
+from grid_universe.state import State
+
+from grid_adventure.env import GridAdventureEnv
+from grid_adventure.grid import to_state
+from grid_adventure.observation import NUM_CHANNELS
+from grid_adventure.vector import Builder
+
+_ACTIONS = tuple(Action)
+
+# Reply sent by a worker: (reward, terminated, truncated), or the traceback
+# (a str) of an exception raised by its environment.
+_Reply = tuple[float, bool, bool]
+
+# Workers attach to the parent's segment without registering it with the
+# resource tracker they share with the parent (Python 3.13+); on older versions
+# the duplicate registration is harmless and the parent alone unlinks it.
+_ATTACH_KWARGS: dict[str, Any] = {"track": False} if sys.version_info >= (3, 13) else {}
+
+
+def _builder_seed(builder: Builder) -> int:
+    """Return the default `seed` of a level builder (0 if it has none)."""
+    parameter = inspect.signature(builder).parameters.get("seed")
+    if parameter is None or not isinstance(parameter.default, int):
+        return 0
+    return parameter.default
+
+
+def _worker_main(
+    index: int,
+    builder: Builder,
+    seed: int,
+    width: int,
+    height: int,
+    shm_name: str,
+    ring_shape: tuple[int, ...],
+    conn: Connection,
+) -> None:
+    """Worker loop: serve reset/step commands and write observations to the ring."""
+    shm = shared_memory.SharedMemory(name=shm_name, **_ATTACH_KWARGS)
+    ring: npt.NDArray[np.uint8] = np.ndarray(ring_shape, dtype=np.uint8, buffer=shm.buf)
+
+    def initial_state_fn(**kwargs: Any) -> State:
+        level = builder(seed=seed)
+        return to_state(level) if isinstance(level, GridState) else level
+
+    env: GridAdventureEnv | None = None
+    try:
+        while True:
+            command, slot, action = conn.recv()
+            if command == "close":
+                break
+            try:
+                if env is None:
+                    env = GridAdventureEnv(
+                        initial_state_fn=initial_state_fn,
+                        observation_type="tensor",
+                        width=width,
+                        height=height,
+                        seed=seed,
+                    )
+                if command == "reset":
+                    obs, _ = env.reset()
+                    reply: _Reply = (0.0, False, False)
+                else:
+                    obs, reward, terminated, truncated, _ = env.step(_ACTIONS[action])
+                    reply = (float(reward), bool(terminated), bool(truncated))
+                    if terminated or truncated:
+                        obs, _ = env.reset()
+                ring[slot, index] = obs
+                conn.send(reply)
+            except Exception:  # noqa: BLE001 - reported to the parent, which raises
+                conn.send(traceback.format_exc())
+                break
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        if env is not None:
+            env.close()
+        del ring
+        shm.close()
+        conn.close()
+
+
+def _worker_error(index: int, worker_traceback: str) -> RuntimeError:
+    return RuntimeError(
+        f"Rollout worker {index} raised an exception:\n{worker_traceback}"
+    )
+
+
+class RolloutEngine:
+    """Lockstep rollouts of one level builder across worker processes.
+
+    Observations live in a shared-memory ring of shape
+    `(ring_size, num_workers, C, H, W)`. `reset`/`step` return a view of the
+    slot they filled, so the last `ring_size` observations stay valid without
+    any copy; copy anything that must live longer.
+
+    Worker `i` builds its level with `builder(seed=seed + i)`, where `seed`
+    defaults to the builder's own default seed; builders may return a GridState
+    or a State. A worker that dies or stops answering within `timeout`
+    seconds is restarted (at most `max_restarts` times each); its episode is
+    then reported as truncated and the observation is the first one of a fresh
+    episode. An exception raised by a worker's environment is not retried:
+    `reset`/`step` raise a RuntimeError carrying the worker's traceback, and
+    the worker is restarted on the next call.
+    """
+
+    def __init__(
+        self,
+        builder: Builder,
+        num_workers: int = 2,
+        ring_size: int = 4,
+        seed: int | None = None,
+        timeout: float | None = None,
+        max_restarts: int = 3,
+        start_method: str | None = None,
+    ) -> None:
+        if num_workers < 1 or ring_size < 1:
+            raise ValueError("num_workers and ring_size must be positive.")
+        self.builder = builder
+        self.num_workers = num_workers
+        self.ring_size = ring_size
+        self.timeout = timeout
+        self.max_restarts = max_restarts
+        base_seed = _builder_seed(builder) if seed is None else seed
+        self.worker_seeds = [base_seed + i for i in range(num_workers)]
+        self.restarts = [0] * num_workers
+
+        sample = builder(seed=base_seed)
+        self.width, self.height = sample.width, sample.height
+        self._ring_shape = (
+            ring_size,
+            num_workers,
+            NUM_CHANNELS,
+            self.height,
+            self.width,
+        )
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=int(np.prod(self._ring_shape))
+        )
+        self._ring: npt.NDArray[np.uint8] = np.ndarray(
+            self._ring_shape, dtype=np.uint8, buffer=self._shm.buf
+        )
+        self._slot = -1
+        self._rewards = np.zeros(num_workers, dtype=np.float64)
+        self._terminations = np.zeros(num_workers, dtype=np.bool_)
+        self._truncations = np.zeros(num_workers, dtype=np.bool_)
+
+        self._ctx = mp.get_context(start_method)
+        self._processes: list[BaseProcess | None] = [None] * num_workers
+        self._conns: list[Connection | None] = [None] * num_workers
+        self._closed = False
+        for i in range(num_workers):
+            self._start_worker(i)
+
+    def _start_worker(self, index: int) -> None:
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(
+                index,
+                self.builder,
+                self.worker_seeds[index],
+                self.width,
+                self.height,
+                self._shm.name,
+                self._ring_shape,
+                child_conn,
+            ),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        self._processes[index] = process
+        self._conns[index] = parent_conn
+
+    def _stop_worker(self, index: int) -> None:
+        conn, process = self._conns[index], self._processes[index]
+        if conn is not None:
+            try:
+                conn.send(("close", 0, 0))
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+        if process is not None:
+            process.join(timeout=1.0)
+            if process.is_alive():
+                process.kill()
+                process.join()
+        self._conns[index] = None
+        self._processes[index] = None
+
+    def _restart_worker(self, index: int, slot: int) -> None:
+        """Replace a failed worker and fill its slot with a fresh episode."""
+        if self.restarts[index] >= self.max_restarts:
+            raise RuntimeError(f"Rollout worker {index} failed too many times.")
+        self.restarts[index] += 1
+        self._stop_worker(index)
+        self._start_worker(index)
+        reply = self._exchange(index, ("reset", slot, 0))
+        if reply is None:
+            raise RuntimeError(f"Rollout worker {index} failed right after restart.")
+        if isinstance(reply, str):
+            raise _worker_error(index, reply)
+
+    def _exchange(
+        self, index: int, message: tuple[str, int, int]
+    ) -> _Reply | str | None:
+        """Send one command and wait for its reply; None if the worker crashed."""
+        conn = self._conns[index]
+        assert conn is not None
+        try:
+            conn.send(message)
+            if not conn.poll(self.timeout):
+                return None
+            reply: _Reply | str = conn.recv()
+        except (EOFError, BrokenPipeError, ConnectionResetError, OSError):
+            return None
+        return reply
+
+    def _run(self, command: str, actions: list[int]) -> int:
+        if self._closed:
+            raise RuntimeError("RolloutEngine is closed.")
+        slot = (self._slot + 1) % self.ring_size
+        # Send to every worker first so they run in parallel, then collect.
+        failed: set[int] = set()
+        for i, conn in enumerate(self._conns):
+            assert conn is not None
+            try:
+                conn.send((command, slot, actions[i]))
+            except (BrokenPipeError, OSError):
+                failed.add(i)
+        # Collect every reply before raising, so no answer is left in a pipe.
+        errors: list[tuple[int, str]] = []
+        for i, conn in enumerate(self._conns):
+            assert conn is not None
+            reply: _Reply | str | None = None
+            if i not in failed:
+                try:
+                    if conn.poll(self.timeout):
+                        reply = conn.recv()
+                except (EOFError, ConnectionResetError, OSError):
+                    reply = None
+            if isinstance(reply, str):
+                errors.append((i, reply))
+                continue
+            if reply is None:
+                self._restart_worker(i, slot)
+                reply = (0.0, False, command == "step")
+            self._rewards[i], self._terminations[i], self._truncations[i] = reply
+        if errors:
+            raise _worker_error(*errors[0])
+        self._slot = slot
+        return slot
+
+    def reset(self) -> npt.NDArray[np.uint8]:
+        """Reset every worker's environment; returns the `(N, C, H, W)` observations."""
+        slot = self._run("reset", [0] * self.num_workers)
+        return self._ring[slot]
+
+    def step(
+        self, actions: npt.ArrayLike
+    ) -> tuple[
+        npt.NDArray[np.uint8],
+        npt.NDArray[np.float64],
+        npt.NDArray[np.bool_],
+        npt.NDArray[np.bool_],
+    ]:
+        """Step every worker with its action index; finished episodes auto-reset."""
+        action_list = [
+            int(a) for a in np.asarray(actions, dtype=np.intp).reshape(self.num_workers)
+        ]
+        slot = self._run("step", action_list)
+        return self._ring[slot], self._rewards, self._terminations, self._truncations
+
+    def close(self) -> None:
+        """Stop all workers and release the shared memory."""
+        if self._closed:
+            return
+        self._closed = True
+        for i in range(self.num_workers):
+            self._stop_worker(i)
+        del self._ring
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        if not getattr(self, "_closed", True):
+            self.close()
+
+
+__all__ = ["RolloutEngine"]
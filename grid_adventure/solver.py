@@ -0,0 +1,215 @@
+"""Optimal (fewest actions) solver for Grid Adventure levels.
+
+A* over `grid_adventure.step.step` transitions. Visited states are deduplicated
+in a transposition table keyed by `canonical_key`, a compact projection of the
+`State` holding everything that can change future play (agent position, health,
+inventory and active power-ups, remaining items, doors, robot and box
+positions) but not bookkeeping such as the turn counter or score.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import time
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+from grid_universe.actions import Action
+from grid_universe.components.properties.moving import Direction
+from grid_universe.state import State
+from grid_universe.types import EntityID
+
+from grid_adventure.constants import SPEED_POWERUP_MULTIPLIER
+from grid_adventure.step import step
+
+ACTIONS = tuple(Action)
+
+# Agent position, health, inventory item IDs and active effects (ID, turns and
+# uses left), the items still on the grid, the locked doors, then the moving
+# entities (ID, x, y, direction) and boxes (ID, x, y).
+CanonicalKey = tuple[
+    tuple[int, int] | None,
+    int | None,
+    frozenset[EntityID],
+    tuple[tuple[EntityID, int | None, int | None], ...],
+    frozenset[EntityID],
+    frozenset[EntityID],
+    tuple[tuple[EntityID, int, int, Direction], ...],
+    tuple[tuple[EntityID, int, int], ...],
+]
+
+
+@dataclass
+class SolveResult:
+    """Outcome of `solve`: the action sequence (None if unsolved) and search stats."""
+
+    actions: list[Action] | None
+    nodes_expanded: int
+    elapsed: float
+
+    @property
+    def solved(self) -> bool:
+        return self.actions is not None
+
+    @property
+    def nodes_per_sec(self) -> float:
+        return self.nodes_expanded / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _agent_id(state: State) -> EntityID:
+    agent_id = next(iter(state.agent.keys()), None)
+    if agent_id is None:
+        raise ValueError("State has no agent.")
+    return agent_id
+
+
+def canonical_key(state: State) -> CanonicalKey:
+    """Project a State onto the parts that determine its future."""
+    agent_id = _agent_id(state)
+    position = state.position.get(agent_id)
+    health = state.health.get(agent_id)
+    inventory = state.inventory.get(agent_id)
+    status = state.status.get(agent_id)
+
+    effects: tuple[tuple[EntityID, int | None, int | None], ...] = ()
+    if status is not None:
+        effects = tuple(
+            sorted(
+                (
+                    eid,
+                    getattr(state.time_limit.get(eid), "amount", None),
+                    getattr(state.usage_limit.get(eid), "amount", None),
+                )
+                for eid in status.effect_ids
+            )
+        )
+    return (
+        (position.x, position.y) if position is not None else None,
+        health.current_health if health is not None else None,
+        frozenset(inventory.item_ids) if inventory is not None else frozenset(),
+        effects,
+        # Items still lying on the grid
+        frozenset(eid for eid in state.collectible if eid in state.position),
+        frozenset(state.locked),
+        tuple(
+            sorted(
+                (eid, pos.x, pos.y, moving.direction)
+                for eid, moving in state.moving.items()
+                if (pos := state.position.get(eid)) is not None
+            )
+        ),
+        tuple(
+            sorted(
+                (eid, pos.x, pos.y)
+                for eid in state.pushable
+                if (pos := state.position.get(eid)) is not None
+            )
+        ),
+    )
+
+
+def heuristic(state: State) -> int:
+    """Lower bound on the actions left: reach every remaining gem, then an exit.
+
+    Manhattan distances ignore walls, so this never overestimates; it is 0 when
+    the level has portals, which can shortcut any distance.
+    """
+    if state.portal or not state.exit:
+        return 0
+    agent = state.position.get(_agent_id(state))
+    if agent is None:
+        return 0
+    exits = [state.position[eid] for eid in state.exit if eid in state.position]
+    if not exits:
+        return 0
+
+    def to_exit(x: int, y: int) -> int:
+        return min(abs(x - e.x) + abs(y - e.y) for e in exits)
+
+    gems = [state.position[eid] for eid in state.requirable if eid in state.position]
+    if not gems:
+        bound = to_exit(agent.x, agent.y)
+    else:
+        bound = max(
+            abs(agent.x - g.x) + abs(agent.y - g.y) + to_exit(g.x, g.y) for g in gems
+        )
+    # Cells per action at the highest speed a power-up grants; dividing by it
+    # keeps the heuristic admissible while boots are active.
+    return -(-bound // SPEED_POWERUP_MULTIPLIER)
+
+
+def _finished(state: State) -> bool:
+    return bool(
+        state.lose or (state.turn_limit is not None and state.turn >= state.turn_limit)
+    )
+
+
+def solve(
+    state: State, max_nodes: int = 1_000_000, use_heuristic: bool = True
+) -> SolveResult:
+    """Find a shortest action sequence that wins the level from `state`.
+
+    Expands at most `max_nodes` states; returns an unsolved result when the
+    budget runs out or no winning sequence exists within the turn limit.
+    Without `use_heuristic` this is a plain breadth-first search.
+    """
+    start_time = time.perf_counter()
+    h = heuristic if use_heuristic else (lambda _: 0)
+    counter = itertools.count()
+
+    start_key = canonical_key(state)
+    best_cost: dict[Hashable, int] = {start_key: 0}
+    parents: dict[Hashable, tuple[Hashable, Action] | None] = {start_key: None}
+    frontier: list[tuple[int, int, int, Hashable, State]] = [
+        (h(state), next(counter), 0, start_key, state)
+    ]
+    expanded = 0
+
+    while frontier and expanded < max_nodes:
+        _, _, cost, key, current = heapq.heappop(frontier)
+        if cost > best_cost[key]:
+            continue  # stale entry
+        if current.win:
+            actions: list[Action] = []
+            link = parents[key]
+            while link is not None:
+                key, action = link
+                actions.append(action)
+                link = parents[key]
+            actions.reverse()
+            return SolveResult(actions, expanded, time.perf_counter() - start_time)
+        if _finished(current):
+            continue
+
+        expanded += 1
+        for action in ACTIONS:
+            successor = step(current, action)
+            successor_key = canonical_key(successor)
+            successor_cost = cost + 1
+            if successor_cost >= best_cost.get(successor_key, successor_cost + 1):
+                continue
+            best_cost[successor_key] = successor_cost
+            parents[successor_key] = (key, action)
+            heapq.heappush(
+                frontier,
+                (
+                    successor_cost + h(successor),
+                    next(counter),
+                    successor_cost,
+                    successor_key,
+                    successor,
+                ),
+            )
+
+    return SolveResult(None, expanded, time.perf_counter() - start_time)
+
+
+__all__ = [
+    "ACTIONS",
+    "CanonicalKey",
+    "SolveResult",
+    "canonical_key",
+    "heuristic",
+    "solve",
+]
@@ -1,7 +1,23 @@
+from collections.abc import Callable
+
+import grid_universe.step as base_step_module
 from grid_universe.actions import Action
 from grid_universe.state import State
 from grid_universe.step import step as _step
 
+# Called instead of the base step as `step_hook(state, action, base_step)` when
+# set; `grid_adventure.profiling.profile_steps` uses it to time whole steps.
+StepHook = Callable[[State, Action, Callable[[State, Action], State]], State]
+step_hook: StepHook | None = None
+
+# Names of the `*_system` functions the base step runs, as looked up in its
+# module on every call.
+SYSTEMS: tuple[str, ...] = tuple(
+    name
+    for name, value in vars(base_step_module).items()
+    if name.endswith("_system") and callable(value)
+)
+
 
 def step(state: State, action: Action) -> State:
     """Advance the environment state by one step given an action.
@@ -19,4 +35,6 @@ def step(state: State, action: Action) -> State:
     assert state.agent is not None and len(state.agent) == 1, (
         "State must have exactly one agent."
     )
+    if step_hook is not None:
+        return step_hook(state, action, _step)
     return _step(state, action)
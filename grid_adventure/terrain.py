@@ -0,0 +1,154 @@
+"""Static terrain (floors and walls) stored as a per-cell code array.
+
+Floors and border walls make up most entities of a level but never change, so a
+`TerrainGridState` keeps them as bit flags in a `(H, W)` uint8 array and only
+creates `FloorEntity`/`WallEntity` objects for a cell when that cell is first
+accessed through `grid[x][y]`. Building a level or converting a `State` then
+costs in proportion to the dynamic entities plus the cells actually looked at.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+from grid_universe.grid.entity import BaseEntity
+
+from grid_adventure.entities import FloorEntity, WallEntity
+from grid_adventure.gridstate import AdventureGridState, E, Pos
+
+# Bit flags of a terrain code; a cell may hold both (a wall on a floor).
+FLOOR = 1
+WALL = 2
+
+# Terrain flag -> entity class, in the order entities are stacked in a cell.
+TERRAIN_TYPES: dict[int, type[BaseEntity]] = {FLOOR: FloorEntity, WALL: WallEntity}
+
+
+class Terrain:
+    """Per-cell floor/wall flags, indexed `codes[y, x]`."""
+
+    def __init__(self, codes: npt.NDArray[np.uint8]) -> None:
+        self.codes = codes
+
+    @classmethod
+    def empty(cls, width: int, height: int) -> Terrain:
+        return cls(np.zeros((height, width), dtype=np.uint8))
+
+    def fill(self, flag: int) -> None:
+        """Set `flag` on every cell."""
+        self.codes |= np.uint8(flag)
+
+    def border(self, flag: int) -> None:
+        """Set `flag` on the outermost ring of cells."""
+        self.codes[[0, -1], :] |= np.uint8(flag)
+        self.codes[:, [0, -1]] |= np.uint8(flag)
+
+    def count(self) -> int:
+        """Number of terrain entities the array stands for."""
+        return sum(
+            int(np.count_nonzero(self.codes & np.uint8(flag))) for flag in TERRAIN_TYPES
+        )
+
+    def expand(self, x: int, y: int) -> list[BaseEntity]:
+        """Fresh terrain entities of cell `(x, y)`, floor first."""
+        code = int(self.codes[y, x])
+        return [cls() for flag, cls in TERRAIN_TYPES.items() if code & flag]
+
+
+class _LazyColumn:
+    """One `grid[x]` column whose cell lists are created on first access."""
+
+    __slots__ = ("_cells", "_owner", "_x")
+
+    def __init__(self, owner: TerrainGridState, x: int) -> None:
+        self._owner = owner
+        self._x = x
+        self._cells: list[list[BaseEntity] | None] = [None] * owner.height
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __getitem__(self, y: int) -> list[BaseEntity]:
+        cell = self._cells[y]
+        if cell is None:
+            if y < 0:
+                y += len(self._cells)
+            cell = self._cells[y] = self._owner._expand(self._x, y)
+        return cell
+
+    def __setitem__(self, y: int, cell: list[BaseEntity]) -> None:
+        self._cells[y] = cell
+
+    def __iter__(self) -> Iterator[list[BaseEntity]]:
+        for y in range(len(self._cells)):
+            yield self[y]
+
+    def expanded(self) -> int:
+        return sum(cell is not None for cell in self._cells)
+
+
+class TerrainGridState(AdventureGridState):
+    """AdventureGridState whose floors and walls live in a `Terrain` array.
+
+    `grid[x][y]` works as for any GridState: the first access to a cell creates
+    its terrain entities (below anything added to it) and indexes them, and
+    later accesses return the same list. Code that walks the whole grid, such as
+    `to_state`, expands every cell; `find`/`count` do the same when asked for a
+    terrain class.
+    """
+
+    def __init__(
+        self, *args: Any, terrain: Terrain | None = None, **kwargs: Any
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        if terrain is None:
+            terrain = Terrain.empty(self.width, self.height)
+        assert terrain.codes.shape == (self.height, self.width)
+        self.terrain = terrain
+        self.grid = [_LazyColumn(self, x) for x in range(self.width)]  # type: ignore[assignment]
+
+    def _expand(self, x: int, y: int) -> list[BaseEntity]:
+        cell = self.terrain.expand(x, y)
+        for obj in cell:
+            self._index_add((x, y), obj)
+        return cell
+
+    def expanded_cells(self) -> int:
+        """Number of cells whose entity lists have been created."""
+        return sum(column.expanded() for column in self.grid)  # type: ignore[attr-defined]
+
+    def materialize(self) -> None:
+        """Create the terrain entities of every cell not accessed yet."""
+        for column in self.grid:
+            for _ in column:
+                pass
+
+    def _covers_terrain(self, cls: type[BaseEntity]) -> bool:
+        return any(issubclass(kind, cls) for kind in TERRAIN_TYPES.values())
+
+    def find(self, cls: type[E]) -> list[tuple[Pos, E]]:
+        if self._covers_terrain(cls):
+            self.materialize()
+        return super().find(cls)
+
+    def find_one(self, cls: type[E]) -> tuple[Pos, E] | None:
+        found = super().find_one(cls)
+        if found is None and self._covers_terrain(cls):
+            self.materialize()
+            found = super().find_one(cls)
+        return found
+
+    def count(self, cls: type[BaseEntity]) -> int:
+        if self._covers_terrain(cls):
+            self.materialize()
+        return super().count(cls)
+
+    def reindex(self) -> None:
+        self.materialize()
+        super().reindex()
+
+
+__all__ = ["FLOOR", "TERRAIN_TYPES", "WALL", "Terrain", "TerrainGridState"]
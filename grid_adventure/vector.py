@@ -0,0 +1,186 @@
+"""Batched Grid Adventure environment stepping many levels in lockstep."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from typing import Any, ClassVar
+
+import numpy as np
+import numpy.typing as npt
+from grid_universe.actions import Action
+from grid_universe.grid.gridstate import GridState
+from grid_universe.state import State
+from gymnasium import spaces
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import batch_space
+
+from grid_adventure.grid import to_state
+from grid_adventure.observation import (
+    NUM_CHANNELS,
+    tensor_observation,
+    tensor_observation_space,
+)
+from grid_adventure.step import step
+
+# Level builder: a `levels.intro`-style function returning a GridState (or a State).
+Builder = Callable[..., GridState | State]
+
+_ACTIONS = tuple(Action)
+
+
+class GridAdventureVectorEnv(
+    VectorEnv[npt.NDArray[np.uint8], npt.NDArray[np.intp], npt.NDArray[Any]]
+):
+    """Vectorized Grid Adventure environment with tensor observations.
+
+    Holds `num_envs` ECS states and advances all of them with one `step` call.
+    Finished episodes (win, lose or turn limit) are reset within the same step:
+    the returned observation is the first one of the new episode, and the last
+    observation of the finished one is reported in `infos["final_obs"]` (masked
+    by `infos["_final_obs"]`).
+
+    Observations, rewards, terminations and truncations are written into
+    preallocated arrays that are reused across calls; copy them if they must
+    outlive the next `step`/`reset`. Levels of different sizes are zero-padded
+    to the largest one. Each sub-environment builds its level once per seed;
+    resets reuse that initial state.
+    """
+
+    metadata: ClassVar[dict[str, Any]] = {
+        "render_modes": [],
+        "autoreset_mode": AutoresetMode.SAME_STEP,
+    }
+
+    def __init__(
+        self, builders: Builder | Sequence[Builder], num_envs: int | None = None
+    ) -> None:
+        if callable(builders):
+            builders = [builders] * (num_envs if num_envs is not None else 1)
+        elif num_envs is not None and num_envs != len(builders):
+            raise ValueError("num_envs must match the number of builders given.")
+        if not builders:
+            raise ValueError("At least one builder is required.")
+
+        self._builders: list[Builder] = list(builders)
+        self._seeds: list[int | None] = [None] * len(self._builders)
+        self.num_envs = len(self._builders)
+        # (seed, initial state) of each sub-environment, reused on auto-reset.
+        self._initial: list[tuple[int | None, State] | None] = [None] * self.num_envs
+
+        self._states: list[State] = [self._build(i) for i in range(self.num_envs)]
+        self.width = max(state.width for state in self._states)
+        self.height = max(state.height for state in self._states)
+
+        self.single_observation_space = tensor_observation_space(
+            self.width, self.height
+        )
+        self.single_action_space = spaces.Discrete(len(_ACTIONS))
+        self.observation_space = batch_space(
+            self.single_observation_space, self.num_envs
+        )
+        self.action_space = batch_space(self.single_action_space, self.num_envs)
+
+        self._observations = np.zeros(
+            (self.num_envs, NUM_CHANNELS, self.height, self.width), dtype=np.uint8
+        )
+        self._rewards = np.zeros(self.num_envs, dtype=np.float64)
+        self._terminations = np.zeros(self.num_envs, dtype=np.bool_)
+        self._truncations = np.zeros(self.num_envs, dtype=np.bool_)
+
+    @property
+    def states(self) -> list[State]:
+        """Current ECS state of every sub-environment."""
+        return list(self._states)
+
+    def _build(self, index: int) -> State:
+        """Return the initial state of sub-environment `index` for its seed.
+
+        States are persistent, so the state built for a seed is kept and handed
+        out again on every reset until the seed changes.
+        """
+        seed = self._seeds[index]
+        cached = self._initial[index]
+        if cached is not None and cached[0] == seed:
+            return cached[1]
+        builder = self._builders[index]
+        level = builder() if seed is None else builder(seed=seed)
+        state = to_state(level) if isinstance(level, GridState) else level
+        self._initial[index] = (seed, state)
+        return state
+
+    def reset(
+        self,
+        *,
+        seed: int | Sequence[int] | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> tuple[npt.NDArray[np.uint8], dict[str, Any]]:
+        """Reset every sub-environment.
+
+        An integer `seed` gives sub-environment `i` the seed `seed + i`; a
+        sequence assigns seeds one-to-one. Without a seed, builders use their
+        own defaults.
+        """
+        if isinstance(seed, int):
+            self._seeds = [seed + i for i in range(self.num_envs)]
+        elif seed is not None:
+            if len(seed) != self.num_envs:
+                raise ValueError("Expected one seed per sub-environment.")
+            self._seeds = list(seed)
+
+        for i in range(self.num_envs):
+            self._states[i] = self._build(i)
+            tensor_observation(self._states[i], out=self._observations[i])
+        return self._observations, {}
+
+    def step(
+        self, actions: npt.ArrayLike
+    ) -> tuple[
+        npt.NDArray[np.uint8],
+        npt.NDArray[np.float64],
+        npt.NDArray[np.bool_],
+        npt.NDArray[np.bool_],
+        dict[str, Any],
+    ]:
+        """Advance every sub-environment by one action.
+
+        Raises ValueError, before any sub-environment moves, if an action is not
+        an index into `Action`.
+        """
+        action_indices = np.asarray(actions, dtype=np.intp).reshape(self.num_envs)
+        if ((action_indices < 0) | (action_indices >= len(_ACTIONS))).any():
+            raise ValueError(f"Actions must be in [0, {len(_ACTIONS)}): {actions!r}")
+        infos: dict[str, Any] = {}
+
+        for i, action_index in enumerate(action_indices):
+            prev_state = self._states[i]
+            state = step(prev_state, _ACTIONS[action_index])
+            terminated = state.win or state.lose
+            truncated = (
+                not terminated
+                and state.turn_limit is not None
+                and state.turn >= state.turn_limit
+            )
+            self._rewards[i] = state.score - prev_state.score
+            self._terminations[i] = terminated
+            self._truncations[i] = truncated
+
+            if terminated or truncated:
+                if "final_obs" not in infos:
+                    infos["final_obs"] = np.zeros_like(self._observations)
+                    infos["_final_obs"] = np.zeros(self.num_envs, dtype=np.bool_)
+                tensor_observation(state, out=infos["final_obs"][i])
+                infos["_final_obs"][i] = True
+                state = self._build(i)
+            self._states[i] = state
+            tensor_observation(state, out=self._observations[i])
+
+        return (
+            self._observations,
+            self._rewards,
+            self._terminations,
+            self._truncations,
+            infos,
+        )
+
+
+__all__ = ["Builder", "GridAdventureVectorEnv"]
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import gymnasium as gym
+import numpy as np
+import pytest
+from grid_universe.actions import Action
+from grid_universe.grid.convert import grid_state_fn_to_initial_state_fn
+
+from grid_adventure.async_env import AsyncGridAdventureEnv, make_async_envs, step_all
+from grid_adventure.env import GridAdventureEnv
+from grid_adventure.levels import intro
+
+
+class _SlowEnv(gym.Env[int, int]):
+    """Counts how many calls run at the same time across all instances."""
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    delay = 0.01
+
+    def step(self, action: int) -> tuple[int, float, bool, bool, dict[str, Any]]:
+        with _SlowEnv.lock:
+            _SlowEnv.active += 1
+            _SlowEnv.peak = max(_SlowEnv.peak, _SlowEnv.active)
+        time.sleep(self.delay)
+        with _SlowEnv.lock:
+            _SlowEnv.active -= 1
+        return action, 0.0, False, False, {}
+
+    def render(self) -> str:
+        return "frame"
+
+
+def _env() -> GridAdventureEnv:
+    return GridAdventureEnv(
+        initial_state_fn=grid_state_fn_to_initial_state_fn(
+            intro.build_level_basic_movement
+        ),
+        observation_type="tensor",
+        width=7,
+        height=5,
+    )
+
+
+def test_async_envs_match_synchronous_envs() -> None:
+    actions = [Action.RIGHT, Action.UP, Action.WAIT]
+    reference = _env()
+    reference.reset(seed=0)
+    expected = reference.step(Action.RIGHT)[0]
+
+    async def run() -> list[Any]:
+        envs = make_async_envs([_env() for _ in actions], max_workers=2)
+        await asyncio.gather(*(env.async_reset(seed=0) for env in envs))
+        results = await step_all(envs, actions)
+        for env in envs:
+            await env.aclose()
+        return results
+
+    results = asyncio.run(run())
+    assert np.array_equal(results[0][0], expected)
+    assert len(results) == len(actions)
+
+
+def test_in_flight_limit_is_shared_between_envs() -> None:
+    _SlowEnv.peak = 0
+
+    async def run() -> list[Any]:
+        envs = make_async_envs(
+            [_SlowEnv() for _ in range(8)], max_workers=8, max_in_flight=3
+        )
+        return await step_all(envs, list(range(8)))
+
+    results = asyncio.run(run())
+    assert [obs for obs, *_ in results] == list(range(8))
+    assert _SlowEnv.peak <= 3
+
+
+def test_calls_on_one_env_are_serialized() -> None:
+    _SlowEnv.peak = 0
+
+    async def run() -> None:
+        env = AsyncGridAdventureEnv(_SlowEnv())
+        await asyncio.gather(*(env.async_step(i) for i in range(4)))
+        assert await env.async_render() == "frame"
+
+    asyncio.run(run())
+    assert _SlowEnv.peak == 1
+
+
+def test_cancelled_call_keeps_the_env_locked_until_it_finishes() -> None:
+    _SlowEnv.peak = 0
+    slow = _SlowEnv()
+    slow.delay = 0.1
+
+    async def run() -> None:
+        env = AsyncGridAdventureEnv(slow, limiter=1)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(env.async_step(0), timeout=0.01)
+        # Must wait for the abandoned step instead of running alongside it
+        assert (await env.async_step(1))[0] == 1
+
+    asyncio.run(run())
+    assert _SlowEnv.peak == 1
+
+
+def test_created_executor_is_shut_down_after_all_envs_close() -> None:
+    async def run() -> None:
+        envs = make_async_envs([_SlowEnv() for _ in range(2)], max_workers=2)
+        executor = envs[0].executor
+        assert isinstance(executor, ThreadPoolExecutor)
+        await envs[0].aclose()
+        assert not executor._shutdown  # type: ignore[attr-defined]
+        await envs[1].aclose()
+        await envs[1].aclose()  # closing twice is a no-op
+        assert executor._shutdown  # type: ignore[attr-defined]
+
+    asyncio.run(run())
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from grid_universe.actions import Action
+from grid_universe.grid.convert import grid_state_fn_to_initial_state_fn, to_state
+
+from grid_adventure.distance import (
+    UNREACHABLE,
+    DistanceCache,
+    distance_field,
+    distance_fields,
+)
+from grid_adventure.entities import MovingBoxEntity
+from grid_adventure.env import GridAdventureEnv
+from grid_adventure.levels import intro
+from grid_adventure.step import step
+
+
+def test_distance_field_routes_around_blocked_cells() -> None:
+    blocked = np.zeros((3, 3), dtype=np.bool_)
+    blocked[1, 0:2] = True
+    field = distance_field(blocked, [(0, 0)])
+    assert field[0, 2] == 2
+    assert field[2, 0] == 6  # around the wall through (2, 1)
+    assert field[1, 0] == UNREACHABLE
+
+
+def test_distance_fields_for_intro_level() -> None:
+    state = to_state(intro.build_level_basic_movement(seed=100))
+    fields = distance_fields(state)
+    assert fields.exit.shape == (5, 7)
+    # Wall column at x=3 with a single gap at y=2
+    assert fields.blocked[0, 3] and not fields.blocked[2, 3]
+    assert fields.to_exit(1, 2) == 4
+    assert fields.to_exit(3, 0) is None
+    assert fields.gems == {}
+
+
+def test_locked_door_cuts_off_the_exit() -> None:
+    state = to_state(intro.build_level_key_door())
+    fields = distance_fields(state)
+    assert fields.to_exit(1, 4) is None
+
+
+def test_moving_box_blocks_like_a_pushable_box() -> None:
+    gridstate = intro.build_level_basic_movement(seed=100)
+    gridstate.add((3, 2), MovingBoxEntity())  # the only gap in the wall column
+    fields = distance_fields(to_state(gridstate))
+    assert fields.blocked[2, 3]
+    assert fields.to_exit(1, 2) is None
+
+
+def test_distance_fields_are_read_only() -> None:
+    state = to_state(intro.build_level_required_one())
+    fields = distance_fields(state)
+    for array in (fields.blocked, fields.exit, *fields.gems.values()):
+        with pytest.raises(ValueError):
+            array[0, 0] = 0
+
+
+def test_cache_survives_agent_moves_and_tracks_gems() -> None:
+    cache = DistanceCache()
+    state = to_state(intro.build_level_required_one())
+    first = cache.fields(state)
+    assert len(first.gems) == 1
+    moved = step(state, Action.RIGHT)
+    assert cache.fields(moved) is first
+    assert cache.rebuilds == 1
+
+
+def test_env_distance_info() -> None:
+    env = GridAdventureEnv(
+        initial_state_fn=grid_state_fn_to_initial_state_fn(
+            intro.build_level_basic_movement
+        ),
+        observation_type="tensor",
+        width=7,
+        height=5,
+        distance_info=True,
+    )
+    _, info = env.reset()
+    assert info["distances"].to_exit(1, 2) == 4
+    _, _, _, _, info = env.step(Action.RIGHT)
+    assert info["distances"].exit.shape == (5, 7)
+    env.close()
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import copy
+
 from grid_universe.actions import Action
 from grid_universe.grid.factories import create_agent, create_coin, create_wall
 from grid_universe.grid.gridstate import GridState
 from grid_universe.movements import CardinalMovement
 from grid_universe.objectives import ExitObjective
 
-from grid_adventure.entities import AgentEntity, CoinEntity, WallEntity
-from grid_adventure.grid import step
+from grid_adventure.entities import AgentEntity, CoinEntity, PortalEntity, WallEntity
+from grid_adventure.grid import specialize_entities, step
+from grid_adventure.levels import intro
 
 
 def _find_entities_at(gridstate: GridState, pos: tuple[int, int]) -> list[object]:
@@ -77,3 +80,74 @@ def test_step_pickup_specializes_agent_and_updates_score() -> None:
     )
     # Score should reflect reward
     assert new_grid_state.score == 10
+
+
+def test_incremental_step_reuses_unchanged_entities() -> None:
+    gridstate = GridState(
+        width=3,
+        height=3,
+        movement=CardinalMovement(),
+        objective=ExitObjective(),
+    )
+    gridstate.add((0, 1), create_agent())
+    gridstate.add((2, 1), create_wall())
+
+    first = step(gridstate, Action.WAIT)
+    wall = next(
+        obj for obj in _find_entities_at(first, (2, 1)) if isinstance(obj, WallEntity)
+    )
+    agent = next(
+        obj for obj in _find_entities_at(first, (0, 1)) if isinstance(obj, AgentEntity)
+    )
+
+    second = step(first, Action.RIGHT, incremental=True)
+
+    assert _find_agent_pos(second) == (1, 1)
+    # Untouched wall is carried forward; the moved agent is re-specialized
+    assert any(obj is wall for obj in _find_entities_at(second, (2, 1)))
+    moved = next(
+        obj for obj in _find_entities_at(second, (1, 1)) if isinstance(obj, AgentEntity)
+    )
+    assert moved is not agent
+
+
+def test_incremental_specialization_does_not_reuse_other_entities() -> None:
+    def level(wall: object) -> GridState:
+        gridstate = GridState(
+            width=3,
+            height=3,
+            movement=CardinalMovement(),
+            objective=ExitObjective(),
+        )
+        gridstate.add((0, 1), create_agent())
+        gridstate.add((2, 1), wall)  # type: ignore[arg-type]
+        return gridstate
+
+    wall = create_wall()
+    previous = specialize_entities(level(wall))
+    old_wall = next(
+        obj
+        for obj in _find_entities_at(previous, (2, 1))
+        if isinstance(obj, WallEntity)
+    )
+    # Same components, different entity
+    other = copy.copy(wall)
+    other.entity_id = wall.entity_id + 1000
+    current = specialize_entities(level(other), previous=previous)
+    assert not any(obj is old_wall for obj in _find_entities_at(current, (2, 1)))
+
+
+def test_incremental_step_keeps_portal_pairs_linked() -> None:
+    gridstate = specialize_entities(intro.build_level_portal_shortcut(seed=107))
+    new_grid_state = step(gridstate, Action.RIGHT, incremental=True)
+
+    portals = [
+        obj
+        for column in new_grid_state.grid
+        for cell in column
+        for obj in cell
+        if isinstance(obj, PortalEntity)
+    ]
+    assert len(portals) == 2
+    assert portals[0].portal_pair_ref is portals[1]
+    assert portals[1].portal_pair_ref is portals[0]
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import pytest
+from grid_universe.actions import Action
+from grid_universe.grid.convert import to_state
+
+from grid_adventure.entities import AgentEntity, FloorEntity, GemEntity, RobotEntity
+from grid_adventure.grid import AdventureGridState, from_state, step
+from grid_adventure.levels import intro
+
+
+def _scan(gridstate: AdventureGridState, cls: type) -> list[tuple[int, int]]:
+    return sorted(
+        (x, y)
+        for x in range(gridstate.width)
+        for y in range(gridstate.height)
+        for obj in gridstate.grid[x][y]
+        if isinstance(obj, cls)
+    )
+
+
+def test_from_state_is_indexed_by_kind() -> None:
+    gridstate = from_state(to_state(intro.build_level_enemy_patrol()))
+    assert isinstance(gridstate, AdventureGridState)
+    for cls in (RobotEntity, AgentEntity, FloorEntity, GemEntity):
+        assert sorted(pos for pos, _ in gridstate.find(cls)) == _scan(gridstate, cls)
+    assert gridstate.count(RobotEntity) == len(_scan(gridstate, RobotEntity)) > 0
+    found = gridstate.find_one(AgentEntity)
+    assert found is not None
+    (x, y), agent = found
+    assert any(obj is agent for obj in gridstate.grid[x][y])
+
+
+def test_index_follows_steps() -> None:
+    gridstate = from_state(to_state(intro.build_level_enemy_patrol()))
+    for incremental in (False, True):
+        for action in (Action.RIGHT, Action.WAIT, Action.DOWN):
+            gridstate = step(gridstate, action, incremental=incremental)
+            for cls in (RobotEntity, AgentEntity):
+                assert sorted(gridstate.positions(cls)) == sorted(
+                    set(_scan(gridstate, cls))
+                )
+
+
+def test_remove_and_move_keep_index_consistent() -> None:
+    gridstate = from_state(to_state(intro.build_level_basic_movement()))
+    found = gridstate.find_one(AgentEntity)
+    assert found is not None
+    src, agent = found
+    dst = (src[0] + 1, src[1])
+    gridstate.move(agent, src, dst)
+    assert gridstate.find(AgentEntity) == [(dst, agent)]
+    assert _scan(gridstate, AgentEntity) == [dst]
+
+    gridstate.remove(dst, agent)
+    assert gridstate.find_one(AgentEntity) is None
+    with pytest.raises(ValueError):
+        gridstate.remove(dst, agent)
+
+
+def test_index_survives_pickling() -> None:
+    import pickle
+
+    gridstate = from_state(to_state(intro.build_level_capstone()))
+    restored = pickle.loads(pickle.dumps(gridstate))
+    assert restored.count(AgentEntity) == 1
+    pos, agent = restored.find(AgentEntity)[0]
+    assert any(obj is agent for obj in restored.grid[pos[0]][pos[1]])
+    restored.remove(pos, agent)
+    assert restored.count(AgentEntity) == 0
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from grid_universe.actions import Action
+from grid_universe.grid.convert import to_state
+
+from grid_adventure.hashing import (
+    _DEFAULT_HASHER,
+    BloomFilter,
+    StateHasher,
+    clear_fingerprint_cache,
+    fingerprint,
+)
+from grid_adventure.levels import intro
+from grid_adventure.solver import canonical_key
+from grid_adventure.step import step
+
+
+def test_fingerprint_ignores_turn_and_tracks_position() -> None:
+    state = to_state(intro.build_level_basic_movement())
+    moved = step(state, Action.RIGHT)
+    back = step(moved, Action.LEFT)
+    assert fingerprint(state) == fingerprint(
+        to_state(intro.build_level_basic_movement())
+    )
+    assert fingerprint(moved) != fingerprint(state)
+    assert back.turn != state.turn and fingerprint(back) == fingerprint(state)
+
+    wide = StateHasher(bits=128)
+    assert wide.fingerprint(state) & ((1 << 64) - 1) == wide.fingerprints([state])[0]
+    with pytest.raises(ValueError):
+        StateHasher(bits=32)
+
+
+def test_feature_memo_is_bounded_and_clearable() -> None:
+    state = to_state(intro.build_level_capstone())
+    expected = StateHasher().fingerprint(state)
+    small = StateHasher(max_features=3)
+    assert small.fingerprint(state) == expected
+    assert 0 < len(small) <= 3
+    assert small.fingerprint(state) == expected
+
+    fingerprint(state)
+    assert len(_DEFAULT_HASHER) > 0
+    clear_fingerprint_cache()
+    assert len(_DEFAULT_HASHER) == 0
+    assert fingerprint(state) == expected
+
+
+def test_fingerprint_is_stable_across_processes() -> None:
+    code = (
+        "from grid_universe.grid.convert import to_state;"
+        "from grid_adventure.hashing import fingerprint;"
+        "from grid_adventure.levels import intro;"
+        "print(fingerprint(to_state(intro.build_level_capstone())))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert int(output) == fingerprint(to_state(intro.build_level_capstone()))
+
+
+def test_bloom_filter_dedupes_batches_and_merges() -> None:
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 2**63, size=5000, dtype=np.uint64)
+    bloom = BloomFilter(capacity=10000, error_rate=1e-3)
+    assert not bloom.add_many(values).any()
+    assert bloom.add_many(values).all()
+    assert bloom.add_many([1, 2, 1]).tolist() == [False, False, True]
+
+    unseen = rng.integers(2**63, 2**64 - 1, size=20000, dtype=np.uint64)
+    assert bloom.contains_many(unseen).mean() < 0.01
+
+    other = BloomFilter(capacity=10000, error_rate=1e-3)
+    other.add(12345)
+    bloom.update(other)
+    assert 12345 in bloom
+    copy = BloomFilter.from_bytes(bloom.to_bytes(), capacity=10000, error_rate=1e-3)
+    assert copy.contains_many(values).all()
+    with pytest.raises(ValueError):
+        bloom.update(BloomFilter(capacity=10))
+
+
+def test_bloom_filter_merge_counts_shared_fingerprints_once() -> None:
+    values = np.arange(1000, dtype=np.uint64)
+    a = BloomFilter(capacity=10000)
+    b = BloomFilter(capacity=10000)
+    a.add_many(values)
+    b.add_many(values[500:])
+    b.add_many(np.arange(1000, 1500, dtype=np.uint64))
+    a.update(b)
+    assert a.count == pytest.approx(1500, rel=0.02)
+
+
+def test_fingerprint_follows_the_solver_canonical_key() -> None:
+    state = to_state(intro.build_level_capstone())
+    successors = [step(state, action) for action in Action]
+    for a in successors:
+        for b in successors:
+            if canonical_key(a) == canonical_key(b):
+                assert fingerprint(a) == fingerprint(b)
+    assert len({canonical_key(s) for s in successors}) == len(
+        {fingerprint(s) for s in successors}
+    )
@@ -1,10 +1,41 @@
+import os
 from typing import Callable
+import pytest
 import numpy as np
 from grid_adventure.env import GridAdventureEnv
 from grid_adventure.levels import intro
-from grid_universe.grid.convert import grid_state_fn_to_initial_state_fn
+from grid_universe.grid.convert import grid_state_fn_to_initial_state_fn, to_state
 from grid_universe.actions import Action
 from grid_universe.renderer.image import ImageMap
+from grid_adventure.rendering import (
+    PALETTE,
+    ImageRenderer,
+    PaletteRenderer,
+    SpriteAtlas,
+    cached_atlas,
+)
+
+# Appearances of the basic movement level, each drawn as a flat colour.
+TEMP_ASSET_COLOURS = {
+    "human": (220, 40, 40, 255),
+    "floor": (200, 200, 200, 255),
+    "wall": (40, 40, 40, 255),
+    "exit": (40, 180, 60, 255),
+}
+
+
+@pytest.fixture
+def temp_image_map(
+    make_temp_assets: Callable[[dict[str, str]], str],
+) -> tuple[str, ImageMap]:
+    """Asset root and image map with one distinctly coloured sprite per appearance."""
+    from PIL import Image
+
+    asset_root = make_temp_assets({name: name for name in TEMP_ASSET_COLOURS})
+    for name, colour in TEMP_ASSET_COLOURS.items():
+        Image.new("RGBA", (16, 16), colour).save(f"{asset_root}/{name}.png")
+    image_map = ImageMap({(name, ()): f"{name}.png" for name in TEMP_ASSET_COLOURS})
+    return asset_root, image_map
 
 
 def test_env_image_observation_with_temp_assets(
@@ -41,3 +72,319 @@ def test_env_image_observation_with_temp_assets(
     obs2, reward, terminated, truncated, info2 = env.step(Action.WAIT)
     assert obs2["image"].shape == obs["image"].shape
     env.close()
+
+
+def test_atlas_renderer_caches_tiles_and_background(
+    temp_image_map: tuple[str, ImageMap],
+):
+    asset_root, image_map = temp_image_map
+    renderer = ImageRenderer(
+        resolution=70, asset_root=asset_root, image_map=image_map, atlas=True
+    )
+    state = to_state(intro.build_level_basic_movement(seed=100))
+
+    frame = renderer.render_array(state)
+    # 7x5 level at 70px wide -> 10px cells
+    assert frame.shape == (50, 70, 4)
+    assert frame.dtype == np.uint8
+    tiles, base = len(renderer._tiles), renderer._base
+
+    again = renderer.render_array(state)
+    assert np.array_equal(frame, again)
+    assert len(renderer._tiles) == tiles
+    assert renderer._base is base
+    assert renderer.render(state).size == (70, 50)
+
+
+def test_env_atlas_backend_image_observation(
+    temp_image_map: tuple[str, ImageMap],
+):
+    asset_root, image_map = temp_image_map
+    env = GridAdventureEnv(
+        initial_state_fn=grid_state_fn_to_initial_state_fn(
+            intro.build_level_basic_movement
+        ),
+        observation_type="image",
+        render_asset_root=asset_root,
+        render_image_map=image_map,
+        render_resolution=70,
+        render_backend="atlas",
+    )
+    obs, _ = env.reset()
+    assert obs["image"].shape == (50, 70, 4)
+    obs2, _, _, _, _ = env.step(Action.RIGHT)
+    assert obs2["image"].shape == obs["image"].shape
+    env.close()
+
+
+def test_incremental_renderer_redraws_only_changed_cells(
+    temp_image_map: tuple[str, ImageMap],
+):
+    from grid_adventure.step import step
+
+    asset_root, image_map = temp_image_map
+    incremental = ImageRenderer(
+        resolution=70, asset_root=asset_root, image_map=image_map, incremental=True
+    )
+    full = ImageRenderer(
+        resolution=70, asset_root=asset_root, image_map=image_map, atlas=True
+    )
+    state = to_state(intro.build_level_basic_movement(seed=100))
+
+    incremental.render_array(state)
+    assert incremental.cells_redrawn == 35  # every cell of the 7x5 level
+    incremental.render_array(state)
+    assert incremental.cells_redrawn == 0
+
+    moved = step(state, Action.RIGHT)
+    frame = incremental.render_array(moved)
+    # Only the agent's old and new cells change
+    assert incremental.cells_redrawn == 2
+    assert incremental.total_cells_redrawn == 37
+    assert np.array_equal(frame, full.render_array(moved))
+
+
+def test_atlas_and_incremental_match_default_renderer_pixel_for_pixel(
+    temp_image_map: tuple[str, ImageMap],
+):
+    from grid_adventure.step import step
+
+    asset_root, image_map = temp_image_map
+    default, atlas, incremental = (
+        ImageRenderer(
+            resolution=70,
+            asset_root=asset_root,
+            image_map=image_map,
+            atlas=atlas,
+            incremental=incremental,
+        )
+        for atlas, incremental in ((False, False), (True, False), (False, True))
+    )
+    state = to_state(intro.build_level_basic_movement(seed=100))
+    for action in (Action.WAIT, Action.RIGHT, Action.DOWN, Action.RIGHT):
+        state = step(state, action)
+        expected = np.asarray(default.render(state).convert("RGBA"))
+        assert np.array_equal(atlas.render_array(state), expected)
+        assert np.array_equal(incremental.render_array(state), expected)
+
+
+def test_atlas_picks_the_same_directory_variants_as_the_default_renderer(
+    temp_image_map: tuple[str, ImageMap],
+):
+    from PIL import Image
+
+    from grid_adventure.step import step
+
+    asset_root, image_map = temp_image_map
+    # Walls and floors drawn from directories of differently coloured variants
+    for name in ("wall", "floor"):
+        os.makedirs(f"{asset_root}/{name}")
+        for i, colour in enumerate(
+            [(40, 40, 40, 255), (90, 60, 30, 255), (30, 60, 90, 255)]
+        ):
+            Image.new("RGBA", (16, 16), colour).save(f"{asset_root}/{name}/{i}.png")
+        image_map[(name, ())] = name
+    default, atlas, incremental = (
+        ImageRenderer(
+            resolution=70,
+            asset_root=asset_root,
+            image_map=image_map,
+            atlas=atlas,
+            incremental=incremental,
+        )
+        for atlas, incremental in ((False, False), (True, False), (False, True))
+    )
+    for seed in (100, 101, 102, 7):
+        state = to_state(intro.build_level_basic_movement(seed=seed))
+        for action in (Action.WAIT, Action.RIGHT):
+            state = step(state, action)
+            expected = np.asarray(default.render(state).convert("RGBA"))
+            assert np.array_equal(atlas.render_array(state), expected)
+            assert np.array_equal(incremental.render_array(state), expected)
+
+
+def test_env_image_buffer_double_buffers_observations(
+    temp_image_map: tuple[str, ImageMap],
+):
+    asset_root, image_map = temp_image_map
+
+    def make_env(render_backend: str = "atlas", **kwargs: object) -> GridAdventureEnv:
+        return GridAdventureEnv(
+            initial_state_fn=grid_state_fn_to_initial_state_fn(
+                intro.build_level_basic_movement
+            ),
+            observation_type="image",
+            render_asset_root=asset_root,
+            render_image_map=image_map,
+            render_resolution=70,
+            render_backend=render_backend,
+            **kwargs,  # type: ignore[arg-type]
+        )
+
+    plain = make_env()
+    buffer = np.zeros((2, 50, 70, 4), dtype=np.uint8)
+    env = make_env(image_buffer=buffer)
+
+    expected0 = plain.reset(seed=0)[0]["image"]
+    obs0, _ = env.reset(seed=0)
+    assert np.shares_memory(obs0["image"], buffer)
+    assert np.array_equal(obs0["image"], expected0)
+
+    expected1 = plain.step(Action.RIGHT)[0]["image"]
+    obs1 = env.step(Action.RIGHT)[0]
+    assert np.array_equal(obs1["image"], expected1)
+    # The previous observation is still intact for one step
+    assert np.array_equal(obs0["image"], expected0)
+    assert not np.shares_memory(obs0["image"], obs1["image"])
+
+    obs2 = env.step(Action.RIGHT)[0]
+    assert np.shares_memory(obs2["image"], obs0["image"])
+    plain.close()
+    env.close()
+
+    mismatched = make_env(image_buffer=np.zeros((2, 10, 10, 4), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        mismatched.reset()
+    with pytest.raises(ValueError):
+        make_env(image_buffer=np.zeros((50, 70, 4), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        make_env(image_buffer=True, render_backend="default")
+
+
+def test_env_image_buffer_reuses_buffer_without_allocating_frames(
+    temp_image_map: tuple[str, ImageMap],
+):
+    import tracemalloc
+
+    asset_root, image_map = temp_image_map
+    env = GridAdventureEnv(
+        initial_state_fn=grid_state_fn_to_initial_state_fn(
+            intro.build_level_basic_movement
+        ),
+        observation_type="image",
+        render_asset_root=asset_root,
+        render_image_map=image_map,
+        render_resolution=700,
+        render_backend="atlas",
+        image_buffer=True,
+    )
+    obs, _ = env.reset(seed=0)
+    buffer = obs["image"].base
+    assert isinstance(buffer, np.ndarray) and buffer.shape == (2, 500, 700, 4)
+    env.step(Action.WAIT)  # warm the tile cache for the frames below
+
+    tracemalloc.start()
+    try:
+        for action in (Action.RIGHT, Action.WAIT, Action.LEFT, Action.WAIT):
+            _, before = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            obs = env.step(action)[0]
+            _, peak = tracemalloc.get_traced_memory()
+            assert obs["image"].base is buffer
+            # A frame is 500 * 700 * 4 bytes; none is allocated per step
+            assert peak - before < obs["image"].nbytes // 4
+    finally:
+        tracemalloc.stop()
+    env.close()
+
+
+def test_render_array_into_output_buffer(
+    temp_image_map: tuple[str, ImageMap],
+):
+    asset_root, image_map = temp_image_map
+    state = to_state(intro.build_level_basic_movement(seed=100))
+    for incremental in (False, True):
+        renderer = ImageRenderer(
+            resolution=70,
+            asset_root=asset_root,
+            image_map=image_map,
+            atlas=True,
+            incremental=incremental,
+        )
+        out = np.zeros(renderer.frame_shape(state), dtype=np.uint8)
+        assert renderer.render_array(state, out=out) is out
+        assert np.array_equal(out, renderer.render_array(state))
+
+
+def test_palette_renderer_draws_flat_glyphs():
+    from grid_adventure.entities import AgentEntity, WallEntity
+    from grid_adventure.grid import from_state
+
+    state = to_state(intro.build_level_basic_movement(seed=100))
+    renderer = PaletteRenderer(resolution=56)
+    frame = renderer.render_array(state)
+    # 7x5 level at 56px wide -> 8px cells
+    assert frame.shape == (40, 56, 4) == renderer.frame_shape(state)
+    assert frame.dtype == np.uint8
+
+    gridstate = from_state(state)
+    (wx, wy), _ = gridstate.find(WallEntity)[0]
+    (ax, ay), _ = gridstate.find(AgentEntity)[0]
+    wall_rgb, _ = PALETTE[("wall", ())]
+    human_rgb, _ = PALETTE[("human", ())]
+    assert tuple(frame[wy * 8, wx * 8]) == (*wall_rgb, 255)
+    assert tuple(frame[ay * 8 + 4, ax * 8 + 4]) == (*human_rgb, 255)
+    # The glyph leaves the cell corner to the background
+    assert tuple(frame[ay * 8, ax * 8]) != (*human_rgb, 255)
+
+    out = np.zeros_like(frame)
+    assert renderer.render_array(state, out=out) is out
+    assert np.array_equal(out, frame)
+
+
+def test_env_palette_backend_image_observation():
+    env = GridAdventureEnv(
+        initial_state_fn=grid_state_fn_to_initial_state_fn(
+            intro.build_level_basic_movement
+        ),
+        observation_type="image",
+        render_resolution=28,
+        render_backend="palette",
+    )
+    obs, _ = env.reset()
+    assert obs["image"].shape == (20, 28, 4)
+    obs2, _, _, _, _ = env.step(Action.RIGHT)
+    assert not np.array_equal(obs2["image"], obs["image"])
+    assert env.cells_redrawn == 35
+    env.close()
+
+
+def test_sprite_cache_is_shared_and_keyed_by_asset_content(
+    temp_image_map: tuple[str, ImageMap], tmp_path
+):
+    from PIL import Image
+
+    asset_root, image_map = temp_image_map
+    cache_dir = str(tmp_path / "sprites")
+
+    built = cached_atlas(image_map, asset_root, 10, cache_dir)
+    fresh = SpriteAtlas(image_map, asset_root, 10)
+    assert built.variants == fresh.variants
+    assert np.array_equal(built.sprites, fresh.sprites)
+    assert np.array_equal(built.icons, fresh.icons)
+    assert isinstance(built.sprites, np.memmap)
+    assert not built.sprites.flags.writeable
+    files = sorted((tmp_path / "sprites").iterdir())
+    assert len(files) == 3
+
+    # A second load maps the same files instead of rebuilding
+    cached_atlas(image_map, asset_root, 10, cache_dir)
+    assert sorted((tmp_path / "sprites").iterdir()) == files
+
+    state = to_state(intro.build_level_basic_movement(seed=100))
+    renderer = ImageRenderer(
+        resolution=70,
+        asset_root=asset_root,
+        image_map=image_map,
+        atlas=True,
+        sprite_cache_dir=cache_dir,
+    )
+    plain = ImageRenderer(
+        resolution=70, asset_root=asset_root, image_map=image_map, atlas=True
+    )
+    assert np.array_equal(renderer.render_array(state), plain.render_array(state))
+
+    # Editing an asset changes the cache key
+    Image.new("RGBA", (16, 16), (10, 20, 30, 255)).save(f"{asset_root}/wall.png")
+    cached_atlas(image_map, asset_root, 10, cache_dir)
+    assert len(list((tmp_path / "sprites").iterdir())) == 6
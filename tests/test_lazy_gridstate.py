@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from grid_universe.actions import Action
+from grid_universe.grid.convert import grid_state_fn_to_initial_state_fn
+from grid_universe.grid.convert import to_state as base_to_state
+from grid_universe.state import State
+
+from grid_adventure import grid as grid_module
+from grid_adventure.entities import PortalEntity
+from grid_adventure.env import GridAdventureEnv
+from grid_adventure.grid import LazyGridState, from_state, to_state
+from grid_adventure.levels import intro
+from grid_adventure.levels.procedural import generate_layout
+from grid_adventure.step import step
+
+
+def _kinds(cell: list[object]) -> list[str]:
+    return sorted(type(obj).__name__ for obj in cell)
+
+
+def test_lazy_cells_match_eager_conversion() -> None:
+    state = base_to_state(intro.build_level_capstone())
+    eager = from_state(state)
+    view = LazyGridState(state)
+    assert (view.width, view.height, view.turn, view.score) == (
+        eager.width,
+        eager.height,
+        eager.turn,
+        eager.score,
+    )
+    assert view.cells_materialized == 0
+    assert _kinds(view.grid[1][1]) == _kinds(eager.grid[1][1])
+    assert view.grid[1][1] is view.grid[1][1]
+    assert 0 < view.cells_materialized < view.width * view.height
+    for x in range(view.width):
+        for y in range(view.height):
+            assert _kinds(view.grid[x][y]) == _kinds(eager.grid[x][y])
+    assert to_state(view) is state
+
+
+def test_portal_pairs_resolve_within_the_view() -> None:
+    state = base_to_state(intro.build_level_portal_shortcut())
+    view = LazyGridState(state)
+    eager = from_state(state)
+    pos, _ = eager.find(PortalEntity)[0]
+    portal = next(
+        obj for obj in view.grid[pos[0]][pos[1]] if isinstance(obj, PortalEntity)
+    )
+    mate = portal.portal_pair_ref
+    assert mate is not None
+    assert any(obj is mate for column in view.grid for cell in column for obj in cell)
+
+
+def test_env_lazy_gridstate_observation() -> None:
+    env = GridAdventureEnv(
+        initial_state_fn=grid_state_fn_to_initial_state_fn(
+            intro.build_level_basic_movement
+        ),
+        observation_type="gridstate",
+        width=7,
+        height=5,
+        lazy_gridstate=True,
+    )
+    obs, _ = env.reset()
+    assert isinstance(obs, LazyGridState)
+    obs2, _, _, _, _ = env.step(Action.RIGHT)
+    assert isinstance(obs2, LazyGridState) and obs2.turn == obs.turn + 1
+    assert _kinds(obs2.grid[2][2]) == _kinds(from_state(env.state).grid[2][2])
+    env.close()
+
+
+def test_reading_k_cells_converts_only_those_cells(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    state = generate_layout(64, 64, seed=0).to_state()
+    areas: list[int] = []
+    base_from_state = grid_module.base_from_state
+
+    def spy(converted: State) -> Any:
+        areas.append(converted.width * converted.height)
+        return base_from_state(converted)
+
+    monkeypatch.setattr(grid_module, "base_from_state", spy)
+    view = LazyGridState(state)
+    eager = from_state(state)
+    for x, y in [(1, 1), (10, 20), (40, 3), (63, 63)]:
+        assert _kinds(view.grid[x][y]) == _kinds(eager.grid[x][y])
+    # Each read converts a strip of its own cells (plus referenced ones),
+    # never the 64x64 grid
+    assert sum(areas) <= view.cells_materialized < 64
+
+
+def test_view_carries_the_previous_index_over() -> None:
+    state = base_to_state(intro.build_level_capstone())
+    view = LazyGridState(state)
+    for action in (Action.RIGHT, Action.DOWN, Action.RIGHT):
+        state = step(state, action)
+        view = LazyGridState(state, previous=view)
+        fresh = LazyGridState(state)._index()
+        assert {pos: sorted(ids) for pos, ids in view._index().items()} == {
+            pos: sorted(ids) for pos, ids in fresh.items()
+        }
+        eager = from_state(state)
+        for x in range(view.width):
+            for y in range(view.height):
+                assert _kinds(view.grid[x][y]) == _kinds(eager.grid[x][y])
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+from grid_universe.grid.convert import to_state
+from grid_universe.grid.gridstate import GridState
+from grid_universe.state import State
+
+from grid_adventure.entities import KeyEntity
+from grid_adventure.levels import intro
+from grid_adventure.levels.layout import LevelLayout, load_level, save_level
+from grid_adventure.observation import tensor_observation
+
+INTRO_BUILDERS: list[Callable[..., GridState]] = list(intro.BUILDERS.values())
+
+
+def _entities(state: State) -> list[tuple[Any, ...]]:
+    """Position-keyed description of every entity, independent of entity IDs."""
+    rows = []
+    for eid, pos in state.position.items():
+        health = state.health.get(eid)
+        moving = state.moving.get(eid)
+        portal = state.portal.get(eid)
+        mate = state.position.get(portal.pair_entity) if portal is not None else None
+        rows.append(
+            (
+                pos.x,
+                pos.y,
+                state.appearance[eid].name,
+                (health.current_health, health.max_health) if health else None,
+                moving.direction if moving is not None else None,
+                (mate.x, mate.y) if mate is not None else None,
+            )
+        )
+    return sorted(rows, key=repr)
+
+
+def test_all_intro_levels_are_covered() -> None:
+    assert len(INTRO_BUILDERS) == 15
+
+
+@pytest.mark.parametrize("builder", INTRO_BUILDERS, ids=lambda b: b.__name__)
+def test_intro_level_round_trip(
+    builder: Callable[..., GridState], tmp_path: Path
+) -> None:
+    expected = to_state(builder())
+    path = tmp_path / "level.npz"
+    save_level(builder(), path)
+    layout = load_level(path)
+
+    assert (layout.width, layout.height) == (expected.width, expected.height)
+    for state in (layout.to_state(), to_state(layout.to_gridstate())):
+        assert (state.seed, state.turn_limit) == (expected.seed, expected.turn_limit)
+        assert state.objective == expected.objective
+        assert _entities(state) == _entities(expected)
+        assert np.array_equal(tensor_observation(state), tensor_observation(expected))
+
+
+def test_layout_codes_and_seed_override() -> None:
+    layout = LevelLayout.from_gridstate(intro.build_level_portal_shortcut())
+    # At most one entity stacked on each floor tile
+    assert layout.codes.dtype == np.uint8
+    assert layout.codes.shape == (2, 9, 11)
+    assert len(layout.portals) == 1
+    assert layout.to_state(seed=7).seed == 7
+
+
+def test_layout_rejects_unsupported_entities() -> None:
+    gridstate = intro.build_level_basic_movement()
+    agent = next(
+        obj
+        for column in gridstate.grid
+        for cell in column
+        for obj in cell
+        if obj.agent is not None
+    )
+    agent.inventory_list.append(KeyEntity())
+    with pytest.raises(ValueError):
+        LevelLayout.from_gridstate(gridstate)
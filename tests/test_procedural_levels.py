@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from collections import deque
+
+import numpy as np
+from grid_universe.grid.convert import to_state
+
+from grid_adventure.entities import (
+    AgentEntity,
+    BoxEntity,
+    ExitEntity,
+    GemEntity,
+    KeyEntity,
+    LavaEntity,
+    LockedDoorEntity,
+    PortalEntity,
+    RobotEntity,
+    WallEntity,
+)
+from grid_adventure.env import GridAdventureEnv
+from grid_adventure.levels.layout import KIND_CODES, LevelLayout
+from grid_adventure.levels.procedural import (
+    Density,
+    build_procedural_level,
+    generate_layout,
+)
+from grid_adventure.observation import NUM_CHANNELS
+
+# Kinds a walking agent should never need to step on.
+_AVOID = {
+    KIND_CODES[cls]
+    for cls in (
+        WallEntity,
+        LockedDoorEntity,
+        BoxEntity,
+        LavaEntity,
+        RobotEntity,
+        PortalEntity,
+    )
+}
+
+
+def _cells(layout: LevelLayout, cls: type) -> list[tuple[int, int]]:
+    ys, xs = np.nonzero(layout.codes[1] == KIND_CODES[cls])
+    return list(zip(xs.tolist(), ys.tolist()))
+
+
+def _reachable(
+    layout: LevelLayout, through_doors: bool = False
+) -> set[tuple[int, int]]:
+    objects = layout.codes[1]
+    avoid = _AVOID - {KIND_CODES[LockedDoorEntity]} if through_doors else _AVOID
+    (start,) = _cells(layout, AgentEntity)
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if (nx, ny) not in seen and int(objects[ny, nx]) not in avoid:
+                seen.add((nx, ny))
+                queue.append((nx, ny))
+    return seen
+
+
+def test_generate_layout_is_deterministic_per_seed() -> None:
+    a = generate_layout(40, 30, seed=5)
+    b = generate_layout(40, 30, seed=5)
+    c = generate_layout(40, 30, seed=6)
+    assert a.codes.shape == (2, 30, 40)
+    assert np.array_equal(a.codes, b.codes)
+    assert a.directions == b.directions and a.portals == b.portals
+    assert not np.array_equal(a.codes, c.codes)
+
+
+def test_generated_levels_are_solvable_without_hazards() -> None:
+    density = Density(wall=0.35, gem=0.01, key_door=0.005, portal=0.005, lava=0.02)
+    for seed in range(5):
+        layout = generate_layout(48, 48, seed=seed, density=density)
+        reachable = _reachable(layout)
+        targets = [*_cells(layout, GemEntity), *_cells(layout, KeyEntity)]
+        assert len(targets) > 1
+        assert all(cell in reachable for cell in targets)
+        # Every key is reachable without opening a door, there is a key per
+        # door, and the exit lies behind the doors
+        keys, doors = _cells(layout, KeyEntity), _cells(layout, LockedDoorEntity)
+        assert len(keys) == len(doors) > 0
+        (exit_cell,) = _cells(layout, ExitEntity)
+        assert exit_cell not in reachable
+        assert exit_cell in _reachable(layout, through_doors=True)
+        # Every portal can be stepped onto from the reachable area
+        for x, y in _cells(layout, PortalEntity):
+            neighbours = {(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)}
+            assert neighbours & reachable
+
+
+def test_build_procedural_level_matches_gridstate_route() -> None:
+    layout = generate_layout(20, 16, seed=3)
+    state = build_procedural_level(width=20, height=16, seed=3)
+    assert (state.width, state.height) == (20, 16)
+    assert len(state.agent) == 1
+    assert len(state.position) == len(to_state(layout.to_gridstate()).position)
+
+
+def test_procedural_level_as_initial_state_fn() -> None:
+    env = GridAdventureEnv(
+        initial_state_fn=build_procedural_level,
+        observation_type="tensor",
+        width=32,
+        height=24,
+    )
+    obs, _ = env.reset()
+    assert obs.shape == (NUM_CHANNELS, 24, 32)
+    env.close()
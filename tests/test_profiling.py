@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import grid_universe.step as base_step_module
+from grid_universe.actions import Action
+from grid_universe.grid.convert import to_state
+
+from grid_adventure import step as step_module
+from grid_adventure.levels import intro
+from grid_adventure.profiling import StepProfile, phase_of, profile_steps
+
+
+def test_phase_of_groups_systems_by_name() -> None:
+    assert phase_of("portal_system") == "portals"
+    assert phase_of("damage_system") == "damage"
+    assert phase_of("moving_system") == "movement"
+    assert phase_of("win_system") == "objective"
+    assert phase_of("mystery_system") == "mystery"
+    assert phase_of("damage_system", {"damage_system": "hazards"}) == "hazards"
+
+
+def test_profile_steps_uses_the_given_system_phases() -> None:
+    state = to_state(intro.build_level_basic_movement())
+    everything = dict.fromkeys(step_module.SYSTEMS, "systems")
+    with profile_steps(systems=everything) as profile:
+        step_module.step(state, Action.RIGHT)
+    assert list(profile.phases) == ["systems"]
+
+
+def test_profile_steps_records_each_step_and_restores() -> None:
+    original = base_step_module.step
+    systems = {name: getattr(base_step_module, name) for name in step_module.SYSTEMS}
+    assert systems
+    state = to_state(intro.build_level_enemy_patrol())
+    with profile_steps() as profile:
+        assert step_module.step_hook is not None
+        for action in (Action.RIGHT, Action.WAIT, Action.LEFT):
+            state = step_module.step(state, action)
+    assert base_step_module.step is original
+    assert step_module.step_hook is None
+    for name, fn in systems.items():
+        assert getattr(base_step_module, name) is fn
+
+    assert len(profile) == 3
+    assert profile.phases
+    assert all(0 < len(samples) <= 3 for samples in profile.phases.values())
+    assert profile.entity_counts["moving"] == [2, 2, 2]
+    summary = profile.summary()
+    assert summary["step"]["count"] == 3
+    phase_total = sum(
+        stats["total"] for name, stats in summary.items() if name != "step"
+    )
+    assert phase_total <= summary["step"]["total"]
+    counts, edges = profile.histogram(bins=4)
+    assert counts.sum() == 3 and len(edges) == 5
+    assert "step" in profile.report()
+
+
+def test_profiles_merge_and_nothing_is_recorded_outside() -> None:
+    state = to_state(intro.build_level_basic_movement())
+    total = StepProfile()
+    for _ in range(2):
+        with profile_steps(StepProfile()) as profile:
+            step_module.step(state, Action.RIGHT)
+        total.merge(profile)
+    step_module.step(state, Action.RIGHT)
+    assert len(total) == 2
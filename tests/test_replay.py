@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from grid_universe.actions import Action
+from grid_universe.grid.convert import grid_state_fn_to_initial_state_fn
+from grid_universe.state import State
+
+from grid_adventure.env import GridAdventureEnv
+from grid_adventure.levels import intro
+from grid_adventure.replay import (
+    EpisodeRecorder,
+    Replayer,
+    load_trajectory,
+    save_trajectory,
+)
+
+ACTIONS = [
+    Action.UP,
+    Action.DOWN,
+    Action.RIGHT,
+    Action.LEFT,
+    Action.RIGHT,
+    Action.UP,
+    Action.DOWN,
+]
+
+
+def _agent(state: State) -> tuple[int, int, int]:
+    (agent_id,) = state.agent.keys()
+    pos = state.position[agent_id]
+    return pos.x, pos.y, state.turn
+
+
+def _record(keyframe_interval: int) -> tuple[EpisodeRecorder, list[State]]:
+    env = EpisodeRecorder(
+        GridAdventureEnv(
+            initial_state_fn=grid_state_fn_to_initial_state_fn(
+                intro.build_level_basic_movement
+            ),
+            observation_type="tensor",
+            width=7,
+            height=5,
+        ),
+        keyframe_interval=keyframe_interval,
+    )
+    env.reset(seed=3)
+    states = [env.unwrapped.state]
+    for action in ACTIONS:
+        env.step(action)
+        states.append(env.unwrapped.state)
+    return env, states
+
+
+def test_replay_reconstructs_every_step_in_any_order() -> None:
+    env, states = _record(keyframe_interval=3)
+    trajectory = env.trajectory
+    assert trajectory is not None and len(trajectory) == len(ACTIONS)
+    assert sorted(trajectory.keyframes) == [3, 6]
+    replayer = Replayer(trajectory)
+    for k in (7, 2, 5, 0, 6, 1):
+        assert _agent(replayer.state_at(k)) == _agent(states[k])
+    with pytest.raises(IndexError):
+        replayer.state_at(len(ACTIONS) + 1)
+    env.close()
+
+
+def test_trajectory_file_round_trip(tmp_path: Path) -> None:
+    env, states = _record(keyframe_interval=4)
+    assert env.trajectory is not None
+    path = tmp_path / "episode.npz"
+    save_trajectory(env.trajectory, path)
+    loaded = load_trajectory(path)
+    assert loaded.actions == ACTIONS
+    assert loaded.seed == 3 and loaded.keyframe_interval == 4
+    assert list(loaded.keyframes) == [4]
+    assert loaded.rewards == pytest.approx(env.trajectory.rewards)
+    replayer = Replayer(loaded)
+    assert [_agent(replayer[k]) for k in range(len(replayer))] == [
+        _agent(s) for s in states
+    ]
+
+    env.reset()
+    assert len(env.episodes) == 1
+    env.close()
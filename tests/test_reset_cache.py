@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import Any
+
+from grid_universe.actions import Action
+from grid_universe.grid.convert import grid_state_fn_to_initial_state_fn, to_state
+from grid_universe.state import State
+
+from grid_adventure.cache import ResetCache
+from grid_adventure.env import GridAdventureEnv
+from grid_adventure.levels import intro
+
+
+def test_reset_cache_counts_hits_and_evicts_lru() -> None:
+    calls: list[dict[str, Any]] = []
+
+    def build(**kwargs: Any) -> State:
+        calls.append(kwargs)
+        return to_state(intro.build_level_basic_movement(**kwargs))
+
+    cache = ResetCache(maxsize=2)
+    first = cache.get(build, seed=1)
+    assert cache.get(build, seed=1) is first
+    cache.get(build, seed=2)
+    cache.get(build, seed=3)  # evicts seed=1
+    assert len(cache) == 2
+    assert cache.get(build, seed=1) is not first
+    assert (cache.hits, cache.misses) == (1, 4)
+    assert len(calls) == 4
+
+    cache.clear()
+    assert len(cache) == 0 and cache.hits == cache.misses == 0
+
+
+def test_reset_cache_passes_unhashable_arguments_through() -> None:
+    def build(**kwargs: Any) -> State:
+        return to_state(intro.build_level_basic_movement())
+
+    cache = ResetCache()
+    cache.get(build, options=[1, 2])
+    cache.get(build, options=[1, 2])
+    assert (cache.hits, cache.misses, len(cache)) == (0, 2, 0)
+
+
+def test_env_reset_reuses_cached_initial_state() -> None:
+    env = GridAdventureEnv(
+        initial_state_fn=grid_state_fn_to_initial_state_fn(
+            intro.build_level_basic_movement
+        ),
+        observation_type="gridstate",
+        width=7,
+        height=5,
+        reset_cache=4,
+    )
+    assert env.reset_cache is not None
+    env.reset()
+    first = env.state
+    env.step(Action.RIGHT)
+    env.reset()
+    assert env.state is first
+    assert env.reset_cache.hits >= 1
+    assert len(env.reset_cache) == 1
+    env.close()
+
+
+def test_reset_cache_is_shared_between_envs_of_the_same_builder() -> None:
+    cache = ResetCache()
+    envs = [
+        GridAdventureEnv(
+            initial_state_fn=grid_state_fn_to_initial_state_fn(
+                intro.build_level_basic_movement
+            ),
+            observation_type="gridstate",
+            width=7,
+            height=5,
+            reset_cache=cache,
+        )
+        for _ in range(2)
+    ]
+    envs[0].reset(seed=3)
+    envs[1].reset(seed=3)
+    assert envs[1].state is envs[0].state
+    assert (cache.hits, len(cache)) == (1, 1)
+    for env in envs:
+        env.close()
+
+
+def test_reset_cache_keys_closures_on_the_wrapped_builder() -> None:
+    def wrapper(builder: Any) -> Any:
+        def initial_state_fn(**kwargs: Any) -> State:
+            return to_state(builder(**kwargs))
+
+        return initial_state_fn
+
+    cache = ResetCache()
+    first = cache.get(wrapper(intro.build_level_basic_movement), seed=1)
+    assert cache.get(wrapper(intro.build_level_basic_movement), seed=1) is first
+    cache.get(wrapper(intro.build_level_capstone), seed=1)
+    assert (cache.hits, cache.misses) == (1, 2)
@@ -0,0 +1,87 @@
+import functools
+
+import numpy as np
+import pytest
+from grid_universe.actions import Action
+from grid_universe.grid.gridstate import GridState
+
+from grid_adventure.entities import AgentEntity
+from grid_adventure.levels import intro
+from grid_adventure.levels.procedural import build_procedural_level
+from grid_adventure.observation import (
+    ENTITY_CHANNELS,
+    NUM_CHANNELS,
+    tensor_observation,
+)
+from grid_adventure.rollout import RolloutEngine
+
+AGENT = ENTITY_CHANNELS.index(AgentEntity)
+RIGHT = list(Action).index(Action.RIGHT)
+
+
+def _broken_for_odd_seeds(seed: int = 0) -> GridState:
+    if seed % 2:
+        raise ValueError(f"level {seed} is broken")
+    return intro.build_level_basic_movement()
+
+
+def test_rollout_engine_steps_workers_through_shared_memory():
+    with RolloutEngine(
+        intro.build_level_basic_movement, num_workers=2, ring_size=2, timeout=30
+    ) as engine:
+        # Seeds derive from the builder's default seed (100)
+        assert engine.worker_seeds == [100, 101]
+
+        obs = engine.reset()
+        assert obs.shape == (2, NUM_CHANNELS, 5, 7)
+        assert (obs[:, AGENT, 2, 1] == 1).all()
+
+        previous = obs
+        obs, _, terminations, truncations = engine.step(np.full(2, RIGHT))
+        assert (obs[:, AGENT, 2, 2] == 1).all()
+        # The previous ring slot is still intact
+        assert (previous[:, AGENT, 2, 1] == 1).all()
+        assert not terminations.any() and not truncations.any()
+
+
+def test_rollout_engine_restarts_dead_worker():
+    with RolloutEngine(
+        intro.build_level_basic_movement, num_workers=2, timeout=30
+    ) as engine:
+        engine.reset()
+        engine._processes[0].kill()
+        engine._processes[0].join()
+
+        obs, _, _, truncations = engine.step(np.full(2, RIGHT))
+
+        assert engine.restarts == [1, 0]
+        assert truncations.tolist() == [True, False]
+        # Restarted worker begins a fresh episode; the other one kept going
+        assert obs[0, AGENT, 2, 1] == 1
+        assert obs[1, AGENT, 2, 2] == 1
+
+
+def test_rollout_workers_play_differently_seeded_levels():
+    builder = functools.partial(build_procedural_level, 12, 12)
+    with RolloutEngine(builder, num_workers=2, seed=5, timeout=30) as engine:
+        assert engine.worker_seeds == [5, 6]
+        trajectories = [engine.reset().copy()]
+        for action in (RIGHT, RIGHT, list(Action).index(Action.DOWN)):
+            obs, _, _, _ = engine.step(np.full(2, action))
+            trajectories.append(obs.copy())
+        per_worker = np.stack(trajectories, axis=1)  # (workers, steps, C, H, W)
+        assert not np.array_equal(per_worker[0], per_worker[1])
+        # Each worker plays the level of its own seed
+        for i, seed in enumerate(engine.worker_seeds):
+            expected = tensor_observation(builder(seed=seed))
+            assert np.array_equal(per_worker[i, 0], expected)
+
+
+def test_rollout_engine_raises_worker_exceptions_with_their_traceback():
+    with RolloutEngine(_broken_for_odd_seeds, num_workers=2, timeout=30) as engine:
+        with pytest.raises(RuntimeError, match="Rollout worker 1 raised") as info:
+            engine.reset()
+        assert "ValueError: level 1 is broken" in str(info.value)
+        assert "_broken_for_odd_seeds" in str(info.value)
+        # Not silently restarted: the error surfaced instead
+        assert engine.restarts == [0, 0]
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from grid_universe.actions import Action
+from grid_universe.grid.convert import to_state as base_to_state
+from grid_universe.grid.gridstate import GridState
+
+from grid_adventure.entities import AgentEntity, CoinEntity, PortalEntity
+from grid_adventure.grid import SharedGridState, from_state, share, step_shared
+from grid_adventure.levels import intro
+from grid_adventure.step import step as state_step
+
+
+def _kinds(gridstate: GridState) -> list[list[list[str]]]:
+    return [
+        [sorted(type(obj).__name__ for obj in cell) for cell in column]
+        for column in gridstate.grid
+    ]
+
+
+def test_step_shared_matches_full_conversion() -> None:
+    state = base_to_state(intro.build_level_capstone())
+    node = share(state)
+    for action in (Action.RIGHT, Action.DOWN, Action.RIGHT, Action.WAIT):
+        state = state_step(state, action)
+        node = step_shared(node, action)
+        assert _kinds(node) == _kinds(from_state(state))
+        assert (node.turn, node.score, node.win) == (state.turn, state.score, state.win)
+
+
+def test_children_share_unchanged_cells_with_parent() -> None:
+    root = share(base_to_state(intro.build_level_basic_movement()))
+    before = _kinds(root)
+    (ax, ay), _ = root.find(AgentEntity)[0]
+    left = step_shared(root, Action.RIGHT)
+    right = step_shared(root, Action.DOWN)
+
+    assert _kinds(root) == before
+    assert root.find(AgentEntity)[0][0] == (ax, ay)
+    assert left.find(AgentEntity)[0][0] != right.find(AgentEntity)[0][0]
+    shared = sum(
+        left.grid[x][y] is root.grid[x][y]
+        for x in range(root.width)
+        for y in range(root.height)
+    )
+    assert shared >= root.width * root.height - 4
+
+
+def test_portal_pairs_stay_consistent_after_step() -> None:
+    node = share(base_to_state(intro.build_level_portal_shortcut()))
+    for action in (Action.RIGHT, Action.RIGHT, Action.DOWN):
+        node = step_shared(node, action)
+    entities = {id(obj) for column in node.grid for cell in column for obj in cell}
+    for _, portal in node.find(PortalEntity):
+        assert portal.portal_pair_ref is not None
+        assert id(portal.portal_pair_ref) in entities
+
+
+def test_clone_copies_cells_and_entities_on_write() -> None:
+    root = share(base_to_state(intro.build_level_optional_coin()))
+    child = root.clone()
+    assert isinstance(child, SharedGridState)
+    assert child.grid[0] is root.grid[0]
+
+    pos, agent = child.find(AgentEntity)[0]
+    private = child.mutable(pos, agent)
+    assert private is not agent
+    assert root.find(AgentEntity)[0][1] is agent
+    assert child.find(AgentEntity)[0][1] is private
+    assert child.state is None and root.state is not None
+
+    coin_pos, coin = root.find(CoinEntity)[0]
+    child.remove(coin_pos, coin)
+    assert child.count(CoinEntity) == root.count(CoinEntity) - 1
+    assert any(obj is coin for obj in root.grid[coin_pos[0]][coin_pos[1]])
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import pytest
+from grid_universe.grid.convert import to_state
+from pyrsistent import pmap
+
+from grid_adventure.levels import intro
+from grid_adventure.solver import canonical_key, heuristic, solve
+from grid_adventure.step import step
+
+
+def test_solver_finds_shortest_path_on_basic_level() -> None:
+    state = to_state(intro.build_level_basic_movement(seed=100))
+    result = solve(state)
+    assert result.solved
+    assert result.actions is not None
+    # Agent at (1, 2), exit at (5, 2) through the gap in the wall
+    assert len(result.actions) == 4
+    assert result.nodes_expanded > 0 and result.nodes_per_sec > 0
+
+
+def test_solver_actions_replay_to_a_win() -> None:
+    for builder in (intro.build_level_key_door, intro.build_level_portal_shortcut):
+        state = to_state(builder())
+        result = solve(state)
+        assert result.actions is not None
+        for action in result.actions:
+            state = step(state, action)
+        assert state.win
+
+
+def test_astar_matches_breadth_first_search() -> None:
+    state = to_state(intro.build_level_required_one())
+    astar = solve(state)
+    bfs = solve(state, use_heuristic=False)
+    assert astar.actions is not None and bfs.actions is not None
+    assert len(astar.actions) == len(bfs.actions)
+
+
+def test_canonical_key_ignores_turn_and_score() -> None:
+    state = to_state(intro.build_level_maze_turns())
+    assert canonical_key(replace(state, turn=7, score=-21)) == canonical_key(state)
+    assert heuristic(state) > 0
+
+
+def test_solver_respects_node_budget() -> None:
+    state = to_state(intro.build_level_capstone())
+    result = solve(state, max_nodes=3)
+    assert not result.solved
+    assert result.nodes_expanded <= 3
+
+
+def test_canonical_key_requires_an_agent() -> None:
+    state = to_state(intro.build_level_basic_movement())
+    with pytest.raises(ValueError, match="no agent"):
+        canonical_key(replace(state, agent=pmap()))
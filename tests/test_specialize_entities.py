@@ -18,11 +18,18 @@ from grid_universe.grid.factories import (
     create_phasing_effect,
 )
 from grid_universe.components.properties.appearance import Appearance
-from grid_universe.grid.entity import Entity
+from grid_universe.grid.entity import Entity, copy_entity_components
 from grid_universe.movements import BaseMovement
 from grid_universe.objectives import BaseObjective
 
-from grid_adventure.grid import specialize_entities, from_state
+from grid_adventure.grid import (
+    SlottedTypes,
+    SpecializedTypes,
+    _specialize_single,
+    specialize_entities,
+    from_state,
+)
+from grid_adventure.levels.intro import build_level_capstone
 from grid_adventure.entities import (
     AgentEntity,
     FloorEntity,
@@ -429,3 +436,67 @@ def test_specialize_roundtrip_preserves_types_and_coordinates():
     assert len(inv_list) == 2
     assert any(isinstance(item, KeyEntity) for item in inv_list)
     assert any(isinstance(item, GemEntity) for item in inv_list)
+
+
+def test_dispatch_maps_generic_copies_back_to_their_class():
+    """A generic entity carrying a class's default components specializes back to that class."""
+    for cls in SpecializedTypes:
+        generic = copy_entity_components(cls(), Entity())
+        assert type(_specialize_single(generic)) is cls
+
+
+def test_dispatch_keeps_unknown_entities_unspecialized():
+    obj = Entity(appearance=Appearance(name="unknown", priority=5))
+    assert _specialize_single(obj) is obj
+
+
+def test_slotted_variants_specialize_like_their_base_class():
+    for cls in SpecializedTypes:
+        variant = SlottedTypes[cls]
+        assert issubclass(variant, cls) and "__slots__" in variant.__dict__
+        generic = copy_entity_components(cls(), Entity())
+        specialized = _specialize_single(generic, slots=True)
+        assert type(specialized) is variant
+        assert isinstance(specialized, SpecializedTypes)
+        # Already specialized: kept as-is
+        assert _specialize_single(specialized) is specialized
+
+
+def test_slotted_from_state_matches_regular():
+    state = to_state(build_level_capstone())
+    regular = from_state(state)
+    compact = from_state(state, slots=True)
+    for (x, y, obj), (cx, cy, cobj) in zip(_flatten(regular), _flatten(compact)):
+        assert (x, y) == (cx, cy)
+        assert type(cobj) is SlottedTypes[type(obj)]
+    compact_state, regular_state = to_state(compact), to_state(regular)
+    assert compact_state.position == regular_state.position
+    assert compact_state.appearance == regular_state.appearance
+
+
+def test_slotted_entities_pickle():
+    import pickle
+    import subprocess
+    import sys
+
+    from grid_adventure import entities
+
+    state = to_state(build_level_capstone())
+    compact = from_state(state, slots=True)
+    objs = [obj for _, _, obj in _flatten(compact)]
+    restored = pickle.loads(pickle.dumps(objs))
+    assert [type(obj) for obj in restored] == [type(obj) for obj in objs]
+    assert to_state(pickle.loads(pickle.dumps(compact))).position == state.position
+    assert entities.SlottedAgentEntity is SlottedTypes[entities.AgentEntity]
+
+    # A fresh process resolves the variants without calling `slotted` first
+    data = pickle.dumps(objs)
+    code = (
+        "import pickle, sys; "
+        "objs = pickle.loads(sys.stdin.buffer.read()); "
+        "print(sorted({type(o).__name__ for o in objs})[0])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], input=data, capture_output=True, check=True
+    )
+    assert result.stdout.decode().strip().startswith("Slotted")
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from grid_universe.actions import Action
+from grid_universe.grid.convert import grid_state_fn_to_initial_state_fn, to_state
+
+from grid_adventure.entities import AgentEntity, ExitEntity, FloorEntity, WallEntity
+from grid_adventure.env import GridAdventureEnv
+from grid_adventure.levels import intro
+from grid_adventure.observation import (
+    CHANNEL_NAMES,
+    ENTITY_CHANNELS,
+    NUM_CHANNELS,
+    tensor_observation,
+)
+
+
+def _channel(cls: type) -> int:
+    return ENTITY_CHANNELS.index(cls)
+
+
+def test_tensor_observation_marks_entity_kinds_and_scalars():
+    state = to_state(intro.build_level_basic_movement(seed=100))
+    obs = tensor_observation(state)
+
+    assert obs.shape == (NUM_CHANNELS, 5, 7)
+    assert obs.dtype == np.uint8
+    # Agent at (1, 2), exit at (5, 2), wall column at x=3 with a gap at y=2
+    assert obs[_channel(AgentEntity)].sum() == 1
+    assert obs[_channel(AgentEntity), 2, 1] == 1
+    assert obs[_channel(ExitEntity), 2, 5] == 1
+    assert obs[_channel(WallEntity), :, 3].tolist() == [1, 1, 0, 1, 1]
+    assert obs[_channel(FloorEntity)].all()
+    # Scalars fill their whole plane
+    health = obs[CHANNEL_NAMES.index("health")]
+    assert (health == 5).all()
+    assert not obs[CHANNEL_NAMES.index("inventory")].any()
+
+
+def test_tensor_observation_writes_into_padded_buffer():
+    state = to_state(intro.build_level_basic_movement(seed=100))
+    out = np.full((NUM_CHANNELS, 8, 8), 7, dtype=np.uint8)
+
+    result = tensor_observation(state, out=out)
+
+    assert result is out
+    assert not out[:, 5:, :].any() and not out[:, :, 7:].any()
+    assert out[_channel(AgentEntity), 2, 1] == 1
+
+
+@pytest.mark.parametrize(
+    "shape", [(NUM_CHANNELS - 1, 5, 7), (NUM_CHANNELS, 4, 7), (NUM_CHANNELS, 5)]
+)
+def test_tensor_observation_rejects_mismatched_buffer(shape):
+    state = to_state(intro.build_level_basic_movement(seed=100))
+    with pytest.raises(ValueError, match="cannot hold"):
+        tensor_observation(state, out=np.zeros(shape, dtype=np.uint8))
+
+
+def test_env_tensor_observation_matches_space():
+    env = GridAdventureEnv(
+        initial_state_fn=grid_state_fn_to_initial_state_fn(
+            intro.build_level_basic_movement
+        ),
+        observation_type="tensor",
+        width=7,
+        height=5,
+    )
+    obs, _ = env.reset()
+    assert env.observation_space.contains(obs)
+
+    obs2, _, _, _, _ = env.step(Action.RIGHT)
+    assert env.observation_space.contains(obs2)
+    assert obs2[_channel(AgentEntity), 2, 2] == 1
+    env.close()
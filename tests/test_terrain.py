@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from collections import Counter
+
+import numpy as np
+from grid_universe.grid.convert import to_state
+from grid_universe.state import State
+
+from grid_adventure.entities import FloorEntity, GemEntity, WallEntity
+from grid_adventure.grid import from_state, split_terrain
+from grid_adventure.levels import intro
+from grid_adventure.levels.layout import KIND_CODES
+from grid_adventure.levels.procedural import generate_layout
+from grid_adventure.terrain import FLOOR, WALL, TerrainGridState
+
+
+def _appearances(state: State) -> Counter[tuple[int, int, str]]:
+    return Counter(
+        (pos.x, pos.y, state.appearance[eid].name)
+        for eid, pos in state.position.items()
+    )
+
+
+def test_intro_terrain_expands_on_access() -> None:
+    gridstate = intro.build_level_maze_turns()
+    assert isinstance(gridstate, TerrainGridState)
+    assert gridstate.expanded_cells() < gridstate.width * gridstate.height
+    corner = gridstate.grid[0][0]
+    assert [type(obj) for obj in corner] == [FloorEntity, WallEntity, WallEntity]
+    assert gridstate.grid[0][0] is corner
+    assert gridstate.count(FloorEntity) == gridstate.width * gridstate.height
+    assert gridstate.expanded_cells() == gridstate.width * gridstate.height
+
+
+def test_intro_border_keeps_stacked_corner_walls() -> None:
+    gridstate = intro.build_level_maze_turns()
+    w, h = gridstate.width, gridstate.height
+    border = [
+        (x, y) for x in range(w) for y in range(h) if x in (0, w - 1) or y in (0, h - 1)
+    ]
+    walls = sum(
+        isinstance(obj, WallEntity) for x, y in border for obj in gridstate.grid[x][y]
+    )
+    # Full top/bottom rows and left/right columns, as the eager builder drew them
+    assert walls == 2 * w + 2 * h
+    state = to_state(gridstate)
+    assert sum(pos.x == 0 and pos.y == 0 for pos in state.position.values()) == 3
+
+
+def test_from_state_with_terrain_matches_full_conversion() -> None:
+    state = to_state(intro.build_level_required_two())
+    terrain, dynamic = split_terrain(state)
+    assert terrain.count() + len(dynamic.position) == len(state.position)
+    assert (terrain.codes & FLOOR).all()
+
+    gridstate = from_state(state, terrain=True)
+    assert isinstance(gridstate, TerrainGridState)
+    assert gridstate.count(GemEntity) == 2
+    assert gridstate.expanded_cells() < gridstate.width * gridstate.height
+    assert _appearances(to_state(gridstate)) == _appearances(
+        to_state(from_state(state))
+    )
+
+
+def test_layout_to_gridstate_keeps_bottom_floor_and_wall_as_terrain() -> None:
+    layout = generate_layout(24, 18, seed=2)
+    gridstate = layout.to_gridstate()
+    floors = layout.codes[0] == KIND_CODES[FloorEntity]
+    walls = layout.codes[1] == KIND_CODES[WallEntity]
+    assert np.array_equal((gridstate.terrain.codes & FLOOR) != 0, floors)
+    assert np.array_equal((gridstate.terrain.codes & WALL) != 0, walls)
+    assert gridstate.expanded_cells() < 24 * 18
+    assert _appearances(to_state(gridstate)) == _appearances(layout.to_state())
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from grid_universe.actions import Action
+
+from grid_adventure.entities import AgentEntity
+from grid_adventure.levels import intro
+from grid_adventure.observation import ENTITY_CHANNELS, NUM_CHANNELS
+from grid_adventure.vector import GridAdventureVectorEnv
+
+AGENT = ENTITY_CHANNELS.index(AgentEntity)
+RIGHT = list(Action).index(Action.RIGHT)
+
+
+def test_vector_env_pads_mixed_builders():
+    env = GridAdventureVectorEnv(
+        [intro.build_level_basic_movement, intro.build_level_enemy_patrol]
+    )
+    obs, _ = env.reset()
+
+    # basic_movement is 7x5, enemy_patrol is 13x9
+    assert obs.shape == (2, NUM_CHANNELS, 9, 13)
+    assert env.observation_space.contains(obs)
+    assert obs[0, AGENT, 2, 1] == 1
+    assert not obs[0, :, 5:, :].any()
+
+
+def test_vector_env_steps_in_lockstep_and_autoresets():
+    env = GridAdventureVectorEnv(intro.build_level_basic_movement, num_envs=3)
+    env.reset(seed=7)
+    actions = np.full(3, RIGHT)
+
+    # Agent starts at (1, 2); the exit is four steps to the right
+    for _ in range(3):
+        obs, _, terminations, truncations, _ = env.step(actions)
+        assert not terminations.any() and not truncations.any()
+    assert (obs[:, AGENT, 2, 4] == 1).all()
+
+    obs, _, terminations, truncations, infos = env.step(actions)
+    assert terminations.all()
+    assert infos["_final_obs"].all()
+    assert (infos["final_obs"][:, AGENT, 2, 5] == 1).all()
+    # Same-step autoreset puts every agent back at the start
+    assert (obs[:, AGENT, 2, 1] == 1).all()
+    assert [state.seed for state in env.states] == [7, 8, 9]
+
+
+def test_vector_env_builds_each_level_once_per_seed():
+    seeds = []
+
+    def builder(**kwargs):
+        seeds.append(kwargs.get("seed"))
+        return intro.build_level_basic_movement(**kwargs)
+
+    env = GridAdventureVectorEnv(builder, num_envs=2)
+    env.reset(seed=3)
+    first = env.states
+    actions = np.full(2, RIGHT)
+    for _ in range(4):  # the fourth step finishes and auto-resets both episodes
+        env.step(actions)
+    assert all(new is old for new, old in zip(env.states, first))
+    env.reset(seed=3)
+    assert seeds == [None, None, 3, 4]
+
+    env.reset(seed=10)
+    assert seeds[4:] == [10, 11]
+
+
+def test_vector_env_rejects_out_of_range_actions():
+    env = GridAdventureVectorEnv(intro.build_level_basic_movement, num_envs=2)
+    env.reset(seed=0)
+    first = env.states
+    for bad in (-1, len(Action)):
+        with pytest.raises(ValueError):
+            env.step(np.array([RIGHT, bad]))
+    # No sub-environment moved
+    assert all(new is old for new, old in zip(env.states, first))